@@ -42,29 +42,45 @@ echo "Launching Typesense server..."
 
 TYPESENSE_PID=$!
 
-# Wait for Typesense to be ready
-echo "Waiting for Typesense to be ready..."
-max_attempts=30
-attempt=1
-
-while [ $attempt -le $max_attempts ]; do
-    if curl -s http://localhost:8108/health > /dev/null 2>&1; then
-        echo "Typesense is ready!"
-        break
-    fi
-    echo "Attempt ${attempt}/${max_attempts}: Typesense not ready yet..."
-    sleep 2
-    attempt=$((attempt + 1))
-done
+# Wait for Typesense to be ready: short exponential backoff (0.05s doubling up
+# to 2s) within a total deadline, instead of fixed 2s steps
+wait_until() {
+    local description="$1"
+    shift
+    local deadline=${TYPESENSE_READY_DEADLINE:-60}
+    local delay=0.05
+    local start=$(date +%s.%N)
+    local attempt=1
+
+    while true; do
+        if "$@" > /dev/null 2>&1; then
+            echo "${description} ready after $(awk "BEGIN {printf \"%.2f\", $(date +%s.%N) - ${start}}")s (${attempt} attempts)"
+            return 0
+        fi
+        if awk "BEGIN {exit !($(date +%s.%N) - ${start} >= ${deadline})}"; then
+            echo "ERROR: ${description} not ready within ${deadline}s"
+            return 1
+        fi
+        sleep "$delay"
+        delay=$(awk "BEGIN {d = ${delay} * 2; print (d > 2 ? 2 : d)}")
+        attempt=$((attempt + 1))
+    done
+}
 
-if [ $attempt -gt $max_attempts ]; then
-    echo "ERROR: Typesense failed to start within expected time"
+echo "Waiting for Typesense to be ready..."
+# -f: /health answers 503 while the server is still loading
+if ! wait_until "Typesense" curl -sf --max-time 5 http://localhost:8108/health; then
     exit 1
 fi
 
 # Check if data already exists (skip initialization if data directory has collections)
 if [ -f "${TYPESENSE_DATA_DIR}/state/db/CURRENT" ]; then
     echo "Data directory contains existing data - skipping initialization"
+    # The collection is queryable only after it has been loaded from disk
+    wait_until "Collection 'news'" curl -sf --max-time 5 \
+        -H "X-TYPESENSE-API-KEY: ${TYPESENSE_API_KEY}" \
+        "http://localhost:8108/collections/news/documents/search?q=*&per_page=0" \
+        || echo "WARNING: collection 'news' is not queryable yet"
 else
     echo "Fresh data directory detected - running initialization..."
 
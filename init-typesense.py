@@ -4,20 +4,27 @@ Typesense Database Initialization Script for GovBR News Dataset
 
 This script downloads the govbrnews dataset from HuggingFace and indexes it
 into a Typesense search engine.
+
+Usage:
+    python init-typesense.py
+    python init-typesense.py --profile init-profile   # writes init-profile.txt/.folded
 """
 
+import argparse
 import os
 import sys
 import logging
-import time
 import json
 from typing import List, Dict, Any
 import typesense
-import requests
 from datasets import load_dataset
 import pandas as pd
 import numpy as np
 
+from typesense_dgb import client as client_module
+from typesense_dgb.metrics import RunMetrics
+from typesense_dgb.profiling import DEFAULT_INTERVAL, SamplingProfiler
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,9 +32,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Typesense configuration
-TYPESENSE_HOST = os.getenv('TYPESENSE_HOST', 'localhost')
-TYPESENSE_PORT = os.getenv('TYPESENSE_PORT', '8108')
+# Typesense configuration (nodes come from TYPESENSE_NODES or TYPESENSE_HOST/PORT)
 TYPESENSE_API_KEY = os.getenv('TYPESENSE_API_KEY', 'govbrnews_api_key_change_in_production')
 COLLECTION_NAME = 'news'
 
@@ -35,36 +40,8 @@ COLLECTION_NAME = 'news'
 DATASET_PATH = "nitaibezerra/govbrnews"
 
 def wait_for_typesense(max_retries=30):
-    """Wait for Typesense to be ready."""
-    retry_count = 0
-
-    while retry_count < max_retries:
-        try:
-            # Use requests directly to check health endpoint
-            health_url = f"http://{TYPESENSE_HOST}:{TYPESENSE_PORT}/health"
-            response = requests.get(health_url, timeout=5)
-
-            if response.status_code == 200:
-                logger.info("Typesense is ready!")
-                # Now create and return the client
-                client = typesense.Client({
-                    'nodes': [{
-                        'host': TYPESENSE_HOST,
-                        'port': TYPESENSE_PORT,
-                        'protocol': 'http'
-                    }],
-                    'api_key': TYPESENSE_API_KEY,
-                    'connection_timeout_seconds': 10
-                })
-                return client
-
-        except Exception as e:
-            retry_count += 1
-            logger.info(f"Typesense not ready yet, attempt {retry_count}/{max_retries}: {e}")
-            time.sleep(2)
-
-    logger.error("Typesense not ready after maximum retries")
-    return None
+    """Wait for Typesense to be ready (any node of TYPESENSE_NODES, or TYPESENSE_HOST)."""
+    return client_module.wait_for_typesense(api_key=TYPESENSE_API_KEY, max_retries=max_retries)
 
 def create_collection(client):
     """Create the news collection with appropriate schema."""
@@ -402,34 +379,70 @@ def run_test_queries(client):
     except Exception as e:
         logger.warning(f"Test queries encountered an issue: {e}")
 
-def main():
-    """Main function to orchestrate the Typesense initialization."""
-    try:
-        logger.info("Starting GovBR News Typesense initialization...")
-
-        # Wait for Typesense to be ready
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Initialize Typesense with the govbrnews dataset")
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        default=None,
+        help="Sample the whole run and write PREFIX.txt (stage report) and PREFIX.folded (flamegraph)",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Seconds between profiler samples (default: {DEFAULT_INTERVAL})",
+    )
+    return parser.parse_args()
+
+def initialize(metrics):
+    """Run the initialization steps, annotating each one as a stage."""
+    logger.info("Starting GovBR News Typesense initialization...")
+
+    # Wait for Typesense to be ready
+    with metrics.stage("connect"):
         client = wait_for_typesense()
-        if not client:
-            logger.error("Could not connect to Typesense")
-            sys.exit(1)
+    if not client:
+        raise RuntimeError("Could not connect to Typesense")
+    # In a cluster, writes go straight to the leader; test queries are round-robined
+    writer = client_module.leader_client(client)
 
-        # Create collection
-        create_collection(client)
+    # Create collection
+    with metrics.stage("create_collection"):
+        create_collection(writer)
 
-        # Download and process dataset
+    # Download and process dataset
+    with metrics.stage("download_and_process"):
         df = download_and_process_dataset()
 
-        # Index documents into Typesense
-        index_documents_to_typesense(client, df)
+    # Index documents into Typesense
+    with metrics.stage("index"):
+        index_documents_to_typesense(writer, df)
 
-        # Run test queries
+    # Run test queries
+    with metrics.stage("test_queries"):
         run_test_queries(client)
 
-        logger.info("Typesense initialization completed successfully!")
+    logger.info("Typesense initialization completed successfully!")
+
+def main():
+    """Main function to orchestrate the Typesense initialization."""
+    args = parse_arguments()
+    metrics = RunMetrics()
+    profiler = SamplingProfiler(args.profile_interval) if args.profile else None
+    if profiler:
+        profiler.start()
 
+    try:
+        initialize(metrics)
     except Exception as e:
         logger.error(f"Typesense initialization failed: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.write(args.profile)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+CLI para auditar o custo de memória do schema da coleção.
+
+Lê uma amostra do dataset govbrnews, mede cardinalidade e tamanho de cada
+campo, estima a RAM de índice, facet e ordenação e sugere um schema enxuto.
+
+Usage:
+    # Auditoria com 20000 registros, estimando para 300 mil documentos
+    python scripts/audit_schema.py --documents 300000
+
+    # Grava o schema sugerido e o relatório completo
+    python scripts/audit_schema.py --output lean-schema.json --report audit.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente do .env
+load_dotenv()
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+from typesense_dgb import download_and_process_dataset
+from typesense_dgb.audit import (
+    DEFAULT_SAMPLE_SIZE,
+    QUERY_BY_FIELDS,
+    audit_schema,
+    format_audit,
+    write_lean_schema,
+)
+from typesense_dgb.collection import (
+    DEFAULT_SCHEMA_PROFILE,
+    SCHEMA_PROFILES,
+    build_schema,
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Estima a RAM do schema e sugere um schema enxuto",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Auditoria padrão
+  python audit_schema.py
+
+  # Estimativa para a coleção inteira, considerando buscas em título e resumo
+  python audit_schema.py --documents 300000 --query-by title,content,summary
+        """,
+    )
+
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=DEFAULT_SAMPLE_SIZE,
+        help=f"Registros do dataset usados na auditoria (default: {DEFAULT_SAMPLE_SIZE})",
+    )
+
+    parser.add_argument(
+        "--documents",
+        type=int,
+        default=None,
+        help="Total de documentos da coleção para extrapolar (default: tamanho da amostra)",
+    )
+
+    parser.add_argument(
+        "--schema-profile",
+        type=str,
+        choices=list(SCHEMA_PROFILES),
+        default=DEFAULT_SCHEMA_PROFILE,
+        help=f"Perfil de schema auditado (default: {DEFAULT_SCHEMA_PROFILE})",
+    )
+
+    parser.add_argument(
+        "--query-by",
+        type=str,
+        default=",".join(QUERY_BY_FIELDS),
+        help=f"Campos buscados por texto (default: {','.join(QUERY_BY_FIELDS)})",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Grava o schema enxuto sugerido neste arquivo JSON",
+    )
+
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Grava a auditoria completa (perfis, estimativas e achados) em JSON",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+
+    try:
+        df = download_and_process_dataset(mode="full", limit=args.sample)
+        audit = audit_schema(
+            df,
+            schema=build_schema(args.schema_profile),
+            documents=args.documents,
+            query_by=tuple(f.strip() for f in args.query_by.split(",") if f.strip()),
+        )
+    except Exception as e:
+        logger.error(f"Falha na auditoria: {e}")
+        sys.exit(1)
+
+    print(format_audit(audit), end="")
+
+    if args.output:
+        write_lean_schema(audit, args.output)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(audit, f, ensure_ascii=False, indent=2)
+        logger.info(f"Relatório gravado em {args.report}")
+
+
+if __name__ == "__main__":
+    main()
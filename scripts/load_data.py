@@ -13,9 +13,44 @@ Usage:
 
     # Carga completa forçada (sobrescreve dados existentes)
     python scripts/load_data.py --mode full --force
+
+    # Carga completa em streaming (memória limitada pelo tamanho do chunk)
+    python scripts/load_data.py --mode full --stream --chunk-size 5000
+
+    # Carga completa com o pipeline assíncrono
+    python scripts/load_data.py --mode full --stream --async --concurrency 4
+
+    # Carga completa com batches adaptativos (orçamento inicial de 4 MiB)
+    python scripts/load_data.py --mode full --stream --batch-bytes 4194304
+
+    # Carga incremental enviando só documentos novos ou alterados
+    python scripts/load_data.py --mode incremental --manifest manifest.db
+
+    # Carga completa preparando os documentos em 4 processos
+    python scripts/load_data.py --mode full --stream --workers 4 --concurrency 4
+
+    # Carga diária gravando relatório JSON e métricas para o node_exporter
+    python scripts/load_data.py --mode incremental --report run.json --prometheus load.prom
+
+    # Carga com profiler de amostragem (gera profile.txt e profile.folded)
+    python scripts/load_data.py --mode incremental --profile profile
+
+    # Carga completa com checkpoint e retomada após uma falha
+    python scripts/load_data.py --mode full --force --stream --checkpoint checkpoint.json
+    python scripts/load_data.py --mode full --force --stream --checkpoint checkpoint.json --resume
+
+    # Backfill de campos derivados (documentos parciais com action=update)
+    python scripts/load_data.py --mode full --stream --fields theme_1_level_1_label,tags
+
+    # Cria a coleção com o schema enxuto (campos não buscados só armazenados)
+    python scripts/load_data.py --mode full --schema-profile lean
+
+    # Layout particionado por ano, reconstruindo só a partição de 2024
+    python scripts/load_data.py --mode full --stream --partitioned --years 2024 --rebuild
 """
 
 import argparse
+import asyncio
 import logging
 import sys
 
@@ -35,9 +70,25 @@ from typesense_dgb import (
     create_collection,
     download_and_process_dataset,
     index_documents,
+    index_documents_async,
+    iter_dataset_chunks,
     wait_for_typesense,
 )
-from typesense_dgb.indexer import run_test_queries
+from typesense_dgb.batching import DEFAULT_TARGET_LATENCY, AdaptiveBatcher
+from typesense_dgb.checkpoint import Checkpoint
+from typesense_dgb.client import leader_client
+from typesense_dgb.collection import (
+    COLLECTION_NAME,
+    DEFAULT_SCHEMA_PROFILE,
+    SCHEMA_PROFILES,
+    build_schema,
+)
+from typesense_dgb.dataset import DATASET_PATH, DEFAULT_CHUNK_SIZE, get_dataset_revision
+from typesense_dgb.indexer import IMPORT_ACTIONS, run_test_queries
+from typesense_dgb.manifest import DocumentManifest
+from typesense_dgb.metrics import RunMetrics
+from typesense_dgb.partitions import index_partitioned, partition_name
+from typesense_dgb.profiling import DEFAULT_INTERVAL, SamplingProfiler
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -58,6 +109,15 @@ Exemplos:
 
   # Carga incremental (últimos 30 dias)
   python load_data.py --mode incremental --days 30
+
+  # Carga completa em streaming (memória limitada)
+  python load_data.py --mode full --stream
+
+  # Retoma uma carga completa interrompida
+  python load_data.py --mode full --force --stream --checkpoint checkpoint.json --resume
+
+  # Atualiza só alguns campos dos documentos existentes
+  python load_data.py --mode full --stream --fields theme_1_level_1_label,tags
         """,
     )
 
@@ -76,6 +136,14 @@ Exemplos:
         help="Número de dias para olhar para trás no modo incremental (default: 7)",
     )
 
+    parser.add_argument(
+        "--schema-profile",
+        type=str,
+        choices=list(SCHEMA_PROFILES),
+        default=DEFAULT_SCHEMA_PROFILE,
+        help=f"Perfil de schema usado ao criar a coleção (default: {DEFAULT_SCHEMA_PROFILE})",
+    )
+
     parser.add_argument(
         "--force",
         action="store_true",
@@ -89,49 +157,406 @@ Exemplos:
         help="Limita número de registros (útil para testes rápidos)",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Número máximo de batches de importação em voo (default: 1)",
+    )
 
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=10,
+        help="Timeout de leitura de cada requisição ao Typesense em segundos (default: 10)",
+    )
 
-def main() -> None:
-    """Main function."""
-    try:
-        args = parse_arguments()
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        default=None,
+        help="Ativa batches adaptativos com este orçamento inicial em bytes",
+    )
 
-        logger.info("=" * 80)
-        logger.info("Iniciando carregamento de dados GovBR News no Typesense")
-        logger.info(f"Modo: {args.mode}")
-        if args.mode == "incremental":
-            logger.info(f"Janela de tempo: Últimos {args.days} dias")
-        if args.limit:
-            logger.info(f"Limite de registros: {args.limit}")
-        logger.info("=" * 80)
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=None,
+        help=f"Latência alvo por importação nos batches adaptativos (default: {DEFAULT_TARGET_LATENCY}s)",
+    )
 
-        # Aguarda Typesense ficar pronto
-        client = wait_for_typesense()
-        if not client:
-            logger.error("Não foi possível conectar ao Typesense")
-            sys.exit(1)
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Arquivo SQLite com hashes dos documentos; envia só novos ou alterados",
+    )
 
-        # Cria coleção
-        create_collection(client)
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Usa o pipeline assíncrono (leitura, preparação, serialização e importação em estágios)",
+    )
 
-        # Baixa e processa dataset
-        df = download_and_process_dataset(mode=args.mode, days=args.days, limit=args.limit)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Processa o dataset em chunks Arrow sem carregá-lo inteiro em memória",
+    )
 
-        # Indexa documentos
-        index_documents(client, df, mode=args.mode, force=args.force)
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Registros por chunk no modo --stream (default: {DEFAULT_CHUNK_SIZE})",
+    )
 
-        # Executa consultas de teste
-        run_test_queries(client)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos que preparam e serializam os documentos em paralelo (default: 1)",
+    )
 
-        logger.info("=" * 80)
-        logger.info("Carregamento de dados concluído com sucesso!")
-        logger.info("=" * 80)
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Com --workers, envia cada fatia assim que fica pronta, sem manter a ordem do dataset",
+    )
+
+    parser.add_argument(
+        "--fields",
+        type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+        default=None,
+        help="Envia documentos parciais só com 'id' e estes campos (separados por vírgula)",
+    )
+
+    parser.add_argument(
+        "--action",
+        type=str,
+        choices=IMPORT_ACTIONS,
+        default=None,
+        help="Ação de importação (default: update com --fields, upsert sem)",
+    )
+
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Indexa cada documento na coleção do seu ano de publicação (news_AAAA)",
+    )
 
+    parser.add_argument(
+        "--years",
+        type=lambda value: [int(y) for y in value.split(",") if y.strip()],
+        default=None,
+        help="Com --partitioned, indexa apenas estes anos (separados por vírgula)",
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Com --partitioned e --years, remove e recria as partições desses anos",
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Arquivo JSON onde gravar o progresso da carga completa após cada batch confirmado",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a carga completa a partir do arquivo de --checkpoint",
+    )
+
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Grava um relatório JSON da carga (tempo por estágio, vazão, latências, pico de RSS)",
+    )
+
+    parser.add_argument(
+        "--prometheus",
+        type=str,
+        default=None,
+        help="Grava as métricas da carga no formato textfile do Prometheus (.prom)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="PREFIXO",
+        help="Amostra a carga inteira e grava PREFIXO.txt (relatório por estágio) e PREFIXO.folded (flamegraph)",
+    )
+
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Intervalo entre amostras do --profile em segundos (default: {DEFAULT_INTERVAL})",
+    )
+
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume exige --checkpoint")
+    if args.checkpoint and args.mode != "full":
+        parser.error("--checkpoint só é suportado no modo full")
+    if args.checkpoint and args.use_async:
+        parser.error("--checkpoint não é suportado com --async")
+    if args.checkpoint and args.unordered:
+        parser.error("--checkpoint exige envio ordenado (sem --unordered)")
+    if args.fields is not None and not args.fields:
+        parser.error("--fields exige ao menos um campo")
+    if args.action is None:
+        args.action = "update" if args.fields else "upsert"
+    if args.fields and args.action not in ("update", "emplace"):
+        parser.error("--fields exige --action update ou emplace")
+    if args.fields and args.manifest:
+        parser.error("--fields não é suportado com --manifest")
+    if args.use_async and (args.fields or args.action != "upsert"):
+        parser.error("--fields e --action não são suportados com --async")
+    if args.use_async and (
+        args.manifest
+        or args.workers != 1
+        or args.unordered
+        or args.batch_bytes
+        or args.target_latency is not None
+    ):
+        parser.error(
+            "--manifest, --workers, --unordered, --batch-bytes e --target-latency "
+            "não são suportados com --async"
+        )
+    if args.target_latency is None:
+        args.target_latency = DEFAULT_TARGET_LATENCY
+    if (args.years or args.rebuild) and not args.partitioned:
+        parser.error("--years e --rebuild exigem --partitioned")
+    if args.rebuild and not args.years:
+        parser.error("--rebuild exige --years")
+    if args.partitioned and (args.checkpoint or args.manifest or args.use_async):
+        parser.error("--partitioned não é suportado com --checkpoint, --manifest ou --async")
+    return args
+
+
+def open_checkpoint(args: argparse.Namespace) -> Checkpoint:
+    """
+    Abre o checkpoint da carga: retoma o existente com --resume ou cria um novo.
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Checkpoint a ser usado na indexação
+    """
+    if args.resume:
+        checkpoint = Checkpoint.load(args.checkpoint)
+        if checkpoint is not None:
+            logger.info(
+                f"Retomando checkpoint {args.checkpoint}: {checkpoint.rows_done} linhas "
+                f"confirmadas (revisão {checkpoint.revision})"
+            )
+            return checkpoint
+        logger.warning(f"Checkpoint {args.checkpoint} não encontrado, iniciando do zero")
+
+    checkpoint = Checkpoint(
+        args.checkpoint,
+        dataset_path=DATASET_PATH,
+        revision=get_dataset_revision(DATASET_PATH),
+        collection_name=COLLECTION_NAME,
+    )
+    checkpoint.save()
+    return checkpoint
+
+
+def log_batch_summary(stats: dict) -> None:
+    """Loga o resumo dos batches observados na indexação."""
+    latencies = sorted(stats.get("batch_latencies", []))
+    if not latencies:
+        return
+    batches = stats["batches"]
+    logger.info(
+        f"Batches: {batches} | média de {stats['documents_sent'] / batches:.0f} documentos "
+        f"e {stats['bytes_sent'] / batches / 1024:.0f} KiB, "
+        f"máx {stats['max_batch_bytes'] / 1024:.0f} KiB | "
+        f"latência p50 {latencies[len(latencies) // 2]:.2f}s, máx {latencies[-1]:.2f}s "
+        f"(últimos {len(latencies)} batches)"
+    )
+
+
+def load(args: argparse.Namespace, metrics: RunMetrics) -> None:
+    """Executa a carga, acumulando os tempos de cada estágio em metrics."""
+    logger.info("=" * 80)
+    logger.info("Iniciando carregamento de dados GovBR News no Typesense")
+    logger.info(f"Modo: {args.mode}")
+    if args.mode == "incremental":
+        logger.info(f"Janela de tempo: Últimos {args.days} dias")
+    if args.limit:
+        logger.info(f"Limite de registros: {args.limit}")
+    if args.stream:
+        logger.info(f"Streaming: chunks de {args.chunk_size} registros")
+    if args.fields:
+        logger.info(f"Campos ({args.action}): {', '.join(args.fields)}")
+    if args.partitioned:
+        logger.info(f"Layout particionado por ano: {args.years or 'todos os anos'}")
+    logger.info("=" * 80)
+
+    # Aguarda Typesense ficar pronto. Em um cluster, as importações vão direto
+    # ao líder e as consultas de teste seguem o round-robin entre os nós
+    with metrics.stage("connect"):
+        client = wait_for_typesense(timeout=args.timeout, pool_size=args.concurrency + 1)
+        writer = leader_client(client) if client else None
+    if not client:
+        raise RuntimeError("Não foi possível conectar ao Typesense")
+
+    # Cria coleção (no layout particionado, cada partição é criada ao indexar)
+    if not args.partitioned:
+        with metrics.stage("create_collection"):
+            create_collection(writer, schema=build_schema(args.schema_profile))
+
+    checkpoint = open_checkpoint(args) if args.checkpoint else None
+    if checkpoint is not None and checkpoint.completed:
+        logger.info("Checkpoint indica carga já concluída. Nada a fazer.")
+        return
+    revision = checkpoint.revision if checkpoint is not None else None
+    start_row = checkpoint.rows_done if checkpoint is not None else 0
+
+    # Baixa e processa dataset
+    if args.stream:
+        df = iter_dataset_chunks(
+            mode=args.mode,
+            days=args.days,
+            limit=args.limit,
+            chunk_size=args.chunk_size,
+            revision=revision,
+            start_row=start_row,
+            metrics=metrics,
+            fields=args.fields,
+        )
+    else:
+        df = download_and_process_dataset(
+            mode=args.mode,
+            days=args.days,
+            limit=args.limit,
+            revision=revision,
+            metrics=metrics,
+            fields=args.fields,
+        )
+
+    # Indexa documentos
+    if args.use_async:
+        with metrics.stage("index_async"):
+            stats = asyncio.run(
+                index_documents_async(
+                    writer,
+                    df,
+                    mode=args.mode,
+                    force=args.force,
+                    concurrency=args.concurrency,
+                )
+            )
+    else:
+        batcher = None
+        if args.batch_bytes:
+            batcher = AdaptiveBatcher(
+                batch_bytes=args.batch_bytes,
+                target_latency=args.target_latency,
+            )
+        options = dict(
+            mode=args.mode,
+            force=args.force,
+            concurrency=args.concurrency,
+            batcher=batcher,
+            workers=args.workers,
+            ordered=not args.unordered,
+            metrics=metrics,
+            fields=args.fields,
+            action=args.action,
+        )
+        manifest = DocumentManifest(args.manifest) if args.manifest else None
+        try:
+            if args.partitioned:
+                stats = index_partitioned(
+                    writer,
+                    df,
+                    schema=build_schema(args.schema_profile),
+                    years=args.years,
+                    rebuild=args.rebuild,
+                    **options,
+                )
+            else:
+                stats = index_documents(
+                    writer, df, manifest=manifest, checkpoint=checkpoint, **options
+                )
+        finally:
+            if manifest is not None:
+                manifest.close()
+        log_batch_summary(stats)
+    metrics.record_stats(stats)
+
+    # Executa consultas de teste (no layout particionado, na partição mais recente)
+    test_collection: str | None = COLLECTION_NAME
+    if args.partitioned:
+        partitions = stats["partitions"]
+        test_collection = partition_name(max(partitions)) if partitions else None
+    if test_collection is not None:
+        with metrics.stage("test_queries"):
+            run_test_queries(client, test_collection)
+
+    logger.info("=" * 80)
+    logger.info("Carregamento de dados concluído com sucesso!")
+    logger.info("=" * 80)
+
+
+def write_metrics(args: argparse.Namespace, metrics: RunMetrics) -> None:
+    """Loga o resumo da carga e grava os relatórios pedidos."""
+    metrics.log_summary()
+    try:
+        if args.report:
+            metrics.write_json(args.report)
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
+    except OSError as e:
+        logger.error(f"Falha ao gravar relatório da carga: {e}")
+
+
+def write_profile(args: argparse.Namespace, profiler: SamplingProfiler | None) -> None:
+    """Encerra o profiler e grava o perfil, se --profile foi usado."""
+    if profiler is None:
+        return
+    profiler.stop()
+    try:
+        profiler.write(args.profile)
+    except OSError as e:
+        logger.error(f"Falha ao gravar perfil da carga: {e}")
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+    metrics = RunMetrics(
+        labels={"mode": args.mode, "stream": args.stream, "async": args.use_async}
+    )
+    profiler = SamplingProfiler(args.profile_interval) if args.profile else None
+    if profiler is not None:
+        profiler.start()
+
+    try:
+        load(args, metrics)
     except Exception as e:
         logger.error(f"Falha no carregamento de dados: {e}")
+        metrics.finish("failed")
+        write_profile(args, profiler)
+        write_metrics(args, metrics)
         sys.exit(1)
 
+    metrics.finish()
+    write_profile(args, profiler)
+    write_metrics(args, metrics)
+
 
 if __name__ == "__main__":
     main()
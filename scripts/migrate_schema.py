@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+CLI para migrar o schema da coleção no lugar.
+
+Compara COLLECTION_SCHEMA com o schema no servidor, adiciona, remove ou
+recria os campos que mudaram e preenche apenas esses campos nos documentos
+existentes com importações parciais (action 'update').
+
+Usage:
+    # Mostra as diferenças sem alterar nada
+    python scripts/migrate_schema.py --dry-run
+
+    # Migra e preenche os campos novos em streaming
+    python scripts/migrate_schema.py --stream --concurrency 4
+"""
+
+import argparse
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente do .env
+load_dotenv()
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+from typesense_dgb import (
+    COLLECTION_NAME,
+    download_and_process_dataset,
+    iter_dataset_chunks,
+    wait_for_typesense,
+)
+from typesense_dgb.client import leader_client
+from typesense_dgb.collection import (
+    DEFAULT_SCHEMA_PROFILE,
+    SCHEMA_PROFILES,
+    build_schema,
+)
+from typesense_dgb.dataset import DEFAULT_CHUNK_SIZE
+from typesense_dgb.indexer import validate_fields
+from typesense_dgb.migration import (
+    backfill,
+    backfill_fields,
+    diff_schema,
+    migrate_schema,
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Migra o schema da coleção sem recriá-la",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Apenas mostra as diferenças
+  python migrate_schema.py --dry-run
+
+  # Migra o schema sem preencher os campos
+  python migrate_schema.py --no-backfill
+
+  # Migra e preenche os campos novos
+  python migrate_schema.py --stream --concurrency 4
+
+  # Converte a coleção existente para o perfil enxuto
+  python migrate_schema.py --schema-profile lean
+        """,
+    )
+
+    parser.add_argument(
+        "--collection",
+        type=str,
+        default=COLLECTION_NAME,
+        help=f"Coleção ou alias a migrar (default: {COLLECTION_NAME})",
+    )
+
+    parser.add_argument(
+        "--schema-profile",
+        type=str,
+        choices=list(SCHEMA_PROFILES),
+        default=DEFAULT_SCHEMA_PROFILE,
+        help=f"Perfil de schema desejado (default: {DEFAULT_SCHEMA_PROFILE})",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Apenas mostra as diferenças, sem alterar o schema",
+    )
+
+    parser.add_argument(
+        "--no-backfill",
+        action="store_true",
+        help="Não preenche os campos adicionados ou alterados",
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Limita número de registros do backfill (útil para testes rápidos)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Processa o dataset em chunks Arrow sem carregá-lo inteiro em memória",
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Registros por chunk no modo --stream (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Número máximo de batches de importação em voo (default: 1)",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+
+    try:
+        client = wait_for_typesense()
+        if not client:
+            raise RuntimeError("Não foi possível conectar ao Typesense")
+        client = leader_client(client)
+
+        schema = build_schema(args.schema_profile)
+
+        # Valida o backfill antes de alterar o schema no servidor
+        live = client.collections[args.collection].retrieve()
+        fields = backfill_fields(diff_schema(live, schema))
+        if fields and not args.no_backfill:
+            validate_fields(fields)
+
+        migrate_schema(client, args.collection, schema=schema, dry_run=args.dry_run)
+
+        if args.dry_run or args.no_backfill or not fields:
+            if fields:
+                logger.info(f"Campos a preencher: {', '.join(fields)}")
+            return
+
+        if args.stream:
+            df = iter_dataset_chunks(
+                mode="full", limit=args.limit, chunk_size=args.chunk_size, fields=fields
+            )
+        else:
+            df = download_and_process_dataset(
+                mode="full", limit=args.limit, fields=fields
+            )
+
+        stats = backfill(
+            client,
+            df,
+            fields,
+            collection_name=args.collection,
+            concurrency=args.concurrency,
+        )
+
+        logger.info("=" * 80)
+        logger.info(
+            f"Backfill concluído: {stats['total_processed']} documentos, "
+            f"{stats['errors']} erros"
+        )
+        logger.info("=" * 80)
+
+    except Exception as e:
+        logger.error(f"Falha na migração: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+CLI para retenção: remove matérias antigas ou retiradas da coleção.
+
+Usa delete-by-filter em fatias, com pausa entre as chamadas, sem recriar a
+coleção.
+
+Usage:
+    # Conta as matérias com mais de 2 anos, sem remover
+    python scripts/prune.py --days 730 --dry-run
+
+    # Remove as matérias publicadas antes de 2020
+    python scripts/prune.py --before 2020-01-01
+
+    # Remove as matérias retiradas listadas em um arquivo (um id por linha)
+    python scripts/prune.py --ids-file retiradas.txt
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente do .env
+load_dotenv()
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+from typesense_dgb import COLLECTION_NAME, wait_for_typesense
+from typesense_dgb.client import leader_client
+from typesense_dgb.partitions import (
+    PARTITION_TZ,
+    drop_partitions_before,
+    list_partitions,
+    partition_name,
+)
+from typesense_dgb.retention import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_THROTTLE,
+    DEFAULT_WINDOW_DAYS,
+    delete_ids,
+    prune_before,
+    retention_cutoff,
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Remove matérias antigas ou retiradas do Typesense",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Mantém só os últimos 2 anos (conferindo antes)
+  python prune.py --days 730 --dry-run
+  python prune.py --days 730
+
+  # Remove uma lista de ids
+  python prune.py --ids-file retiradas.txt
+
+  # Layout particionado: remove partições inteiras antes do ano de corte
+  python prune.py --before 2022-01-01 --partitioned
+        """,
+    )
+
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--days",
+        type=int,
+        help="Mantém apenas as matérias publicadas nos últimos N dias",
+    )
+    target.add_argument(
+        "--before",
+        type=lambda value: datetime.fromisoformat(value).replace(tzinfo=PARTITION_TZ),
+        help="Remove as matérias publicadas antes desta data (AAAA-MM-DD, horário de Brasília)",
+    )
+    target.add_argument(
+        "--ids-file",
+        type=str,
+        help="Arquivo com os ids a remover, um por linha",
+    )
+
+    parser.add_argument(
+        "--collection",
+        type=str,
+        default=COLLECTION_NAME,
+        help=f"Coleção ou alias (default: {COLLECTION_NAME})",
+    )
+
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Layout particionado: remove partições inteiras e filtra só a do ano de corte",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Documentos removidos por lote em cada chamada (default: {DEFAULT_BATCH_SIZE})",
+    )
+
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=DEFAULT_WINDOW_DAYS,
+        help=f"Dias de published_at removidos por chamada (default: {DEFAULT_WINDOW_DAYS})",
+    )
+
+    parser.add_argument(
+        "--throttle",
+        type=float,
+        default=DEFAULT_THROTTLE,
+        help=f"Pausa entre chamadas em segundos (default: {DEFAULT_THROTTLE})",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Apenas conta os documentos que seriam removidos",
+    )
+
+    args = parser.parse_args()
+    if args.partitioned and args.ids_file:
+        parser.error("--partitioned só é suportado com --days ou --before")
+    return args
+
+
+def prune_partitioned(client, args: argparse.Namespace, cutoff: int) -> dict:
+    """
+    Remove partições anteriores ao ano de corte e filtra a partição desse ano.
+
+    Os documentos das partições removidas (ou que seriam, no dry-run) entram
+    em 'expected' e, fora do dry-run, em 'deleted'.
+    """
+    year = datetime.fromtimestamp(cutoff, PARTITION_TZ).year
+    partitions = list_partitions(client, args.collection)
+    stale = [name for partition_year, name in partitions.items() if partition_year < year]
+    stale_documents = sum(client.collections[name].retrieve()["num_documents"] for name in stale)
+    logger.info(
+        f"Partições anteriores a {year}: {', '.join(stale) or 'nenhuma'} "
+        f"({stale_documents} documentos)"
+    )
+    if not args.dry_run:
+        drop_partitions_before(client, year, args.collection)
+
+    if year in partitions:
+        stats = prune_before(
+            client,
+            cutoff,
+            collection_name=partition_name(year, args.collection),
+            batch_size=args.batch_size,
+            window_days=args.window_days,
+            throttle=args.throttle,
+            dry_run=args.dry_run,
+        )
+    else:
+        stats = {"expected": 0, "deleted": 0, "calls": 0, "elapsed": 0.0}
+    stats["expected"] += stale_documents
+    if not args.dry_run:
+        stats["deleted"] += stale_documents
+    return stats
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+
+    try:
+        client = wait_for_typesense()
+        if not client:
+            raise RuntimeError("Não foi possível conectar ao Typesense")
+        client = leader_client(client)
+
+        if args.ids_file:
+            with open(args.ids_file, encoding="utf-8") as f:
+                ids = [line.strip() for line in f if line.strip()]
+            stats = delete_ids(
+                client,
+                ids,
+                collection_name=args.collection,
+                batch_size=args.batch_size,
+                throttle=args.throttle,
+                dry_run=args.dry_run,
+            )
+        else:
+            cutoff = (
+                retention_cutoff(args.days)
+                if args.days is not None
+                else int(args.before.timestamp())
+            )
+            if args.partitioned:
+                stats = prune_partitioned(client, args, cutoff)
+            else:
+                stats = prune_before(
+                    client,
+                    cutoff,
+                    collection_name=args.collection,
+                    batch_size=args.batch_size,
+                    window_days=args.window_days,
+                    throttle=args.throttle,
+                    dry_run=args.dry_run,
+                )
+
+    except Exception as e:
+        logger.error(f"Falha na retenção: {e}")
+        sys.exit(1)
+
+    logger.info("=" * 80)
+    if args.dry_run:
+        logger.info(f"Dry-run: {stats['expected']} documentos seriam removidos")
+    else:
+        logger.info(
+            f"Removidos {stats['deleted']} documentos em {stats['calls']} chamadas "
+            f"({stats['elapsed']:.1f}s)"
+        )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
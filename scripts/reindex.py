@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+CLI para reindexação completa sem indisponibilidade (blue/green).
+
+Cria uma nova geração news_<timestamp>, indexa o dataset completo nela,
+valida contagem e consultas de fumaça e reaponta o alias 'news' de forma
+atômica. Gerações antigas são removidas, mantendo as --keep mais recentes.
+
+Usage:
+    # Reindexação completa em streaming, com importação concorrente
+    python scripts/reindex.py --stream --concurrency 4 --workers 4
+
+    # Apenas remove gerações antigas
+    python scripts/reindex.py --gc-only --keep 2
+"""
+
+import argparse
+import logging
+import sys
+
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente do .env
+load_dotenv()
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+from typesense_dgb import (
+    COLLECTION_NAME,
+    download_and_process_dataset,
+    iter_dataset_chunks,
+    wait_for_typesense,
+)
+from typesense_dgb.batching import DEFAULT_TARGET_LATENCY, AdaptiveBatcher
+from typesense_dgb.client import leader_client
+from typesense_dgb.collection import (
+    DEFAULT_SCHEMA_PROFILE,
+    SCHEMA_PROFILES,
+    build_schema,
+)
+from typesense_dgb.dataset import DEFAULT_CHUNK_SIZE
+from typesense_dgb.metrics import RunMetrics
+from typesense_dgb.reindex import (
+    DEFAULT_KEEP,
+    DEFAULT_MAX_ERROR_RATE,
+    DEFAULT_MIN_RATIO,
+    collect_garbage,
+    reindex,
+)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Reindexa o govbrnews em uma nova geração e troca o alias",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  # Reindexação completa
+  python reindex.py --stream --concurrency 4
+
+  # Teste rápido (validação relaxada)
+  python reindex.py --limit 1000 --min-ratio 0
+
+  # Apenas remove gerações antigas
+  python reindex.py --gc-only
+        """,
+    )
+
+    parser.add_argument(
+        "--alias",
+        type=str,
+        default=COLLECTION_NAME,
+        help=f"Alias servido às buscas (default: {COLLECTION_NAME})",
+    )
+
+    parser.add_argument(
+        "--schema-profile",
+        type=str,
+        choices=list(SCHEMA_PROFILES),
+        default=DEFAULT_SCHEMA_PROFILE,
+        help=f"Perfil de schema da nova geração (default: {DEFAULT_SCHEMA_PROFILE})",
+    )
+
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_KEEP,
+        help=f"Gerações mantidas após a troca, incluindo a nova (default: {DEFAULT_KEEP})",
+    )
+
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        default=DEFAULT_MIN_RATIO,
+        help=f"Fração mínima de documentos em relação à geração atual (default: {DEFAULT_MIN_RATIO})",
+    )
+
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=DEFAULT_MAX_ERROR_RATE,
+        help=f"Fração máxima de documentos rejeitados (default: {DEFAULT_MAX_ERROR_RATE})",
+    )
+
+    parser.add_argument(
+        "--gc-only",
+        action="store_true",
+        help="Apenas remove gerações antigas, sem reindexar",
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Limita número de registros (útil para testes rápidos)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Processa o dataset em chunks Arrow sem carregá-lo inteiro em memória",
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Registros por chunk no modo --stream (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Número máximo de batches de importação em voo (default: 4)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processos que preparam e serializam os documentos em paralelo (default: 1)",
+    )
+
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        default=None,
+        help="Ativa batches adaptativos com este orçamento inicial em bytes",
+    )
+
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=DEFAULT_TARGET_LATENCY,
+        help=f"Latência alvo por importação nos batches adaptativos (default: {DEFAULT_TARGET_LATENCY}s)",
+    )
+
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="Grava um relatório JSON da reindexação",
+    )
+
+    return parser.parse_args()
+
+
+def connect(args: argparse.Namespace):
+    """Aguarda o Typesense e retorna um cliente fixado no líder."""
+    client = wait_for_typesense(pool_size=args.concurrency + 1)
+    if not client:
+        raise RuntimeError("Não foi possível conectar ao Typesense")
+    return leader_client(client)
+
+
+def collect_only(args: argparse.Namespace) -> None:
+    """Remove as gerações antigas sem reindexar (--gc-only)."""
+    try:
+        removed = collect_garbage(connect(args), args.alias, args.keep)
+    except Exception as e:
+        logger.error(f"Falha na remoção de gerações: {e}")
+        sys.exit(1)
+    logger.info(f"Gerações removidas: {len(removed)}")
+
+
+def main() -> None:
+    """Main function."""
+    args = parse_arguments()
+    if args.gc_only:
+        collect_only(args)
+        sys.exit(0)
+
+    metrics = RunMetrics(labels={"mode": "reindex", "alias": args.alias})
+    try:
+        client = connect(args)
+
+        if args.stream:
+            df = iter_dataset_chunks(
+                mode="full",
+                limit=args.limit,
+                chunk_size=args.chunk_size,
+                metrics=metrics,
+            )
+        else:
+            df = download_and_process_dataset(
+                mode="full", limit=args.limit, metrics=metrics
+            )
+
+        batcher = None
+        if args.batch_bytes:
+            batcher = AdaptiveBatcher(
+                batch_bytes=args.batch_bytes,
+                target_latency=args.target_latency,
+            )
+
+        stats = reindex(
+            client,
+            df,
+            alias=args.alias,
+            schema=build_schema(args.schema_profile),
+            keep=args.keep,
+            min_ratio=args.min_ratio,
+            max_error_rate=args.max_error_rate,
+            concurrency=args.concurrency,
+            workers=args.workers,
+            batcher=batcher,
+            metrics=metrics,
+        )
+        metrics.record_stats(stats)
+        metrics.finish()
+
+        logger.info("=" * 80)
+        logger.info(f"Alias '{args.alias}' agora aponta para '{stats['collection']}'")
+        logger.info("=" * 80)
+
+    except Exception as e:
+        logger.error(f"Falha na reindexação: {e}")
+        metrics.finish("failed")
+        sys.exit(1)
+
+    finally:
+        metrics.log_summary()
+        if args.report:
+            metrics.write_json(args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,19 +6,57 @@ Este módulo fornece funcionalidades para:
 - Criação e gerenciamento de coleções
 - Download e processamento do dataset govbrnews
 - Indexação de documentos
+
+Os nomes públicos são resolvidos sob demanda (PEP 562): `import typesense_dgb`
+não carrega pandas, datasets nem pyarrow, que só são importados no primeiro
+acesso a um nome que depende deles. Assim, scripts e funções que só buscam ou
+administram coleções não pagam o custo de inicialização da carga de dados.
 """
 
-from typesense_dgb.client import get_client, wait_for_typesense
-from typesense_dgb.collection import (
-    COLLECTION_NAME,
-    COLLECTION_SCHEMA,
-    create_collection,
-    delete_collection,
-    list_collections,
-)
-from typesense_dgb.dataset import download_and_process_dataset
-from typesense_dgb.indexer import index_documents, prepare_document
-from typesense_dgb.utils import calculate_published_week
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typesense_dgb.async_indexer import index_documents_async
+    from typesense_dgb.client import get_client, wait_for_typesense
+    from typesense_dgb.collection import (
+        COLLECTION_NAME,
+        COLLECTION_SCHEMA,
+        create_collection,
+        delete_collection,
+        list_collections,
+    )
+    from typesense_dgb.dataset import download_and_process_dataset, iter_dataset_chunks
+    from typesense_dgb.indexer import (
+        index_documents,
+        prepare_document,
+        prepare_documents,
+    )
+    from typesense_dgb.utils import (
+        calculate_published_week,
+        calculate_published_weeks,
+        to_epoch_seconds,
+    )
+
+# Nome público -> módulo que o define
+_LAZY_ATTRIBUTES = {
+    "index_documents_async": "typesense_dgb.async_indexer",
+    "get_client": "typesense_dgb.client",
+    "wait_for_typesense": "typesense_dgb.client",
+    "COLLECTION_NAME": "typesense_dgb.collection",
+    "COLLECTION_SCHEMA": "typesense_dgb.collection",
+    "create_collection": "typesense_dgb.collection",
+    "delete_collection": "typesense_dgb.collection",
+    "list_collections": "typesense_dgb.collection",
+    "download_and_process_dataset": "typesense_dgb.dataset",
+    "iter_dataset_chunks": "typesense_dgb.dataset",
+    "index_documents": "typesense_dgb.indexer",
+    "prepare_document": "typesense_dgb.indexer",
+    "prepare_documents": "typesense_dgb.indexer",
+    "calculate_published_week": "typesense_dgb.utils",
+    "calculate_published_weeks": "typesense_dgb.utils",
+    "to_epoch_seconds": "typesense_dgb.utils",
+}
 
 __version__ = "1.0.0"
 __all__ = [
@@ -33,9 +71,28 @@ __all__ = [
     "list_collections",
     # Dataset
     "download_and_process_dataset",
+    "iter_dataset_chunks",
     # Indexer
     "index_documents",
+    "index_documents_async",
     "prepare_document",
+    "prepare_documents",
     # Utils
     "calculate_published_week",
+    "calculate_published_weeks",
+    "to_epoch_seconds",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o módulo de um nome público no primeiro acesso."""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
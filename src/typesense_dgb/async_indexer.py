@@ -0,0 +1,338 @@
+"""
+Indexação assíncrona de documentos no Typesense.
+
+Pipeline em estágios ligados por filas limitadas:
+
+    leitura do dataset → preparação → serialização JSONL → importação HTTP
+
+Cada estágio CPU-bound roda em uma thread auxiliar (asyncio.to_thread) e a
+importação usa aiohttp, sem bloquear o event loop. Como as filas têm tamanho
+máximo, importações lentas aplicam backpressure à preparação em vez de
+acumular batches em memória.
+
+As requisições seguem a política do cliente typesense: uma falha de conexão,
+timeout ou 5xx é repetida até num_retries vezes, passando ao próximo nó
+configurado a cada tentativa.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+import aiohttp
+import pandas as pd
+import typesense
+from typesense.api_call import ApiCall
+from typesense.exceptions import HTTPStatus0Error, ServerError, ServiceUnavailable
+
+from typesense_dgb.client import split_timeout
+from typesense_dgb.collection import COLLECTION_NAME
+from typesense_dgb.indexer import (
+    BATCH_LATENCY_WINDOW,
+    iter_frames,
+    prepare_documents,
+    prepare_rows,
+    should_skip,
+)
+from typesense_dgb.jsonl import dumps_jsonl, parse_import_response
+
+logger = logging.getLogger(__name__)
+
+# Número máximo de itens aguardando em cada fila do pipeline
+DEFAULT_QUEUE_SIZE = 4
+
+# Marca de fim de fluxo entre estágios
+_DONE = None
+
+# Falhas repetidas no próximo nó, como no cliente typesense
+RETRYABLE_ERRORS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    HTTPStatus0Error,
+    ServerError,
+    ServiceUnavailable,
+)
+
+
+class _Nodes:
+    """
+    Nós do cliente, com failover entre tentativas.
+
+    Todas as requisições vão ao nó atual; uma falha repetível passa ao
+    próximo nó, que segue como atual para as requisições seguintes.
+    """
+
+    def __init__(self, client: typesense.Client) -> None:
+        config = client.config
+        self.urls = [node.url() for node in config.nodes]
+        self.retries = config.num_retries
+        self.retry_interval = config.retry_interval_seconds
+        self.current = 0
+
+    async def request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        path: str,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Executa uma requisição e converte status de erro nas exceções do typesense.
+
+        Args:
+            session: Sessão aiohttp com o header de API key
+            method: Método HTTP
+            path: Caminho a partir da URL do nó (ex: '/collections/news')
+            **kwargs: Argumentos repassados a session.request
+
+        Returns:
+            Corpo da resposta como texto
+
+        Raises:
+            TypesenseClientError: Se o status não for 2xx
+            aiohttp.ClientError: Se todas as tentativas falharem na conexão
+        """
+        attempt = 0
+        while True:
+            index = self.current
+            url = self.urls[index]
+            try:
+                async with session.request(method, url + path, **kwargs) as response:
+                    body = await response.text()
+                    if not 200 <= response.status < 300:
+                        try:
+                            message = json.loads(body).get("message", "API error.")
+                        except ValueError:
+                            message = "API error."
+                        raise ApiCall.get_exception(response.status)(
+                            response.status, message
+                        )
+                    return body
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                if self.current == index:
+                    self.current = (index + 1) % len(self.urls)
+                logger.warning(
+                    f"Falha em {method} {url}{path}: {e!r}; tentativa {attempt} de "
+                    f"{self.retries} em {self.urls[self.current]}"
+                )
+                await asyncio.sleep(self.retry_interval)
+
+
+async def _read_stage(
+    df: pd.DataFrame | Iterable[pd.DataFrame], out_queue: asyncio.Queue
+) -> None:
+    """Lê os chunks do dataset em uma thread auxiliar."""
+    frames = iter_frames(df)
+    while True:
+        frame = await asyncio.to_thread(next, frames, _DONE)
+        if frame is _DONE:
+            break
+        await out_queue.put(frame)
+    await out_queue.put(_DONE)
+
+
+async def _prepare_stage(
+    in_queue: asyncio.Queue,
+    out_queue: asyncio.Queue,
+    batch_size: int,
+    stats: dict[str, Any],
+) -> None:
+    """Prepara os documentos de cada chunk e os agrupa em batches."""
+    pending: list[dict[str, Any]] = []
+    while (frame := await in_queue.get()) is not _DONE:
+        try:
+            prepared = await asyncio.to_thread(prepare_documents, frame)
+        except Exception as e:
+            logger.warning(
+                f"Falha na preparação vetorizada ({e}), preparando linha a linha"
+            )
+            prepared, _ = await asyncio.to_thread(prepare_rows, frame, stats)
+        stats["total_processed"] += len(prepared)
+        pending.extend(prepared)
+
+        start = 0
+        while len(pending) - start >= batch_size:
+            await out_queue.put(pending[start : start + batch_size])
+            start += batch_size
+        pending = pending[start:]
+
+    if pending:
+        await out_queue.put(pending)
+    await out_queue.put(_DONE)
+
+
+async def _serialize_stage(
+    in_queue: asyncio.Queue, out_queue: asyncio.Queue, num_importers: int
+) -> None:
+    """Serializa cada batch em JSONL."""
+    while (batch := await in_queue.get()) is not _DONE:
+        payload = await asyncio.to_thread(dumps_jsonl, batch)
+        await out_queue.put((len(batch), payload))
+    for _ in range(num_importers):
+        await out_queue.put(_DONE)
+
+
+async def _import_stage(
+    session: aiohttp.ClientSession,
+    nodes: _Nodes,
+    import_path: str,
+    in_queue: asyncio.Queue,
+    stats: dict[str, Any],
+) -> None:
+    """Envia os payloads JSONL ao endpoint de importação."""
+    while (item := await in_queue.get()) is not _DONE:
+        count, payload = item
+        logger.info(f"Indexando batch de {count} documentos...")
+        started = time.perf_counter()
+        body = await nodes.request(
+            session,
+            "POST",
+            import_path,
+            params={"action": "upsert"},
+            data=payload,
+        )
+
+        stats["batches"] += 1
+        stats["documents_sent"] += count
+        stats["bytes_sent"] += len(payload)
+        stats["max_batch_bytes"] = max(stats["max_batch_bytes"], len(payload))
+        stats["batch_latencies"].append(round(time.perf_counter() - started, 4))
+
+        _, errors = parse_import_response(body)
+        if errors:
+            stats["errors"] += len(errors)
+            logger.warning(f"Encontrados {len(errors)} erros no batch")
+            for error in errors[:5]:
+                logger.warning(f"Erro: {error}")
+        else:
+            stats["total_indexed"] += count
+
+
+async def index_documents_async(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    collection_name: str = COLLECTION_NAME,
+    mode: str = "full",
+    force: bool = False,
+    batch_size: int = 1000,
+    concurrency: int = 2,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> dict[str, Any]:
+    """
+    Versão assíncrona de index_documents, com pipeline em estágios.
+
+    Apenas a configuração do cliente (nós, API key, timeout, num_retries e
+    retry_interval_seconds) é usada; todas as chamadas HTTP são feitas via
+    aiohttp, com failover entre os nós.
+
+    Args:
+        client: Cliente Typesense (fonte da configuração de conexão)
+        df: DataFrame com documentos a indexar, ou iterável de DataFrames
+        collection_name: Nome da coleção
+        mode: 'full' ou 'incremental'
+        force: Se True, permite modo full em coleções não vazias
+        batch_size: Tamanho do batch para importação (default: 1000)
+        concurrency: Número de importações HTTP simultâneas (default: 2)
+        queue_size: Capacidade de cada fila entre estágios (default: 4)
+
+    Returns:
+        Dicionário com estatísticas da indexação (mesmo formato de index_documents)
+
+    Raises:
+        Exception: Se ocorrer erro na indexação
+    """
+    stats = {
+        "total_processed": 0,
+        "total_indexed": 0,
+        "errors": 0,
+        "skipped": False,
+        "unchanged": 0,
+        "batches": 0,
+        "documents_sent": 0,
+        "bytes_sent": 0,
+        "max_batch_bytes": 0,
+        "batch_latencies": deque(maxlen=BATCH_LATENCY_WINDOW),
+    }
+
+    config = client.config
+    nodes = _Nodes(client)
+    collection_path = f"/collections/{collection_name}"
+    connect_timeout, read_timeout = split_timeout(config.connection_timeout_seconds)
+    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    headers = {ApiCall.API_KEY_HEADER_NAME: config.api_key}
+
+    try:
+        logger.info(
+            f"Indexando documentos no Typesense (modo: {mode}, force: {force}, async)..."
+        )
+
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            collection_info = json.loads(
+                await nodes.request(session, "GET", collection_path)
+            )
+            existing_count = collection_info.get("num_documents", 0)
+
+            if should_skip(existing_count, mode, force, df):
+                stats["skipped"] = True
+                return stats
+
+            if isinstance(df, pd.DataFrame) and len(df) == 0:
+                logger.info("Nenhum documento para indexar. Saindo.")
+                return stats
+
+            concurrency = max(1, concurrency)
+            frames: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+            batches: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+            payloads: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+            tasks = [
+                asyncio.create_task(_read_stage(df, frames)),
+                asyncio.create_task(_prepare_stage(frames, batches, batch_size, stats)),
+                asyncio.create_task(_serialize_stage(batches, payloads, concurrency)),
+            ] + [
+                asyncio.create_task(
+                    _import_stage(
+                        session,
+                        nodes,
+                        f"{collection_path}/documents/import",
+                        payloads,
+                        stats,
+                    )
+                )
+                for _ in range(concurrency)
+            ]
+
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Um estágio falhou: cancela os demais para não travar nas filas
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            if stats["total_processed"] == 0 and stats["errors"] == 0:
+                logger.info("Nenhum documento para indexar. Saindo.")
+                return stats
+
+            collection_info = json.loads(
+                await nodes.request(session, "GET", collection_path)
+            )
+
+        total_docs = collection_info.get("num_documents", 0)
+        logger.info("Documentos indexados com sucesso no Typesense")
+        logger.info(f"Total de documentos na coleção: {total_docs}")
+        logger.info(f"  Nome da coleção: {collection_name}")
+
+        return stats
+
+    except Exception as e:
+        logger.error(f"Erro ao indexar documentos: {e}")
+        raise
@@ -0,0 +1,324 @@
+"""
+Auditoria de custo de memória do schema da coleção.
+
+O Typesense mantém em RAM o índice de busca, os facets e os valores de
+ordenação de todos os documentos; o conteúdo armazenado fica em disco.
+Esta auditoria prepara uma amostra do dataset exatamente como ela seria
+indexada, mede cardinalidade, preenchimento e tamanho médio de cada campo
+e estima a RAM gasta por índice, facet e ordenação. Configurações caras e
+sem uso (facet em campo quase único, ordenação em texto, campos indexados
+que não são buscados) são apontadas e um schema enxuto é sugerido.
+
+As estimativas usam regras práticas (o índice de texto ocupa cerca de duas
+vezes o texto indexado) e servem para comparar configurações, não para
+prever o consumo exato do servidor.
+"""
+
+import copy
+import json
+import logging
+from typing import Any
+
+import pandas as pd
+
+from typesense_dgb.collection import COLLECTION_SCHEMA
+from typesense_dgb.indexer import prepare_documents
+
+logger = logging.getLogger(__name__)
+
+# Registros lidos do dataset para a auditoria
+DEFAULT_SAMPLE_SIZE = 20000
+
+# Campos usados em query_by pelo portal e pelas consultas de teste
+QUERY_BY_FIELDS = ("title", "content")
+
+# Razão cardinalidade / documentos acima da qual um facet é considerado inútil
+FACET_CARDINALITY_RATIO = 0.5
+
+# Mínimo de valores na amostra para avaliar a cardinalidade de um campo
+MIN_FACET_SAMPLE = 100
+
+# Índice de texto (árvore de tokens e listas de postings) por byte indexado
+TEXT_INDEX_FACTOR = 2.0
+
+# Índice numérico (filtros e intervalos) por valor
+NUMERIC_INDEX_BYTES = 16
+
+# Referência de cada valor de facet, por documento
+FACET_VALUE_BYTES = 8
+
+# Entrada da tabela de valores distintos de um facet, além do próprio valor
+FACET_ENTRY_BYTES = 48
+
+# Valor de ordenação numérico por documento
+SORT_BYTES = 8
+
+# Sobrecarga da ordenação de strings por documento, além do próprio valor
+STRING_SORT_BYTES = 16
+
+_NUMERIC_TYPES = {"int32", "int64", "float"}
+
+
+def _value_bytes(value: Any) -> int:
+    """Tamanho em bytes UTF-8 de um valor como ele é enviado ao Typesense."""
+    if isinstance(value, list):
+        return sum(_value_bytes(v) for v in value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return 8
+
+
+def _sortable(field: dict[str, Any]) -> bool:
+    """Se o campo é ordenável (numéricos são por padrão no Typesense)."""
+    return field.get("sort", field["type"] in _NUMERIC_TYPES)
+
+
+def profile_field(
+    field: dict[str, Any], docs: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Mede um campo em uma amostra de documentos preparados.
+
+    Args:
+        field: Definição do campo no schema
+        docs: Documentos preparados por prepare_documents
+
+    Returns:
+        Dicionário com 'present' (documentos com valor), 'fill_rate',
+        'values' (total de valores, contando cada item de listas),
+        'cardinality' (valores distintos), 'avg_bytes' (por documento com
+        valor) e 'same_as_id' (se o valor é sempre igual ao id)
+    """
+    name = field["name"]
+    present = 0
+    values = 0
+    total_bytes = 0
+    distinct: set[Any] = set()
+    same_as_id = True
+    for doc in docs:
+        value = doc.get(name)
+        if value is None:
+            same_as_id = False
+            continue
+        present += 1
+        total_bytes += _value_bytes(value)
+        items = value if isinstance(value, list) else [value]
+        values += len(items)
+        distinct.update(items)
+        same_as_id = same_as_id and value == doc["id"]
+
+    return {
+        "present": present,
+        "fill_rate": present / len(docs) if docs else 0.0,
+        "values": values,
+        "cardinality": len(distinct),
+        "avg_bytes": total_bytes / present if present else 0.0,
+        "same_as_id": bool(docs) and same_as_id,
+    }
+
+
+def estimate_ram(
+    field: dict[str, Any], profile: dict[str, Any], documents: int, sample: int
+) -> dict[str, int]:
+    """
+    Estima a RAM de índice, facet e ordenação de um campo.
+
+    Args:
+        field: Definição do campo no schema
+        profile: Resultado de profile_field na amostra
+        documents: Total de documentos da coleção
+        sample: Tamanho da amostra
+
+    Returns:
+        Dicionário com bytes estimados em 'index', 'facet', 'sort' e 'total'
+    """
+    scale = documents / sample if sample else 0.0
+    present = profile["present"] * scale
+    values = profile["values"] * scale
+    text_bytes = present * profile["avg_bytes"]
+    is_numeric = field["type"].rstrip("[]") in _NUMERIC_TYPES
+
+    index = 0.0
+    if field.get("index", True):
+        index = values * NUMERIC_INDEX_BYTES if is_numeric else text_bytes * TEXT_INDEX_FACTOR
+
+    facet = 0.0
+    if field.get("facet", False):
+        cardinality = profile["cardinality"]
+        if profile["values"] and cardinality / profile["values"] > FACET_CARDINALITY_RATIO:
+            # Campos quase únicos crescem com a coleção
+            cardinality *= scale
+        avg_value = profile["avg_bytes"] * profile["present"] / max(profile["values"], 1)
+        facet = values * FACET_VALUE_BYTES + cardinality * (avg_value + FACET_ENTRY_BYTES)
+
+    sort = 0.0
+    if _sortable(field):
+        if is_numeric:
+            sort = documents * SORT_BYTES
+        else:
+            sort = present * (profile["avg_bytes"] + STRING_SORT_BYTES)
+
+    estimate = {"index": int(index), "facet": int(facet), "sort": int(sort)}
+    estimate["total"] = sum(estimate.values())
+    return estimate
+
+
+def _lean_field(
+    field: dict[str, Any],
+    profile: dict[str, Any],
+    query_by: tuple[str, ...],
+    default_sorting_field: str,
+) -> tuple[dict[str, Any], list[str]]:
+    """Sugere a definição enxuta de um campo e explica cada mudança."""
+    name = field["name"]
+    lean = dict(field)
+    findings = []
+
+    if name == default_sorting_field:
+        return lean, findings
+
+    if profile["present"] == 0:
+        findings.append(f"{name}: nenhum valor na amostra")
+
+    if profile["same_as_id"]:
+        findings.append(f"{name}: duplica o id do documento (filtre por id)")
+        lean.update(facet=False, sort=False, index=False, optional=True)
+        return lean, findings
+
+    if (
+        field.get("facet")
+        and profile["values"] >= MIN_FACET_SAMPLE
+        and profile["cardinality"] / profile["values"] > FACET_CARDINALITY_RATIO
+    ):
+        findings.append(
+            f"{name}: facet em campo quase único "
+            f"({profile['cardinality']} valores distintos em {profile['values']})"
+        )
+        lean["facet"] = False
+
+    if field["type"] == "string" and field.get("sort"):
+        findings.append(f"{name}: ordenação por string mantém uma cópia do valor em RAM")
+        lean["sort"] = False
+
+    if (
+        field["type"].startswith("string")
+        and field.get("index", True)
+        and name not in query_by
+        and not lean.get("facet")
+        and not lean.get("sort")
+    ):
+        findings.append(f"{name}: indexado mas fora de query_by e sem facet")
+        lean.update(index=False, optional=True)
+
+    return lean, findings
+
+
+def audit_schema(
+    df: pd.DataFrame,
+    schema: dict[str, Any] | None = None,
+    documents: int | None = None,
+    query_by: tuple[str, ...] = QUERY_BY_FIELDS,
+) -> dict[str, Any]:
+    """
+    Audita o custo de memória de um schema em uma amostra do dataset.
+
+    Args:
+        df: Amostra processada (ver download_and_process_dataset)
+        schema: Schema a auditar (default: COLLECTION_SCHEMA)
+        documents: Total de documentos para extrapolar (default: tamanho da amostra)
+        query_by: Campos buscados por texto; os demais campos string sem
+            facet podem deixar de ser indexados
+
+    Returns:
+        Dicionário com 'sample', 'documents', 'fields' (perfil e estimativa
+        atual e enxuta de cada campo), 'findings', 'ram_bytes',
+        'lean_ram_bytes' e 'lean_schema'
+    """
+    schema = schema or COLLECTION_SCHEMA
+    docs = prepare_documents(df)
+    sample = len(docs)
+    documents = documents or sample
+    default_sorting_field = schema.get("default_sorting_field", "")
+
+    lean_schema = copy.deepcopy(schema)
+    lean_schema["fields"] = []
+    fields = []
+    findings = []
+    for field in schema["fields"]:
+        profile = profile_field(field, docs)
+        lean, notes = _lean_field(field, profile, query_by, default_sorting_field)
+        lean_schema["fields"].append(lean)
+        findings += notes
+        fields.append(
+            {
+                "name": field["name"],
+                "type": field["type"],
+                **profile,
+                "ram": estimate_ram(field, profile, documents, sample),
+                "lean_ram": estimate_ram(lean, profile, documents, sample),
+            }
+        )
+
+    return {
+        "sample": sample,
+        "documents": documents,
+        "fields": fields,
+        "findings": findings,
+        "ram_bytes": sum(f["ram"]["total"] for f in fields),
+        "lean_ram_bytes": sum(f["lean_ram"]["total"] for f in fields),
+        "lean_schema": lean_schema,
+    }
+
+
+def _mib(value: float) -> str:
+    return f"{value / 2**20:9.1f}"
+
+
+def format_audit(audit: dict[str, Any]) -> str:
+    """
+    Monta o relatório da auditoria em texto.
+
+    Args:
+        audit: Resultado de audit_schema
+
+    Returns:
+        Tabela por campo, achados e totais estimados
+    """
+    lines = [
+        f"Amostra: {audit['sample']} documentos, estimativa para {audit['documents']}",
+        "",
+        f"{'campo':<28} {'preench.':>8} {'distintos':>9} {'bytes':>7} "
+        f"{'índice':>9} {'facet':>9} {'sort':>9} {'total':>9} {'enxuto':>9}  (MiB)",
+    ]
+    for field in sorted(audit["fields"], key=lambda f: -f["ram"]["total"]):
+        ram = field["ram"]
+        lines.append(
+            f"{field['name']:<28} {field['fill_rate']:8.1%} {field['cardinality']:9d} "
+            f"{field['avg_bytes']:7.0f} {_mib(ram['index'])} {_mib(ram['facet'])} "
+            f"{_mib(ram['sort'])} {_mib(ram['total'])} {_mib(field['lean_ram']['total'])}"
+        )
+
+    lines += ["", "== Achados =="]
+    lines += [f"- {finding}" for finding in audit["findings"]] or ["- nenhum"]
+
+    saved = audit["ram_bytes"] - audit["lean_ram_bytes"]
+    lines += [
+        "",
+        f"RAM estimada: {_mib(audit['ram_bytes']).strip()} MiB atual, "
+        f"{_mib(audit['lean_ram_bytes']).strip()} MiB com o schema enxuto "
+        f"(-{_mib(saved).strip()} MiB)",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_lean_schema(audit: dict[str, Any], path: str) -> None:
+    """
+    Grava o schema enxuto sugerido em JSON.
+
+    Args:
+        audit: Resultado de audit_schema
+        path: Caminho do arquivo
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(audit["lean_schema"], f, ensure_ascii=False, indent=2)
+    logger.info(f"Schema enxuto gravado em {path}")
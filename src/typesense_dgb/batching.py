@@ -0,0 +1,98 @@
+"""
+Dimensionamento adaptativo de batches de importação.
+
+O tamanho dos documentos do govbrnews varia em ordens de grandeza (o campo
+content vai de poucas linhas a matérias inteiras), então batches com número
+fixo de documentos oscilam entre payloads minúsculos e dezenas de megabytes.
+O AdaptiveBatcher limita cada batch por um orçamento em bytes e ajusta esse
+orçamento pela latência medida de cada importação (AIMD): cresce de forma
+aditiva enquanto as importações ficam abaixo da latência alvo e encolhe de
+forma multiplicativa quando passam do alvo ou falham por timeout.
+"""
+
+import threading
+
+MIB = 1024 * 1024
+
+# Orçamento inicial e limites em bytes por batch
+DEFAULT_BATCH_BYTES = 4 * MIB
+MIN_BATCH_BYTES = 256 * 1024
+MAX_BATCH_BYTES = 32 * MIB
+
+# Latência alvo por importação, bem abaixo do timeout padrão de 10s do cliente
+DEFAULT_TARGET_LATENCY = 3.0
+
+
+class AdaptiveBatcher:
+    """
+    Orçamento de bytes por batch ajustado por AIMD a partir da latência.
+
+    Args:
+        batch_bytes: Orçamento inicial em bytes (default: 4 MiB)
+        min_bytes: Limite inferior do orçamento (default: 256 KiB)
+        max_bytes: Limite superior do orçamento (default: 32 MiB)
+        target_latency: Latência alvo por importação em segundos (default: 3.0)
+        increase_bytes: Incremento aditivo após uma importação rápida
+            (default: 10% de max_bytes)
+        decrease_factor: Fator multiplicativo após importação lenta ou
+            timeout (default: 0.5)
+        max_documents: Limite de documentos por batch (default: 10000)
+    """
+
+    def __init__(
+        self,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        min_bytes: int = MIN_BATCH_BYTES,
+        max_bytes: int = MAX_BATCH_BYTES,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        increase_bytes: int | None = None,
+        decrease_factor: float = 0.5,
+        max_documents: int = 10000,
+    ) -> None:
+        if not 0 < min_bytes <= max_bytes:
+            raise ValueError("Limites de bytes inválidos: exige 0 < min_bytes <= max_bytes")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor deve estar entre 0 e 1")
+
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.increase_bytes = increase_bytes or max(1, max_bytes // 10)
+        self.decrease_factor = decrease_factor
+        self.max_documents = max_documents
+        self.budget = min(max(batch_bytes, min_bytes), max_bytes)
+        self._lock = threading.Lock()
+
+    def is_full(self, num_bytes: int, num_documents: int) -> bool:
+        """
+        Indica se um batch em construção atingiu o orçamento atual.
+
+        Args:
+            num_bytes: Bytes acumulados no batch
+            num_documents: Documentos acumulados no batch
+
+        Returns:
+            True se o batch deve ser enviado
+        """
+        return num_bytes >= self.budget or num_documents >= self.max_documents
+
+    def record(self, latency: float) -> None:
+        """
+        Ajusta o orçamento após uma importação concluída.
+
+        Args:
+            latency: Duração da importação em segundos
+        """
+        with self._lock:
+            if latency <= self.target_latency:
+                self.budget = min(self.max_bytes, self.budget + self.increase_bytes)
+            else:
+                self._shrink()
+
+    def record_timeout(self) -> None:
+        """Encolhe o orçamento após uma importação que estourou o timeout."""
+        with self._lock:
+            self._shrink()
+
+    def _shrink(self) -> None:
+        self.budget = max(self.min_bytes, int(self.budget * self.decrease_factor))
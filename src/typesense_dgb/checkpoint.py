@@ -0,0 +1,122 @@
+"""
+Checkpoint persistente para retomar cargas completas interrompidas.
+
+O checkpoint registra a revisão do dataset, quantas linhas do dataset já
+foram confirmadas pelo Typesense e as estatísticas acumuladas. Batches
+podem ser confirmados fora de ordem (importação concorrente); o checkpoint
+só avança até o maior prefixo contíguo de batches confirmados, de modo que
+retomar a partir dele nunca pula linhas.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Contadores acumulados no checkpoint (somente do prefixo confirmado)
+CHECKPOINT_COUNTERS = ("batches", "documents_sent", "total_indexed", "errors")
+
+
+class Checkpoint:
+    """
+    Estado de uma carga completa, gravado em JSON a cada avanço.
+
+    Args:
+        path: Caminho do arquivo de checkpoint
+        dataset_path: Caminho do dataset no HuggingFace
+        revision: Revisão (commit) do dataset usada na carga
+        collection_name: Coleção de destino
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dataset_path: str | None = None,
+        revision: str | None = None,
+        collection_name: str | None = None,
+    ) -> None:
+        self.path = path
+        self.state: dict[str, Any] = {
+            "dataset_path": dataset_path,
+            "revision": revision,
+            "collection_name": collection_name,
+            "rows_done": 0,
+            "completed": False,
+            "stats": {counter: 0 for counter in CHECKPOINT_COUNTERS},
+            "updated_at": None,
+        }
+        self._acked: dict[int, tuple[int, dict[str, int]]] = {}
+        self._next_sequence = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint | None":
+        """
+        Carrega um checkpoint existente.
+
+        Args:
+            path: Caminho do arquivo de checkpoint
+
+        Returns:
+            Checkpoint carregado, ou None se o arquivo não existir
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        checkpoint = cls(path)
+        checkpoint.state.update(state)
+        return checkpoint
+
+    @property
+    def rows_done(self) -> int:
+        """Número de linhas do dataset já confirmadas."""
+        return self.state["rows_done"]
+
+    @property
+    def revision(self) -> str | None:
+        """Revisão do dataset registrada no checkpoint."""
+        return self.state["revision"]
+
+    @property
+    def completed(self) -> bool:
+        """Indica se a carga terminou."""
+        return self.state["completed"]
+
+    def acknowledge(self, sequence: int, end_row: int, result: dict[str, int]) -> None:
+        """
+        Registra a confirmação de um batch e avança o checkpoint se possível.
+
+        Args:
+            sequence: Número de ordem do batch na carga atual (a partir de 0)
+            end_row: Posição no dataset da última linha coberta pelo batch
+            result: Contadores do batch (ver CHECKPOINT_COUNTERS)
+        """
+        self._acked[sequence] = (end_row, result)
+        advanced = False
+        while self._next_sequence in self._acked:
+            end_row, result = self._acked.pop(self._next_sequence)
+            self._next_sequence += 1
+            self.state["rows_done"] = max(self.state["rows_done"], end_row + 1)
+            for counter in CHECKPOINT_COUNTERS:
+                self.state["stats"][counter] += result.get(counter, 0)
+            advanced = True
+        if advanced:
+            self.save()
+
+    def complete(self) -> None:
+        """Marca a carga como concluída."""
+        self.state["completed"] = True
+        self.save()
+
+    def save(self) -> None:
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+        self.state["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
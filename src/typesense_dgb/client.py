@@ -1,16 +1,225 @@
 """
 Cliente Typesense - Conexão e configuração.
+
+Todas as chamadas do cliente typesense passam por uma única requests.Session
+do processo (typesense.api_call.session). Aqui ela é substituída por uma
+sessão com pool de conexões dimensionado e keep-alive, de modo que
+importações concorrentes e buscas reutilizam conexões TCP em vez de abrir uma
+por requisição. A sessão não faz retentativas: quem repete requisições é o
+próprio cliente typesense (num_retries), uma única camada que também troca de
+nó a cada tentativa.
+
+Em um cluster (TYPESENSE_NODES), as leituras circulam entre os nós saudáveis
+e, opcionalmente, preferem o nó mais próximo (TYPESENSE_NEAREST_NODE); um nó
+que falha é evitado até a próxima verificação de saúde. As escritas em massa
+usam um cliente fixado no líder do Raft (leader_client), evitando o
+encaminhamento de cada importação por um seguidor.
 """
 
 import logging
 import os
+import threading
 import time
+from functools import cache
+from urllib.parse import urlsplit
 
 import requests
 import typesense
+import typesense.api_call
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Conexões mantidas abertas por host no pool compartilhado
+DEFAULT_POOL_SIZE = int(os.getenv("TYPESENSE_POOL_SIZE", "32"))
+
+# Timeout para estabelecer a conexão TCP, em segundos
+DEFAULT_CONNECT_TIMEOUT = 3.0
+
+# Retentativas do cliente typesense após timeout, falha de conexão ou 5xx
+DEFAULT_RETRIES = 3
+
+# Pausa antes de repetir uma requisição no único nó, em segundos
+DEFAULT_RETRY_INTERVAL = 0.5
+
+# Segundos até um nó marcado como indisponível voltar a receber requisições
+DEFAULT_HEALTHCHECK_INTERVAL = 15
+
+# Pausa antes de tentar o próximo nó de um cluster após uma falha, em segundos
+DEFAULT_FAILOVER_INTERVAL = 0.1
+
+# Timeout (conexão, leitura) das verificações de saúde por nó
+HEALTH_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT, 5)
+
+# Valor de "state" em /debug para o líder do Raft
+LEADER_STATE = 1
+
+_session: requests.Session | None = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões e sem retentativas.
+
+    A sessão faz uma única tentativa por requisição; as retentativas ficam a
+    cargo do chamador (num_retries do cliente typesense, sondagens de saúde
+    ou o hedge das buscas), para que não se multipliquem.
+
+    Args:
+        pool_size: Conexões mantidas por host (>= concorrência de importação)
+
+    Returns:
+        requests.Session configurada
+    """
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def configure_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Instala uma nova sessão compartilhada para todos os clientes do processo.
+
+    Args:
+        pool_size: Conexões mantidas por host
+
+    Returns:
+        A sessão instalada
+    """
+    global _session, _session_pool_size
+    with _session_lock:
+        previous = _session
+        _session = build_session(pool_size)
+        _session_pool_size = pool_size
+        # Atributo interno do cliente typesense 0.21 (versão fixada em pyproject.toml)
+        typesense.api_call.session = _session
+    if previous is not None:
+        previous.close()
+    logger.debug(f"Sessão HTTP compartilhada: pool de {pool_size} conexões por host")
+    return _session
+
+
+def get_session(pool_size: int | None = None) -> requests.Session:
+    """
+    Retorna a sessão compartilhada, criando-a ou ampliando o pool se preciso.
+
+    Args:
+        pool_size: Tamanho mínimo do pool (default: DEFAULT_POOL_SIZE)
+
+    Returns:
+        Sessão usada por todos os clientes typesense do processo
+    """
+    wanted = pool_size or DEFAULT_POOL_SIZE
+    session = _session
+    if session is None or _session_pool_size < wanted:
+        session = configure_session(max(wanted, DEFAULT_POOL_SIZE))
+    return session
+
+
+@cache
+def probe_session() -> requests.Session:
+    """Sessão pequena para as verificações de saúde, que repetem por conta própria."""
+    return build_session(pool_size=4)
+
+
+def split_timeout(timeout: float | tuple[float, float]) -> tuple[float, float]:
+    """
+    Separa um timeout do cliente em (conexão, leitura).
+
+    Args:
+        timeout: connection_timeout_seconds da configuração do cliente
+
+    Returns:
+        Tupla (timeout de conexão, timeout de leitura)
+    """
+    if isinstance(timeout, (tuple, list)):
+        return float(timeout[0]), float(timeout[1])
+    return float(timeout), float(timeout)
+
+
+def parse_node(value: str, protocol: str = "http") -> dict[str, str]:
+    """
+    Converte um endereço de nó em configuração do cliente typesense.
+
+    Args:
+        value: URL (https://ts1:443) ou host:porta (ts1:8108)
+        protocol: Protocolo quando o endereço não traz esquema
+
+    Returns:
+        Dicionário com 'host', 'port' e 'protocol'
+
+    Raises:
+        ValueError: Se o endereço não tiver host
+    """
+    value = value.strip()
+    parts = urlsplit(value if "://" in value else f"{protocol}://{value}")
+    if not parts.hostname:
+        raise ValueError(f"Endereço de nó inválido: '{value}'")
+    default_port = "443" if parts.scheme == "https" else "8108"
+    return {
+        "host": parts.hostname,
+        "port": str(parts.port or default_port),
+        "protocol": parts.scheme,
+    }
+
+
+def parse_nodes(value: str, protocol: str = "http") -> list[dict[str, str]]:
+    """
+    Converte uma lista de nós separada por vírgulas (formato de TYPESENSE_NODES).
+
+    Args:
+        value: Ex: "http://ts1:8108,http://ts2:8108,http://ts3:8108"
+        protocol: Protocolo dos endereços sem esquema
+
+    Returns:
+        Lista de nós na ordem informada
+    """
+    return [parse_node(item, protocol) for item in value.split(",") if item.strip()]
+
+
+def resolve_nodes(
+    host: str | None = None,
+    port: str | None = None,
+    protocol: str = "http",
+    nodes: list[dict[str, str]] | None = None,
+) -> list[dict[str, str]]:
+    """
+    Determina os nós do cluster.
+
+    Precedência: nodes explícitos, host explícito, TYPESENSE_NODES e, por fim,
+    TYPESENSE_HOST/TYPESENSE_PORT (servidor único).
+
+    Args:
+        host: Host de um servidor único
+        port: Porta do servidor único
+        protocol: Protocolo de conexão
+        nodes: Lista de nós já configurada
+
+    Returns:
+        Lista de nós (dicionários com 'host', 'port' e 'protocol')
+    """
+    if nodes:
+        return list(nodes)
+    env_nodes = os.getenv("TYPESENSE_NODES")
+    if not host and env_nodes:
+        return parse_nodes(env_nodes, protocol)
+    return [
+        {
+            "host": host or os.getenv("TYPESENSE_HOST", "localhost"),
+            "port": port or os.getenv("TYPESENSE_PORT", "8108"),
+            "protocol": protocol,
+        }
+    ]
+
+
+def node_url(node: dict[str, str]) -> str:
+    """URL base de um nó."""
+    return f"{node['protocol']}://{node['host']}:{node['port']}"
+
 
 def get_client(
     host: str | None = None,
@@ -18,16 +227,36 @@ def get_client(
     api_key: str | None = None,
     protocol: str = "http",
     timeout: int = 10,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    pool_size: int | None = None,
+    nodes: list[dict[str, str]] | None = None,
+    nearest_node: str | dict[str, str] | None = None,
+    healthcheck_interval: int = DEFAULT_HEALTHCHECK_INTERVAL,
 ) -> typesense.Client:
     """
     Cria e retorna um cliente Typesense configurado.
 
+    Requisições que falham por timeout, conexão ou 5xx são repetidas pelo
+    cliente até DEFAULT_RETRIES vezes, em qualquer método (importações
+    inclusive). Com vários nós, cada requisição vai ao próximo nó saudável
+    (round-robin) e a repetição vai ao seguinte; um nó que falhou só volta a
+    ser usado após healthcheck_interval segundos.
+
     Args:
         host: Host do servidor Typesense (default: TYPESENSE_HOST env var ou 'localhost')
         port: Porta do servidor (default: TYPESENSE_PORT env var ou '8108')
         api_key: Chave de API (default: TYPESENSE_API_KEY env var)
         protocol: Protocolo de conexão (default: 'http')
-        timeout: Timeout de conexão em segundos (default: 10)
+        timeout: Timeout de leitura em segundos (default: 10)
+        connect_timeout: Timeout de conexão em segundos (default: 3)
+        pool_size: Tamanho mínimo do pool de conexões compartilhado
+            (default: TYPESENSE_POOL_SIZE env var ou 32)
+        nodes: Nós do cluster (default: TYPESENSE_NODES env var, se host não
+            for informado)
+        nearest_node: Nó preferido enquanto saudável, URL ou dicionário
+            (default: TYPESENSE_NEAREST_NODE env var)
+        healthcheck_interval: Segundos até um nó indisponível ser tentado de
+            novo (default: 15)
 
     Returns:
         typesense.Client: Cliente Typesense configurado
@@ -35,8 +264,10 @@ def get_client(
     Raises:
         ValueError: Se api_key não for fornecida
     """
-    host = host or os.getenv("TYPESENSE_HOST", "localhost")
-    port = port or os.getenv("TYPESENSE_PORT", "8108")
+    nodes = resolve_nodes(host, port, protocol, nodes)
+    nearest_node = nearest_node or os.getenv("TYPESENSE_NEAREST_NODE")
+    if isinstance(nearest_node, str):
+        nearest_node = parse_node(nearest_node, protocol)
     api_key = api_key or os.getenv(
         "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
     )
@@ -44,15 +275,137 @@ def get_client(
     if not api_key:
         raise ValueError("TYPESENSE_API_KEY deve ser configurada")
 
-    client = typesense.Client(
+    config = {
+        "nodes": nodes,
+        "api_key": api_key,
+        "connection_timeout_seconds": (connect_timeout, timeout),
+        "num_retries": DEFAULT_RETRIES,
+        "retry_interval_seconds": DEFAULT_RETRY_INTERVAL,
+    }
+    if len(nodes) > 1 or nearest_node:
+        # Uma tentativa por nó antes de desistir, com troca rápida de nó
+        config["nearest_node"] = nearest_node
+        config["num_retries"] = max(DEFAULT_RETRIES, len(nodes))
+        config["retry_interval_seconds"] = DEFAULT_FAILOVER_INTERVAL
+        config["healthcheck_interval_seconds"] = healthcheck_interval
+
+    get_session(pool_size)
+    return typesense.Client(config)
+
+
+def check_nodes(
+    nodes: list[dict[str, str]], api_key: str | None = None, roles: bool = True
+) -> list[dict]:
+    """
+    Verifica a saúde e o papel no Raft de cada nó.
+
+    Args:
+        nodes: Nós do cluster
+        api_key: Chave de API admin, exigida por /debug
+            (default: TYPESENSE_API_KEY env var)
+        roles: Se False, não consulta /debug ('leader' fica False)
+
+    Returns:
+        Lista, na ordem de nodes, de dicionários com 'node', 'healthy',
+        'leader', 'latency' (segundos) e 'error'
+    """
+    api_key = api_key or os.getenv(
+        "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
+    )
+    headers = {typesense.api_call.ApiCall.API_KEY_HEADER_NAME: api_key}
+    session = probe_session()
+
+    statuses = []
+    for node in nodes:
+        status = {"node": node, "healthy": False, "leader": False, "latency": None, "error": None}
+        base = node_url(node)
+        try:
+            start = time.perf_counter()
+            response = session.get(f"{base}/health", timeout=HEALTH_TIMEOUT)
+            status["latency"] = time.perf_counter() - start
+            status["healthy"] = response.status_code == 200 and response.json().get("ok", False)
+            if not status["healthy"]:
+                status["error"] = f"/health retornou {response.status_code}"
+            elif roles:
+                debug = session.get(f"{base}/debug", headers=headers, timeout=HEALTH_TIMEOUT)
+                if debug.status_code == 200:
+                    status["leader"] = debug.json().get("state") == LEADER_STATE
+        except (requests.RequestException, ValueError) as e:
+            status["error"] = str(e)
+        statuses.append(status)
+    return statuses
+
+
+def _client_nodes(client: typesense.Client) -> list[dict[str, str]]:
+    """Nós configurados em um cliente, no formato de get_client."""
+    return [
+        {"host": node.host, "port": str(node.port), "protocol": node.protocol}
+        for node in client.config.nodes
+    ]
+
+
+def leader_client(client: typesense.Client) -> typesense.Client:
+    """
+    Retorna um cliente fixado no líder do cluster, para escritas em massa.
+
+    Seguidores encaminham escritas ao líder; importar direto nele poupa um
+    salto por lote. Com um único nó, ou se nenhum líder responder, o próprio
+    cliente é retornado.
+
+    Args:
+        client: Cliente do cluster (fonte dos nós, chave e timeouts)
+
+    Returns:
+        Cliente cujas requisições vão apenas ao líder
+    """
+    config = client.config
+    nodes = _client_nodes(client)
+    if len(nodes) == 1:
+        return client
+
+    statuses = check_nodes(nodes, config.api_key)
+    leader = next((s["node"] for s in statuses if s["leader"]), None)
+    if leader is None:
+        logger.warning("Líder do cluster não encontrado; escritas seguem o round-robin")
+        return client
+
+    logger.info(f"Escritas fixadas no líder {node_url(leader)}")
+    return typesense.Client(
         {
-            "nodes": [{"host": host, "port": port, "protocol": protocol}],
-            "api_key": api_key,
-            "connection_timeout_seconds": timeout,
+            "nodes": [leader],
+            "api_key": config.api_key,
+            "connection_timeout_seconds": config.connection_timeout_seconds,
+            "num_retries": config.num_retries,
+            "retry_interval_seconds": config.retry_interval_seconds,
         }
     )
 
-    return client
+
+def single_attempt_client(client: typesense.Client) -> typesense.Client:
+    """
+    Retorna uma cópia do cliente que faz uma única tentativa por requisição.
+
+    Para chamadores que tratam as falhas por conta própria, como as
+    importações com batches adaptativos, que dividem o batch no primeiro
+    timeout em vez de reenviá-lo inteiro num_retries vezes.
+
+    Args:
+        client: Cliente de origem (nós, chave e timeouts)
+
+    Returns:
+        Cliente com num_retries=0 e sem pausa após a falha
+    """
+    config = client.config
+    return typesense.Client(
+        {
+            "nodes": _client_nodes(client),
+            "api_key": config.api_key,
+            "connection_timeout_seconds": config.connection_timeout_seconds,
+            "num_retries": 0,
+            "retry_interval_seconds": 0,
+            "healthcheck_interval_seconds": config.healthcheck_interval_seconds,
+        }
+    )
 
 
 def wait_for_typesense(
@@ -61,40 +414,55 @@ def wait_for_typesense(
     api_key: str | None = None,
     max_retries: int = 30,
     retry_interval: int = 2,
+    collection_name: str | None = None,
+    expected_documents: int | None = None,
+    **client_kwargs,
 ) -> typesense.Client | None:
     """
     Aguarda o servidor Typesense ficar pronto e retorna um cliente.
 
+    A espera usa backoff exponencial (readiness.wait_until_ready) com prazo
+    total de max_retries * retry_interval segundos e intervalo máximo de
+    retry_interval. Em um cluster, basta um nó saudável; os nós indisponíveis
+    são logados e ficam no fim da lista, para o round-robin começar pelos
+    saudáveis.
+
     Args:
         host: Host do servidor Typesense
         port: Porta do servidor
         api_key: Chave de API
-        max_retries: Número máximo de tentativas (default: 30)
-        retry_interval: Intervalo entre tentativas em segundos (default: 2)
+        max_retries: Junto com retry_interval, define o prazo total (default: 30)
+        retry_interval: Intervalo máximo entre tentativas em segundos (default: 2)
+        collection_name: Se informado, espera a coleção responder a buscas
+        expected_documents: Mínimo de documentos esperado em collection_name
+        **client_kwargs: Argumentos repassados a get_client (timeout, pool_size,
+            nodes...)
 
     Returns:
         typesense.Client se conectado, None se timeout
     """
-    host = host or os.getenv("TYPESENSE_HOST", "localhost")
-    port = port or os.getenv("TYPESENSE_PORT", "8108")
+    # Import local: readiness depende das verificações de nó deste módulo
+    from typesense_dgb.readiness import wait_until_ready
 
-    retry_count = 0
+    nodes = resolve_nodes(
+        host, port, client_kwargs.pop("protocol", "http"), client_kwargs.pop("nodes", None)
+    )
+    api_key = api_key or os.getenv(
+        "TYPESENSE_API_KEY", "govbrnews_api_key_change_in_production"
+    )
+    get_session(client_kwargs.get("pool_size"))
 
-    while retry_count < max_retries:
-        try:
-            health_url = f"http://{host}:{port}/health"
-            response = requests.get(health_url, timeout=5)
-
-            if response.status_code == 200:
-                logger.info("Typesense está pronto!")
-                return get_client(host=host, port=port, api_key=api_key)
-
-        except Exception as e:
-            retry_count += 1
-            logger.info(
-                f"Typesense não está pronto, tentativa {retry_count}/{max_retries}: {e}"
-            )
-            time.sleep(retry_interval)
-
-    logger.error("Typesense não ficou pronto após todas as tentativas")
-    return None
+    report = wait_until_ready(
+        nodes,
+        api_key,
+        deadline=max_retries * retry_interval,
+        max_interval=retry_interval,
+        collection_name=collection_name,
+        expected_documents=expected_documents,
+    )
+    if not report["ready"]:
+        return None
+
+    for node in report["nodes"][len(report["healthy"]) :]:
+        logger.warning(f"Nó {node_url(node)} indisponível")
+    return get_client(api_key=api_key, nodes=report["nodes"], **client_kwargs)
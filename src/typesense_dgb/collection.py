@@ -99,19 +99,127 @@ COLLECTION_SCHEMA: dict[str, Any] = {
     "default_sorting_field": "published_at",
 }
 
+# Papéis de campo nos perfis de schema:
+#   stored: armazenado e retornado nas buscas, mas fora do índice (index: false);
+#           não pode ser usado em query_by, filter_by, facet_by nem sort_by
+#   search: indexado para busca e filtro, sem facet nem ordenação
+STORED_ONLY = "stored"
+SEARCH_ONLY = "search"
+
+THEME_CODE_FIELDS = [
+    "theme_1_level_1_code",
+    "theme_1_level_2_code",
+    "theme_1_level_3_code",
+    "most_specific_theme_code",
+]
+
+# Perfis de schema: papel de cada campo alterado em relação a COLLECTION_SCHEMA
+SCHEMA_PROFILES: dict[str, dict[str, str]] = {
+    "full": {},
+    "lean": {
+        "unique_id": SEARCH_ONLY,
+        "url": STORED_ONLY,
+        "image": STORED_ONLY,
+        "extracted_at": STORED_ONLY,
+        **{name: STORED_ONLY for name in THEME_CODE_FIELDS},
+    },
+}
+
+DEFAULT_SCHEMA_PROFILE = "full"
+
+
+def build_schema(
+    profile: str = DEFAULT_SCHEMA_PROFILE,
+    base: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Monta o schema da coleção aplicando um perfil de campos.
+
+    Args:
+        profile: Nome do perfil em SCHEMA_PROFILES (default: 'full')
+        base: Schema de partida (default: COLLECTION_SCHEMA)
+
+    Returns:
+        Novo schema, com os campos do perfil marcados como apenas
+        armazenados ou apenas buscáveis
+
+    Raises:
+        ValueError: Se o perfil não existir ou alterar o campo de ordenação padrão
+    """
+    if profile not in SCHEMA_PROFILES:
+        raise ValueError(
+            f"Perfil de schema desconhecido: {profile} "
+            f"(disponíveis: {', '.join(SCHEMA_PROFILES)})"
+        )
+    base = base or COLLECTION_SCHEMA
+    roles = SCHEMA_PROFILES[profile]
+    if base.get("default_sorting_field") in roles:
+        raise ValueError("O campo de ordenação padrão precisa continuar indexado")
+
+    schema = dict(base)
+    schema["fields"] = []
+    for field in base["fields"]:
+        field = dict(field)
+        role = roles.get(field["name"])
+        if role == STORED_ONLY:
+            field.pop("sort", None)
+            field.update(facet=False, index=False, optional=True)
+        elif role == SEARCH_ONLY:
+            field.update(facet=False, sort=False)
+        schema["fields"].append(field)
+    return schema
+
+
+def resolve_alias(client: typesense.Client, alias: str) -> str | None:
+    """
+    Retorna a coleção física para a qual um alias aponta.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+
+    Returns:
+        Nome da coleção física, ou None se o alias não existir
+    """
+    try:
+        return client.aliases[alias].retrieve()["collection_name"]
+    except ObjectNotFound:
+        return None
+
+
+def upsert_alias(client: typesense.Client, alias: str, collection_name: str) -> None:
+    """
+    Cria ou reaponta um alias para uma coleção física.
+
+    A troca é atômica no Typesense: buscas pelo alias passam a usar a nova
+    coleção sem janela de indisponibilidade.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias (ex: 'news')
+        collection_name: Coleção física (ex: 'news_20250101120000')
+    """
+    client.aliases.upsert(alias, {"collection_name": collection_name})
+    logger.info(f"Alias '{alias}' aponta para '{collection_name}'")
+
 
 def create_collection(
     client: typesense.Client,
     collection_name: str = COLLECTION_NAME,
     schema: dict[str, Any] | None = None,
+    alias: str | None = None,
 ) -> bool:
     """
     Cria a coleção de notícias com o schema apropriado.
 
+    collection_name pode ser um alias existente: nesse caso nada é criado e
+    as operações seguintes usam a coleção física para a qual ele aponta.
+
     Args:
         client: Cliente Typesense
-        collection_name: Nome da coleção (default: 'news')
+        collection_name: Nome da coleção física ou de um alias (default: 'news')
         schema: Schema customizado (default: COLLECTION_SCHEMA)
+        alias: Se informado, aponta este alias para a coleção depois de criá-la
 
     Returns:
         True se a coleção foi criada ou já existe
@@ -120,18 +228,24 @@ def create_collection(
         Exception: Se ocorrer erro na criação
     """
     try:
+        target = resolve_alias(client, collection_name)
+        if target is not None:
+            logger.info(f"'{collection_name}' é um alias para a coleção '{target}'")
+            return True
+
         try:
             client.collections[collection_name].retrieve()
             logger.info(f"Coleção '{collection_name}' já existe")
-            return True
         except ObjectNotFound:
             logger.info(f"Coleção '{collection_name}' não encontrada, criando nova")
+            schema_to_use = dict(schema or COLLECTION_SCHEMA)
+            schema_to_use["name"] = collection_name
 
-        schema_to_use = schema or COLLECTION_SCHEMA.copy()
-        schema_to_use["name"] = collection_name
+            client.collections.create(schema_to_use)
+            logger.info("Coleção criada com sucesso")
 
-        client.collections.create(schema_to_use)
-        logger.info("Coleção criada com sucesso")
+        if alias is not None:
+            upsert_alias(client, alias, collection_name)
         return True
 
     except Exception as e:
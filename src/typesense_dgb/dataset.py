@@ -3,23 +3,328 @@ Download e processamento do dataset govbrnews.
 """
 
 import logging
+import os
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
+from glob import glob
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pads
 from datasets import load_dataset
+from huggingface_hub import HfApi, HfFileSystem
 
-from typesense_dgb.utils import calculate_published_week
+from typesense_dgb.collection import COLLECTION_SCHEMA
+from typesense_dgb.metrics import RunMetrics, timed
+from typesense_dgb.utils import calculate_published_weeks, to_epoch_seconds
 
 logger = logging.getLogger(__name__)
 
 DATASET_PATH = "nitaibezerra/govbrnews"
 
+# Número de registros por chunk no modo streaming
+DEFAULT_CHUNK_SIZE = 5000
+
+# Campos do schema calculados localmente (não existem no dataset)
+DERIVED_FIELDS = {"published_year", "published_month", "published_week"}
+
+# Colunas do dataset efetivamente usadas na indexação
+SOURCE_COLUMNS = [
+    field["name"]
+    for field in COLLECTION_SCHEMA["fields"]
+    if field["name"] not in DERIVED_FIELDS
+]
+
+# Colunas sempre lidas: id e as datas usadas por process_dataframe
+REQUIRED_COLUMNS = ["unique_id", "published_at", "extracted_at"]
+
+# Coluna auxiliar do scan com pushdown: posição da linha no dataset completo
+_ROW_POSITION = "__row_position"
+
+# Fuso do calendário das matérias (horário de Brasília), usado em
+# published_year e published_month; datas sem fuso são tratadas como UTC
+PUBLISHED_TZ = timezone(timedelta(hours=-3))
+
+
+def source_columns(fields: list[str] | None = None) -> list[str]:
+    """
+    Colunas do dataset necessárias para indexar um subconjunto de campos.
+
+    Args:
+        fields: Campos do schema a indexar (default: todos)
+
+    Returns:
+        Colunas a ler, na ordem de SOURCE_COLUMNS
+    """
+    if fields is None:
+        return SOURCE_COLUMNS
+    wanted = set(REQUIRED_COLUMNS) | set(fields)
+    return [c for c in SOURCE_COLUMNS if c in wanted]
+
+
+def _incremental_cutoff(days: int) -> datetime:
+    """
+    Calcula a data de corte do modo incremental.
+
+    Args:
+        days: Número de dias para olhar para trás
+
+    Returns:
+        datetime com timezone (Brasília UTC-3)
+    """
+    return datetime.now(timezone(timedelta(hours=-3))) - timedelta(days=days)
+
+
+def get_dataset_revision(dataset_path: str = DATASET_PATH) -> str | None:
+    """
+    Obtém a revisão (commit) atual do dataset no HuggingFace.
+
+    Args:
+        dataset_path: Caminho do dataset no HuggingFace
+
+    Returns:
+        SHA do commit, ou None para diretórios locais ou em caso de falha
+    """
+    if os.path.isdir(dataset_path):
+        return None
+    try:
+        return HfApi().dataset_info(dataset_path).sha
+    except Exception as e:
+        logger.warning(f"Não foi possível obter a revisão do dataset: {e}")
+        return None
+
+
+def _parquet_files(dataset_path: str) -> tuple[list[str], HfFileSystem | None]:
+    """
+    Localiza os arquivos Parquet do split 'train' do dataset.
+
+    Args:
+        dataset_path: Diretório local ou caminho do dataset no HuggingFace
+
+    Returns:
+        Tupla (arquivos, filesystem); filesystem é None para arquivos locais
+    """
+    if os.path.isdir(dataset_path):
+        fs = None
+        files = sorted(glob(os.path.join(dataset_path, "**", "*.parquet"), recursive=True))
+    else:
+        fs = HfFileSystem()
+        files = sorted(fs.glob(f"datasets/{dataset_path}/**/*.parquet"))
+
+    train_files = [f for f in files if "train" in os.path.basename(f)]
+    return (train_files or files), fs
+
+
+def _cutoff_expression(
+    field_type: pa.DataType, cutoff_date: datetime
+) -> pads.Expression | None:
+    """
+    Monta o predicado de data empurrado para o scan Parquet.
+
+    O predicado é conservador (pode deixar passar registros um pouco
+    anteriores ao corte); o filtro exato continua sendo aplicado em
+    process_dataframe.
+
+    Args:
+        field_type: Tipo Arrow da coluna published_at
+        cutoff_date: Data de corte com timezone
+
+    Returns:
+        Expressão de filtro, ou None se o tipo não suportar pushdown
+    """
+    field = pads.field("published_at")
+    if pa.types.is_timestamp(field_type):
+        if field_type.tz is None:
+            cutoff = cutoff_date.astimezone(timezone.utc).replace(tzinfo=None)
+        else:
+            cutoff = cutoff_date
+        return field >= pa.scalar(cutoff, type=field_type)
+    # Datas e strings ISO: compara pela data, com um dia de folga para offsets
+    day_before = (cutoff_date - timedelta(days=1)).date()
+    if pa.types.is_date(field_type):
+        return field >= pa.scalar(day_before, type=field_type)
+    if pa.types.is_string(field_type) or pa.types.is_large_string(field_type):
+        return field >= pa.scalar(day_before.isoformat(), type=field_type)
+    return None
+
+
+def _scan_recent(
+    dataset_path: str, cutoff_date: datetime, fields: list[str] | None = None
+) -> tuple[pads.Dataset, pads.Expression | None, list[str]]:
+    """
+    Prepara um scan Parquet com projeção de colunas e filtro de data.
+
+    Args:
+        dataset_path: Diretório local ou caminho do dataset no HuggingFace
+        cutoff_date: Data de corte do modo incremental
+        fields: Se informado, projeta só as colunas desses campos
+
+    Returns:
+        Tupla (dataset Arrow, filtro, colunas projetadas)
+
+    Raises:
+        FileNotFoundError: Se nenhum arquivo Parquet for encontrado
+    """
+    files, fs = _parquet_files(dataset_path)
+    if not files:
+        raise FileNotFoundError(f"Nenhum arquivo Parquet encontrado em {dataset_path}")
+
+    dataset = pads.dataset(files, format="parquet", filesystem=fs)
+    columns = [c for c in source_columns(fields) if c in dataset.schema.names]
+    expression = _cutoff_expression(
+        dataset.schema.field("published_at").type, cutoff_date
+    )
+    return dataset, expression, columns
+
+
+def _iter_recent_tables(
+    dataset: pads.Dataset, expression: pads.Expression | None, columns: list[str]
+) -> Iterator[pa.Table]:
+    """
+    Lê, row group a row group, os registros que passam pelo filtro de data.
+
+    Row groups cujas estatísticas excluem o intervalo nem são lidos. Cada
+    tabela traz a coluna _ROW_POSITION com a posição da linha no dataset
+    completo (arquivos na ordem de _parquet_files, a mesma do load_dataset),
+    para que os ids de fallback doc_<n> sejam os mesmos dos caminhos sem
+    pushdown.
+
+    Args:
+        dataset: Dataset Arrow (ver _scan_recent)
+        expression: Filtro de data, ou None para ler todos os registros
+        columns: Colunas projetadas
+
+    Yields:
+        Tabelas filtradas com as colunas projetadas e _ROW_POSITION
+    """
+    offset = 0
+    for fragment in dataset.get_fragments():
+        fragment.ensure_complete_metadata()
+        starts = {}
+        for row_group in fragment.row_groups:
+            starts[row_group.id] = offset
+            offset += row_group.num_rows
+
+        pieces = (
+            fragment.split_by_row_group()
+            if expression is None
+            else fragment.split_by_row_group(expression)
+        )
+        for piece in pieces:
+            row_group = piece.row_groups[0]
+            start = starts[row_group.id]
+            table = piece.to_table(columns=columns).append_column(
+                _ROW_POSITION, pa.array(range(start, start + row_group.num_rows), pa.int64())
+            )
+            if expression is not None:
+                table = table.filter(expression)
+            if table.num_rows:
+                yield table
+
+
+def _restore_positions(df: pd.DataFrame) -> pd.DataFrame:
+    """Usa a coluna _ROW_POSITION como índice do DataFrame."""
+    df.index = pd.Index(df.pop(_ROW_POSITION).to_numpy())
+    return df
+
+
+def process_dataframe(
+    df: pd.DataFrame,
+    cutoff_date: datetime | None = None,
+) -> pd.DataFrame:
+    """
+    Converte datas e calcula as colunas derivadas usadas na indexação.
+
+    Args:
+        df: DataFrame com registros brutos do dataset
+        cutoff_date: Se informado, descarta registros publicados antes desta data
+
+    Returns:
+        DataFrame processado com colunas adicionais para indexação
+    """
+    # Converte published_at e extracted_at para datetime
+    df["published_at"] = pd.to_datetime(df["published_at"], errors="coerce")
+    df["extracted_at"] = pd.to_datetime(df["extracted_at"], errors="coerce")
+
+    # Filtra para modo incremental
+    if cutoff_date is not None:
+        df = df[df["published_at"] >= cutoff_date].copy()
+        if len(df) == 0:
+            return df
+
+    # Extrai ano e mês para faceting, no fuso de PUBLISHED_TZ
+    local = df["published_at"]
+    if local.dt.tz is None:
+        local = local.dt.tz_localize("UTC")
+    local = local.dt.tz_convert(PUBLISHED_TZ)
+    df["published_year"] = local.dt.year
+    df["published_month"] = local.dt.month
+
+    # Converte datetime para Unix timestamp (segundos) para Typesense
+    df["published_at_ts"] = to_epoch_seconds(df["published_at"])
+    df["extracted_at_ts"] = to_epoch_seconds(df["extracted_at"])
+
+    # Calcula semana ISO 8601 (formato YYYYWW)
+    df["published_week"] = calculate_published_weeks(df["published_at_ts"])
+
+    return df
+
+
+def _read_recent(
+    dataset_path: str,
+    cutoff_date: datetime,
+    metrics: RunMetrics | None = None,
+    fields: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """
+    Lê apenas os registros recentes e as colunas do schema direto do Parquet.
+
+    O filtro de data e a projeção são empurrados para o scan, então só os
+    row groups e colunas necessários são transferidos. O índice do
+    DataFrame é a posição de cada linha no dataset completo, como no
+    caminho via load_dataset. Em caso de falha retorna None e o chamador
+    usa o caminho completo via load_dataset.
+
+    Args:
+        dataset_path: Diretório local ou caminho do dataset no HuggingFace
+        cutoff_date: Data de corte do modo incremental
+        metrics: Se informado, acumula o tempo de download e de conversão
+        fields: Se informado, lê só as colunas desses campos
+
+    Returns:
+        DataFrame com os registros (ainda não processados), ou None
+    """
+    try:
+        with timed(metrics, "download"):
+            dataset, expression, columns = _scan_recent(
+                dataset_path, cutoff_date, fields
+            )
+            if expression is None:
+                logger.info("Tipo de published_at não suporta pushdown; lendo só colunas")
+            tables = list(_iter_recent_tables(dataset, expression, columns))
+            if tables:
+                table = pa.concat_tables(tables)
+            else:
+                table = dataset.schema.empty_table().select(columns)
+                table = table.append_column(_ROW_POSITION, pa.array([], pa.int64()))
+        logger.info(
+            f"Scan Parquet com pushdown: {table.num_rows} registros, {len(columns)} colunas"
+        )
+        with timed(metrics, "to_pandas"):
+            return _restore_positions(table.to_pandas())
+    except Exception as e:
+        logger.warning(f"Pushdown indisponível ({e}), usando load_dataset")
+        return None
+
 
 def download_and_process_dataset(
     mode: str = "full",
     days: int = 7,
     dataset_path: str = DATASET_PATH,
     limit: int | None = None,
+    revision: str | None = None,
+    metrics: RunMetrics | None = None,
+    fields: list[str] | None = None,
 ) -> pd.DataFrame:
     """
     Baixa o dataset do HuggingFace e converte para pandas DataFrame.
@@ -29,6 +334,11 @@ def download_and_process_dataset(
         days: Número de dias para olhar para trás no modo incremental (default: 7)
         dataset_path: Caminho do dataset no HuggingFace
         limit: Limita número de registros (útil para testes rápidos)
+        revision: Revisão do dataset a carregar (default: a mais recente)
+        metrics: Se informado, acumula o tempo de download, conversão para
+            pandas e derivação de datas
+        fields: Se informado, lê do dataset só as colunas necessárias para
+            estes campos do schema (ver source_columns)
 
     Returns:
         DataFrame processado com colunas adicionais para indexação
@@ -37,34 +347,47 @@ def download_and_process_dataset(
         Exception: Se ocorrer erro no download ou processamento
     """
     try:
-        logger.info(f"Baixando dataset govbrnews do HuggingFace (modo: {mode})...")
-        dataset = load_dataset(dataset_path, split="train")
-        logger.info(f"Dataset baixado com sucesso. Total de registros: {len(dataset)}")
+        cutoff_date = None
+        if mode == "incremental":
+            cutoff_date = _incremental_cutoff(days)
+            logger.info(f"Modo incremental: Filtrando dados dos últimos {days} dias")
+            logger.info(f"Data de corte: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        df = None
+        if cutoff_date is not None and not limit:
+            df = _read_recent(dataset_path, cutoff_date, metrics, fields)
+
+        if df is None:
+            logger.info(f"Baixando dataset govbrnews do HuggingFace (modo: {mode})...")
+            with timed(metrics, "download"):
+                dataset = load_dataset(dataset_path, split="train", revision=revision)
+            logger.info(
+                f"Dataset baixado com sucesso. Total de registros: {len(dataset)}"
+            )
 
-        # Converte para pandas DataFrame
-        df = dataset.to_pandas()
+            # Converte para pandas DataFrame apenas as colunas do schema
+            dataset = dataset.select_columns(
+                [c for c in source_columns(fields) if c in dataset.column_names]
+            )
 
-        # Limita registros se especificado (útil para testes)
-        if limit is not None and limit > 0:
-            logger.info(f"Limitando a {limit} registros para teste...")
-            df = df.head(limit)
+            # Limita registros se especificado (útil para testes)
+            if limit is not None and limit > 0:
+                logger.info(f"Limitando a {limit} registros para teste...")
+                dataset = dataset.select(range(min(limit, len(dataset))))
 
-        # Converte published_at e extracted_at para datetime
-        df["published_at"] = pd.to_datetime(df["published_at"], errors="coerce")
-        df["extracted_at"] = pd.to_datetime(df["extracted_at"], errors="coerce")
+            with timed(metrics, "to_pandas"):
+                df = dataset.to_pandas()
+
+        initial_count = len(df)
+        if metrics is not None:
+            metrics.add("rows_read", initial_count)
+        logger.info("Calculando semanas ISO 8601 para otimização temporal...")
+        with timed(metrics, "derive"):
+            df = process_dataframe(df, cutoff_date=cutoff_date)
 
-        # Filtra para modo incremental
         if mode == "incremental":
-            # Usa datetime com timezone (Brasília UTC-3)
-            cutoff_date = datetime.now(timezone(timedelta(hours=-3))) - timedelta(
-                days=days
-            )
-            initial_count = len(df)
-            df = df[df["published_at"] >= cutoff_date]
-            logger.info(f"Modo incremental: Filtrando dados dos últimos {days} dias")
-            logger.info(f"Data de corte: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
             logger.info(
-                f"Registros após filtro: {len(df)} (removidos {initial_count - len(df)} registros antigos)"
+                f"Registros após filtro: {len(df)} (removidos {initial_count - len(df)} registros antigos do scan)"
             )
 
             if len(df) == 0:
@@ -73,22 +396,6 @@ def download_and_process_dataset(
                 )
                 return df
 
-        # Extrai ano e mês para faceting
-        df["published_year"] = df["published_at"].dt.year
-        df["published_month"] = df["published_at"].dt.month
-
-        # Converte datetime para Unix timestamp (segundos) para Typesense
-        df["published_at_ts"] = df["published_at"].apply(
-            lambda x: int(x.timestamp()) if pd.notna(x) else 0
-        )
-        df["extracted_at_ts"] = df["extracted_at"].apply(
-            lambda x: int(x.timestamp()) if pd.notna(x) else 0
-        )
-
-        # Calcula semana ISO 8601 (formato YYYYWW)
-        logger.info("Calculando semanas ISO 8601 para otimização temporal...")
-        df["published_week"] = df["published_at_ts"].apply(calculate_published_week)
-
         # Log de estatísticas
         valid_weeks = df["published_week"].notna().sum()
         logger.info(
@@ -101,3 +408,128 @@ def download_and_process_dataset(
     except Exception as e:
         logger.error(f"Erro ao baixar/processar dataset: {e}")
         raise
+
+
+def iter_dataset_chunks(
+    mode: str = "full",
+    days: int = 7,
+    dataset_path: str = DATASET_PATH,
+    limit: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    revision: str | None = None,
+    start_row: int = 0,
+    metrics: RunMetrics | None = None,
+    fields: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Percorre o dataset em record batches Arrow, gerando chunks processados.
+
+    Diferente de download_and_process_dataset, nunca materializa o dataset
+    inteiro em um DataFrame: o Arrow do HuggingFace é memory-mapped e só o
+    chunk corrente é convertido para pandas, de modo que o pico de memória
+    depende de chunk_size e não do tamanho do corpus.
+
+    Args:
+        mode: 'full' para dataset completo ou 'incremental' para dados recentes
+        days: Número de dias para olhar para trás no modo incremental (default: 7)
+        dataset_path: Caminho do dataset no HuggingFace
+        limit: Limita número de registros (útil para testes rápidos)
+        chunk_size: Número de registros por chunk (default: 5000)
+        revision: Revisão do dataset a carregar (default: a mais recente)
+        start_row: Posição da primeira linha a ler (retomada de checkpoint);
+            suportado apenas no modo full
+        metrics: Se informado, acumula o tempo de download, leitura dos
+            batches Arrow, conversão para pandas e derivação de datas
+        fields: Se informado, lê do dataset só as colunas necessárias para
+            estes campos do schema (ver source_columns)
+
+    Yields:
+        DataFrames processados (mesmas colunas de download_and_process_dataset),
+        com índice global preservado entre chunks
+
+    Raises:
+        Exception: Se ocorrer erro no download ou processamento
+    """
+    try:
+        cutoff_date = None
+        if mode == "incremental":
+            cutoff_date = _incremental_cutoff(days)
+            logger.info(f"Modo incremental: Filtrando dados dos últimos {days} dias")
+            logger.info(f"Data de corte: {cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        if start_row and mode != "full":
+            raise ValueError("start_row só é suportado no modo full")
+
+        batches = None
+        if cutoff_date is not None and not limit:
+            try:
+                dataset, expression, columns = _scan_recent(
+                    dataset_path, cutoff_date, fields
+                )
+                batches = (
+                    batch
+                    for table in _iter_recent_tables(dataset, expression, columns)
+                    for batch in table.to_batches(max_chunksize=chunk_size)
+                )
+                logger.info(f"Scan Parquet com pushdown ({len(columns)} colunas)")
+            except Exception as e:
+                logger.warning(f"Pushdown indisponível ({e}), usando load_dataset")
+
+        if batches is None:
+            logger.info(
+                f"Baixando dataset govbrnews do HuggingFace (modo: {mode}, streaming)..."
+            )
+            with timed(metrics, "download"):
+                dataset = load_dataset(dataset_path, split="train", revision=revision)
+            logger.info(
+                f"Dataset baixado com sucesso. Total de registros: {len(dataset)}"
+            )
+            dataset = dataset.select_columns(
+                [c for c in source_columns(fields) if c in dataset.column_names]
+            )
+
+            if limit is not None and limit > 0:
+                logger.info(f"Limitando a {limit} registros para teste...")
+                dataset = dataset.select(range(min(limit, len(dataset))))
+
+            if start_row:
+                logger.info(f"Pulando {start_row} registros já indexados...")
+                dataset = dataset.select(range(min(start_row, len(dataset)), len(dataset)))
+
+            batches = dataset.with_format("arrow").iter(batch_size=chunk_size)
+
+        offset = start_row
+        total_yielded = 0
+        batches = iter(batches)
+        while True:
+            with timed(metrics, "read"):
+                batch = next(batches, None)
+            if batch is None:
+                break
+            with timed(metrics, "to_pandas"):
+                chunk = batch.to_pandas()
+            # Mantém o índice global para que os ids de fallback sejam estáveis;
+            # no scan com pushdown ele vem da posição original da linha
+            if _ROW_POSITION in chunk.columns:
+                chunk = _restore_positions(chunk)
+            else:
+                chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            if metrics is not None:
+                metrics.add("rows_read", len(chunk))
+
+            with timed(metrics, "derive"):
+                chunk = process_dataframe(chunk, cutoff_date=cutoff_date)
+            if len(chunk) == 0:
+                continue
+
+            total_yielded += len(chunk)
+            yield chunk
+
+        logger.info(
+            f"Streaming concluído: {total_yielded}/{offset - start_row} registros processados"
+        )
+
+    except Exception as e:
+        logger.error(f"Erro ao baixar/processar dataset: {e}")
+        raise
@@ -3,18 +3,64 @@ Indexação de documentos no Typesense.
 """
 
 import logging
+import multiprocessing
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import requests
 import typesense
+from typesense.exceptions import HTTPStatus0Error, ServerError, ServiceUnavailable
 
-from typesense_dgb.collection import COLLECTION_NAME
+from typesense_dgb.batching import AdaptiveBatcher
+from typesense_dgb.checkpoint import Checkpoint
+from typesense_dgb.client import single_attempt_client
+from typesense_dgb.collection import COLLECTION_NAME, COLLECTION_SCHEMA
+from typesense_dgb.jsonl import dumps_document, import_jsonl
+from typesense_dgb.manifest import DocumentManifest, hash_document
+from typesense_dgb.metrics import RunMetrics, timed
 
 logger = logging.getLogger(__name__)
 
 # Limite máximo de caracteres para uma tag válida
 MAX_TAG_LENGTH = 100
 
+# Ações aceitas pelo endpoint de importação
+IMPORT_ACTIONS = ("create", "upsert", "update", "emplace")
+
+# Linhas por fatia enviada ao pool de preparação (index_documents com workers > 1)
+DEFAULT_SHARD_SIZE = 5000
+
+# Latências de importação mais recentes mantidas em stats["batch_latencies"]
+BATCH_LATENCY_WINDOW = 1000
+
+# Falhas transitórias de uma importação, repetidas quando o batcher controla as tentativas
+RETRYABLE_IMPORT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ReadTimeout,
+    HTTPStatus0Error,
+    ServerError,
+    ServiceUnavailable,
+)
+
+# Campos do schema cujo valor vem de uma coluna *_ts do DataFrame processado
+TIMESTAMP_SOURCE_COLUMNS = {
+    "published_at": "published_at_ts",
+    "extracted_at": "extracted_at_ts",
+}
+
 
 def clean_tags(tags_value) -> list[str]:
     """
@@ -55,6 +101,9 @@ def prepare_document(row: pd.Series) -> dict[str, Any]:
     """
     Prepara um documento para indexação no Typesense.
 
+    Implementação de referência linha a linha; a indexação usa
+    prepare_documents, que deve produzir exatamente o mesmo resultado.
+
     Args:
         row: Linha do DataFrame com dados do documento
 
@@ -126,36 +175,709 @@ def prepare_document(row: pd.Series) -> dict[str, Any]:
     return doc
 
 
+def build_field_plan(schema: dict[str, Any]) -> list[tuple[str, str, str]]:
+    """
+    Compila o plano de campos opcionais a partir de um schema Typesense.
+
+    'id', 'unique_id' e 'published_at' são tratados à parte por
+    prepare_documents, pois são sempre preenchidos.
+
+    Args:
+        schema: Schema da coleção (ex: COLLECTION_SCHEMA)
+
+    Returns:
+        Lista de tuplas (campo, coluna de origem, tipo), onde tipo é
+        'string', 'int' ou 'tags'
+    """
+    plan = []
+    for field in schema["fields"]:
+        name = field["name"]
+        if name in ("unique_id", "published_at"):
+            continue
+        source = TIMESTAMP_SOURCE_COLUMNS.get(name, name)
+        if field["type"] == "string":
+            plan.append((name, source, "string"))
+        elif field["type"] in ("int32", "int64"):
+            plan.append((name, source, "int"))
+        elif field["type"] == "string[]":
+            plan.append((name, source, "tags"))
+    return plan
+
+
+FIELD_PLAN = build_field_plan(COLLECTION_SCHEMA)
+
+
+def prepare_documents(
+    frame: pd.DataFrame | pa.Table,
+    plan: list[tuple[str, str, str]] | None = None,
+    fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Prepara todos os documentos de um chunk de uma vez, coluna a coluna.
+
+    Produz o mesmo resultado que aplicar prepare_document a cada linha,
+    mas com strip, filtragem de vazios e máscara de nulos vetorizados.
+
+    Args:
+        frame: DataFrame processado (ou tabela Arrow com as mesmas colunas)
+        plan: Plano de campos (default: FIELD_PLAN, derivado de COLLECTION_SCHEMA)
+        fields: Se informado, gera documentos parciais só com 'id' e estes
+            campos (para importação com action 'update' ou 'emplace')
+
+    Returns:
+        Lista de dicionários formatados para o Typesense, na ordem das linhas
+    """
+    if isinstance(frame, pa.Table):
+        frame = frame.to_pandas()
+    plan = FIELD_PLAN if plan is None else plan
+    if fields is not None:
+        plan = [entry for entry in plan if entry[0] in fields]
+
+    # Usa unique_id como id do documento para comportamento de upsert
+    unique_ids = frame["unique_id"]
+    has_id = unique_ids.notna().to_numpy()
+    ids = np.where(
+        has_id,
+        unique_ids.astype(str).to_numpy(),
+        np.array([f"doc_{label}" for label in frame.index], dtype=object),
+    ).tolist()
+
+    # published_at é obrigatório (campo de ordenação padrão)
+    published_at = [0] * len(frame)
+    if "published_at_ts" in frame.columns:
+        published_at = _positive_ints(frame["published_at_ts"], default=0)
+
+    docs: list[dict[str, Any]] = [
+        {"id": doc_id, "unique_id": doc_id, "published_at": ts}
+        for doc_id, ts in zip(ids, published_at)
+    ]
+
+    for name, source, kind in plan:
+        if source not in frame.columns:
+            continue
+        column = frame[source]
+
+        if kind == "string":
+            present = column.notna().to_numpy()
+            if not present.any():
+                continue
+            values = column[present].astype(str).str.strip()
+            keep = (values != "").to_numpy()
+            positions = np.flatnonzero(present)[keep]
+            for pos, val in zip(positions.tolist(), values[keep].tolist()):
+                docs[pos][name] = val
+
+        elif kind == "int":
+            for pos, val in enumerate(_positive_ints(column)):
+                if val is not None:
+                    docs[pos][name] = val
+
+        elif kind == "tags":
+            for pos, val in enumerate(column.tolist()):
+                if isinstance(val, (list, np.ndarray)):
+                    cleaned = clean_tags(val)
+                    if cleaned:
+                        docs[pos][name] = cleaned
+
+    if fields is not None:
+        keep = {"id", *fields}
+        docs = [{k: v for k, v in doc.items() if k in keep} for doc in docs]
+    return docs
+
+
+def _positive_ints(column: pd.Series, default: int | None = None) -> list[int | None]:
+    """
+    Converte uma coluna numérica em inteiros, mantendo apenas valores > 0.
+
+    Args:
+        column: Coluna numérica (pode conter nulos)
+        default: Valor usado para nulos e valores <= 0
+
+    Returns:
+        Lista de inteiros Python (ou default) na ordem da coluna
+    """
+    numeric = pd.to_numeric(column, errors="coerce").astype("float64").to_numpy()
+    valid = ~np.isnan(numeric) & (numeric > 0)
+    ints = np.where(valid, numeric, 0).astype("int64").tolist()
+    return [v if ok else default for v, ok in zip(ints, valid.tolist())]
+
+
+def prepare_rows(
+    frame: pd.DataFrame, stats: dict[str, Any]
+) -> tuple[list[dict[str, Any]], list[Any]]:
+    """
+    Prepara os documentos linha a linha com prepare_document.
+
+    Usado como fallback quando a preparação vetorizada falha, para isolar
+    as linhas problemáticas e contabilizá-las como erro.
+
+    Args:
+        frame: DataFrame processado
+        stats: Dicionário de estatísticas a atualizar
+
+    Returns:
+        Tupla (documentos preparados com sucesso, rótulos de índice deles)
+    """
+    docs = []
+    positions = []
+    for idx, row in frame.iterrows():
+        try:
+            docs.append(prepare_document(row))
+            positions.append(idx)
+        except Exception as e:
+            logger.warning(f"Erro ao preparar documento no índice {idx}: {e}")
+            stats["errors"] += 1
+    return docs, positions
+
+
+def iter_frames(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+) -> Iterator[pd.DataFrame]:
+    """
+    Normaliza a entrada do indexador para uma sequência de DataFrames.
+
+    Args:
+        df: DataFrame único ou iterável de chunks (ex: iter_dataset_chunks)
+
+    Yields:
+        DataFrames a indexar
+    """
+    if isinstance(df, pd.DataFrame):
+        yield df
+    else:
+        yield from df
+
+
+def _import_batch(
+    client: typesense.Client,
+    collection_name: str,
+    lines: list[bytes],
+    label: str = "batch",
+    action: str = "upsert",
+) -> tuple[int, int]:
+    """
+    Importa um batch de documentos já serializados.
+
+    Não altera estado compartilhado, podendo rodar em threads paralelas.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Nome da coleção
+        lines: Documentos serializados (uma linha JSONL cada)
+        label: Descrição do batch para os logs
+        action: Ação de importação (ver IMPORT_ACTIONS)
+
+    Returns:
+        Tupla (documentos indexados, erros)
+    """
+    _, errors = import_jsonl(client, collection_name, b"\n".join(lines), action)
+
+    # Verifica erros
+    if errors:
+        logger.warning(f"Encontrados {len(errors)} erros no {label}")
+        for error in errors[:5]:
+            logger.warning(f"Erro: {error}")
+        return 0, len(errors)
+    return len(lines), 0
+
+
+def _serialize_chunk(
+    frame: pd.DataFrame,
+    start_row: int = 0,
+    with_keys: bool = False,
+    fields: list[str] | None = None,
+) -> tuple[list[bytes], list[tuple[str, bytes]] | None, list[Any], int, float]:
+    """
+    Prepara e serializa os documentos de um chunk.
+
+    Não depende de estado compartilhado, podendo rodar em processos do pool
+    de preparação (ver index_documents com workers > 1).
+
+    Args:
+        frame: DataFrame processado
+        start_row: Descarta linhas com índice menor (retomada de checkpoint)
+        with_keys: Se True, calcula os pares (id, hash) para o manifesto
+        fields: Se informado, gera documentos parciais (ver prepare_documents)
+
+    Returns:
+        Tupla (linhas JSONL, pares (id, hash) ou None, posição de cada
+        documento no dataset, número de linhas que falharam na preparação,
+        segundos gastos)
+    """
+    started = time.perf_counter()
+    if start_row:
+        frame = frame[frame.index >= start_row]
+    row_stats = {"errors": 0}
+    try:
+        documents = prepare_documents(frame, fields=fields)
+        positions = frame.index.tolist()
+    except Exception as e:
+        logger.warning(f"Falha na preparação vetorizada ({e}), preparando linha a linha")
+        documents, positions = prepare_rows(frame, row_stats)
+        if fields is not None:
+            keep = {"id", *fields}
+            documents = [{k: v for k, v in doc.items() if k in keep} for doc in documents]
+
+    lines = [dumps_document(doc) for doc in documents]
+    keys = None
+    if with_keys:
+        keys = [(doc["id"], hash_document(line)) for doc, line in zip(documents, lines)]
+    elapsed = time.perf_counter() - started
+    return lines, keys, positions, row_stats["errors"], elapsed
+
+
+def _iter_shards(
+    df: pd.DataFrame | Iterable[pd.DataFrame], shard_size: int
+) -> Iterator[pd.DataFrame]:
+    """Divide os chunks de entrada em fatias disjuntas de até shard_size linhas."""
+    for frame in iter_frames(df):
+        for start in range(0, len(frame), shard_size):
+            yield frame.iloc[start : start + shard_size]
+
+
+def _iter_serialized(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    stats: dict[str, Any],
+    start_row: int = 0,
+    with_keys: bool = False,
+    workers: int = 1,
+    ordered: bool = True,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    metrics: RunMetrics | None = None,
+    fields: list[str] | None = None,
+) -> Iterator[tuple[list[bytes], list[tuple[str, bytes]] | None, list[Any]]]:
+    """
+    Prepara e serializa cada chunk, contabilizando-os em stats.
+
+    Com workers > 1, as fatias são processadas em um pool de processos,
+    com no máximo 2 * workers fatias pendentes de cada vez.
+
+    Args:
+        df: DataFrame único ou iterável de chunks
+        stats: Dicionário de estatísticas a atualizar
+        start_row: Descarta linhas com índice menor (retomada de checkpoint)
+        with_keys: Se True, calcula os pares (id, hash) para o manifesto
+        workers: Número de processos de preparação (default: 1, sem pool)
+        ordered: Se True, entrega as fatias na ordem do dataset; se False,
+            na ordem em que ficam prontas
+        shard_size: Linhas por fatia enviada ao pool
+        metrics: Se informado, acumula o tempo de preparação (somado entre
+            os processos)
+        fields: Se informado, gera documentos parciais (ver prepare_documents)
+
+    Yields:
+        Tuplas (linhas JSONL, pares (id, hash) ou None, posições no dataset)
+    """
+
+    def account(result, in_pool=True):
+        lines, keys, positions, errors, elapsed = result
+        stats["total_processed"] += len(lines)
+        stats["errors"] += errors
+        if metrics is not None and in_pool:
+            metrics.add_time("prepare", elapsed)
+        return lines, keys, positions
+
+    if workers <= 1:
+        for frame in iter_frames(df):
+            with timed(metrics, "prepare"):
+                result = _serialize_chunk(frame, start_row, with_keys, fields)
+            yield account(result, in_pool=False)
+        return
+
+    # spawn evita herdar, via fork, threads e locks do processo pai
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        pending: deque[Future] = deque()
+
+        def collect(limit: int):
+            while len(pending) > limit:
+                if ordered:
+                    yield account(pending.popleft().result())
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield account(future.result())
+
+        try:
+            for shard in _iter_shards(df, shard_size):
+                pending.append(
+                    pool.submit(_serialize_chunk, shard, start_row, with_keys, fields)
+                )
+                yield from collect(2 * workers - 1)
+            yield from collect(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _iter_batches(
+    chunks: Iterable[tuple[list[bytes], list[tuple[str, bytes]] | None, list[Any]]],
+    batch_size: int,
+    batcher: AdaptiveBatcher | None = None,
+    manifest: DocumentManifest | None = None,
+    stats: dict[str, Any] | None = None,
+) -> Iterator[tuple[list[bytes], list[tuple[str, bytes]] | None, Any]]:
+    """
+    Agrupa os documentos serializados em batches.
+
+    Args:
+        chunks: Tuplas (linhas JSONL, pares (id, hash) ou None, posições no
+            dataset), ver _iter_serialized
+        batch_size: Número fixo de documentos por batch (sem batcher)
+        batcher: Se informado, fecha os batches pelo orçamento de bytes dele
+        manifest: Se informado, descarta documentos cujo hash não mudou
+        stats: Estatísticas onde contabilizar os documentos inalterados
+
+    Yields:
+        Tuplas (linhas JSONL, pares (id, hash) ou None sem manifesto,
+        posição no dataset da última linha coberta pelo batch)
+    """
+    lines: list[bytes] = []
+    keys: list[tuple[str, bytes]] = []
+    num_bytes = 0
+    last_position = None
+    for serialized, chunk_keys, positions in chunks:
+        keep = [True] * len(serialized)
+        if manifest is not None:
+            keep = manifest.changed(chunk_keys)
+            if stats is not None:
+                stats["unchanged"] += keep.count(False)
+
+        for i, line in enumerate(serialized):
+            last_position = positions[i]
+            if not keep[i]:
+                continue
+            lines.append(line)
+            if manifest is not None:
+                keys.append(chunk_keys[i])
+            num_bytes += len(line) + 1
+            if batcher is not None:
+                full = batcher.is_full(num_bytes, len(lines))
+            else:
+                full = len(lines) >= batch_size
+            if full:
+                yield lines, (keys if manifest is not None else None), last_position
+                lines = []
+                keys = []
+                num_bytes = 0
+    if lines:
+        yield lines, (keys if manifest is not None else None), last_position
+
+
+def should_skip(
+    existing_count: int,
+    mode: str,
+    force: bool,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+) -> bool:
+    """
+    Decide se a indexação deve ser pulada para evitar duplicados.
+
+    Args:
+        existing_count: Número de documentos já presentes na coleção
+        mode: 'full' ou 'incremental'
+        force: Se True, permite modo full em coleções não vazias
+        df: Entrada do indexador (usada apenas para log)
+
+    Returns:
+        True se a indexação deve ser pulada
+    """
+    if existing_count == 0:
+        return False
+
+    logger.info(f"Coleção já contém {existing_count} documentos")
+    if mode == "full":
+        if force:
+            logger.warning(
+                "⚠️  Modo force ativado: Documentos existentes serão sobrescritos"
+            )
+            logger.warning(
+                f"⚠️  {existing_count} documentos existentes serão substituídos"
+            )
+            return False
+        logger.info(
+            "Modo full em coleção não vazia. Use modo 'incremental' para atualizar."
+        )
+        logger.info("Ou use --force para sobrescrever dados existentes.")
+        logger.info("Pulando indexação para evitar duplicados.")
+        return True
+
+    if isinstance(df, pd.DataFrame):
+        logger.info(f"Modo incremental: {len(df)} documentos serão atualizados")
+    return False
+
+
+class _ImportWindow:
+    """
+    Janela de importação com até `concurrency` batches em voo.
+
+    Com concurrency=1 importa de forma síncrona. Acima disso, os batches são
+    enviados por um pool de threads; submit bloqueia quando a janela está
+    cheia, limitando a memória ocupada por batches pendentes. As estatísticas
+    são atualizadas apenas na thread chamadora, à medida que os batches
+    terminam, mantendo a contagem exata.
+
+    Com um AdaptiveBatcher, a latência de cada importação realimenta o
+    orçamento de bytes, e um batch que estoura o timeout é dividido ao meio
+    e reenviado (o upsert é idempotente) em vez de repetido inteiro. Para
+    isso as importações usam um cliente de uma única tentativa: a divisão
+    acontece no primeiro timeout, e as demais falhas transitórias são
+    repetidas aqui, até o num_retries do cliente original.
+
+    Com um DocumentManifest, os hashes de um batch são gravados quando ele
+    é importado sem nenhuma falha; batches com falhas ficam fora do
+    manifesto e são reenviados na próxima carga.
+
+    Com um Checkpoint, cada batch confirmado é registrado com sua posição
+    no dataset.
+
+    Com um RunMetrics, cada importação concluída alimenta o histograma de
+    latência e os contadores de batches e bytes enviados.
+    """
+
+    def __init__(
+        self,
+        client: typesense.Client,
+        collection_name: str,
+        stats: dict[str, Any],
+        concurrency: int = 1,
+        batcher: AdaptiveBatcher | None = None,
+        manifest: DocumentManifest | None = None,
+        checkpoint: Checkpoint | None = None,
+        metrics: RunMetrics | None = None,
+        action: str = "upsert",
+    ) -> None:
+        self.client = client
+        self.retries = 0
+        self.retry_interval = 0.0
+        if batcher is not None and isinstance(client, typesense.Client):
+            self.retries = client.config.num_retries
+            self.retry_interval = client.config.retry_interval_seconds
+            self.client = single_attempt_client(client)
+        self.collection_name = collection_name
+        self.stats = stats
+        self.batcher = batcher
+        self.manifest = manifest
+        self.checkpoint = checkpoint
+        self.metrics = metrics
+        self.action = action
+        self.concurrency = max(1, concurrency)
+        self.executor = (
+            ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="typesense-import"
+            )
+            if self.concurrency > 1
+            else None
+        )
+        self.in_flight: dict[Future, tuple[int, Any]] = {}
+        self.sequence = 0
+
+    def _send(
+        self,
+        lines: list[bytes],
+        keys: list[tuple[str, bytes]] | None,
+        label: str,
+    ) -> list[tuple[Any, ...]]:
+        """
+        Importa um batch medindo a latência.
+
+        Returns:
+            Observações (indexados, erros, documentos, bytes, latência, chaves),
+            uma por importação efetivamente concluída
+        """
+        num_bytes = sum(len(line) + 1 for line in lines)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with timed(self.metrics, "import"):
+                    indexed, errors = _import_batch(
+                        self.client, self.collection_name, lines, label, self.action
+                    )
+                break
+            except RETRYABLE_IMPORT_ERRORS as e:
+                if self.batcher is not None and isinstance(e, requests.exceptions.ReadTimeout):
+                    self.batcher.record_timeout()
+                    if len(lines) > 1:
+                        half = len(lines) // 2
+                        logger.warning(
+                            f"Timeout no {label} ({len(lines)} documentos, {num_bytes} bytes), "
+                            f"reenviando em duas metades"
+                        )
+                        return self._send(
+                            lines[:half], keys[:half] if keys else keys, label
+                        ) + self._send(lines[half:], keys[half:] if keys else keys, label)
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                logger.warning(
+                    f"Falha no {label}: {e}; tentativa {attempt} de {self.retries} "
+                    f"em {self.retry_interval}s"
+                )
+                time.sleep(self.retry_interval)
+
+        latency = time.perf_counter() - started
+        if self.batcher is not None:
+            self.batcher.record(latency)
+        return [(indexed, errors, len(lines), num_bytes, latency, keys)]
+
+    def _record(
+        self, sequence: int, end_row: Any, observations: list[tuple[Any, ...]]
+    ) -> None:
+        result = {"batches": 1, "documents_sent": 0, "total_indexed": 0, "errors": 0}
+        for indexed, errors, num_docs, num_bytes, latency, keys in observations:
+            self.stats["total_indexed"] += indexed
+            self.stats["errors"] += errors
+            self.stats["batches"] += 1
+            self.stats["documents_sent"] += num_docs
+            self.stats["bytes_sent"] += num_bytes
+            self.stats["max_batch_bytes"] = max(self.stats["max_batch_bytes"], num_bytes)
+            self.stats["batch_latencies"].append(round(latency, 4))
+            if self.metrics is not None:
+                self.metrics.observe_batch(latency, num_docs, num_bytes)
+            if self.manifest is not None and keys and errors == 0:
+                self.manifest.update(keys)
+            result["documents_sent"] += num_docs
+            result["total_indexed"] += indexed
+            result["errors"] += errors
+        if self.checkpoint is not None:
+            self.checkpoint.acknowledge(sequence, end_row, result)
+
+    def _collect(self, return_when: str) -> None:
+        done, _ = wait(self.in_flight, return_when=return_when)
+        # Processa na ordem de envio para que o checkpoint avance cedo
+        for future in sorted(done, key=lambda f: self.in_flight[f][0]):
+            sequence, end_row = self.in_flight.pop(future)
+            self._record(sequence, end_row, future.result())
+
+    def submit(
+        self,
+        lines: list[bytes],
+        keys: list[tuple[str, bytes]] | None = None,
+        end_row: Any = None,
+        label: str = "batch",
+    ) -> None:
+        """Envia um batch, aguardando vaga na janela se necessário."""
+        sequence = self.sequence
+        self.sequence += 1
+        if self.executor is None:
+            self._record(sequence, end_row, self._send(lines, keys, label))
+            return
+
+        while len(self.in_flight) >= self.concurrency:
+            self._collect(FIRST_COMPLETED)
+        future = self.executor.submit(self._send, lines, keys, label)
+        self.in_flight[future] = (sequence, end_row)
+
+    def drain(self) -> None:
+        """Aguarda todos os batches em voo e contabiliza os resultados."""
+        if self.in_flight:
+            self._collect(ALL_COMPLETED)
+
+    def close(self) -> None:
+        """Encerra o pool de threads, cancelando batches ainda não iniciados."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def validate_fields(fields: list[str]) -> None:
+    """
+    Verifica se os campos podem ser enviados em documentos parciais.
+
+    Args:
+        fields: Campos a preencher
+
+    Raises:
+        ValueError: Se algum campo não for gerado por prepare_documents
+    """
+    unknown = set(fields) - {name for name, _, _ in FIELD_PLAN} - {"published_at"}
+    if unknown:
+        raise ValueError(f"Campos fora do schema: {', '.join(sorted(unknown))}")
+
+
 def index_documents(
     client: typesense.Client,
-    df: pd.DataFrame,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
     collection_name: str = COLLECTION_NAME,
     mode: str = "full",
     force: bool = False,
     batch_size: int = 1000,
+    concurrency: int = 1,
+    batcher: AdaptiveBatcher | None = None,
+    manifest: DocumentManifest | None = None,
+    checkpoint: Checkpoint | None = None,
+    workers: int = 1,
+    ordered: bool = True,
+    metrics: RunMetrics | None = None,
+    fields: list[str] | None = None,
+    action: str = "upsert",
 ) -> dict[str, Any]:
     """
     Indexa os documentos do DataFrame no Typesense.
 
     Args:
         client: Cliente Typesense
-        df: DataFrame com documentos a indexar
-        collection_name: Nome da coleção
+        df: DataFrame com documentos a indexar, ou iterável de DataFrames
+            (chunks gerados por iter_dataset_chunks no modo streaming)
+        collection_name: Nome da coleção física ou de um alias
         mode: 'full' ou 'incremental'
         force: Se True, permite modo full em coleções não vazias
         batch_size: Tamanho do batch para importação (default: 1000)
+        concurrency: Número máximo de batches em voo simultaneamente (default: 1)
+        batcher: Se informado, os batches são limitados por um orçamento de
+            bytes ajustado pela latência, em vez de batch_size documentos
+        manifest: Se informado, envia apenas documentos novos ou alterados
+            desde a última carga registrada no manifesto
+        checkpoint: Se informado, registra cada batch confirmado e, se já
+            houver linhas confirmadas, retoma a partir delas (o índice do
+            DataFrame deve ser a posição da linha no dataset)
+        workers: Número de processos que preparam e serializam fatias
+            disjuntas do dataset em paralelo (default: 1, no próprio processo)
+        ordered: Com workers > 1, envia os documentos na ordem do dataset
+            (default); se False, envia cada fatia assim que fica pronta
+            (incompatível com checkpoint)
+        metrics: Se informado, acumula o tempo de preparação, importação e
+            consulta final à coleção, além do histograma de latência
+        fields: Se informado, envia documentos parciais com 'id' e apenas
+            estes campos do schema (backfill de campos; exige action
+            'update' ou 'emplace' e dispensa a checagem de coleção vazia)
+        action: Ação de importação (default: 'upsert', ver IMPORT_ACTIONS)
 
     Returns:
-        Dicionário com estatísticas da indexação
+        Dicionário com estatísticas da indexação, incluindo totais de batches,
+        documentos e bytes enviados, o maior batch em bytes, as latências dos
+        últimos BATCH_LATENCY_WINDOW batches e o número de documentos
+        inalterados que deixaram de ser enviados
 
     Raises:
+        ValueError: Se checkpoint for combinado com ordered=False, ou se
+            fields/action forem inválidos
         Exception: Se ocorrer erro na indexação
     """
+    if checkpoint is not None and workers > 1 and not ordered:
+        raise ValueError("Checkpoint exige envio ordenado (ordered=True)")
+    if action not in IMPORT_ACTIONS:
+        raise ValueError(f"Ação de importação inválida: {action}")
+    if fields is not None:
+        validate_fields(fields)
+        if action not in ("update", "emplace"):
+            raise ValueError("Documentos parciais exigem action 'update' ou 'emplace'")
+        if manifest is not None:
+            raise ValueError("Manifesto não é suportado com documentos parciais")
+
     stats = {
         "total_processed": 0,
         "total_indexed": 0,
         "errors": 0,
         "skipped": False,
+        "unchanged": 0,
+        "batches": 0,
+        "documents_sent": 0,
+        "bytes_sent": 0,
+        "max_batch_bytes": 0,
+        "batch_latencies": deque(maxlen=BATCH_LATENCY_WINDOW),
     }
 
     try:
@@ -166,86 +888,100 @@ def index_documents(
         # Verifica documentos existentes na coleção
         collection_info = client.collections[collection_name].retrieve()
         existing_count = collection_info.get("num_documents", 0)
+        physical_name = collection_info.get("name", collection_name)
+        if physical_name != collection_name:
+            logger.info(f"'{collection_name}' é um alias; indexando em '{physical_name}'")
 
-        if existing_count > 0:
-            logger.info(f"Coleção já contém {existing_count} documentos")
-            if mode == "full":
-                if force:
-                    logger.warning(
-                        "⚠️  Modo force ativado: Documentos existentes serão sobrescritos"
-                    )
-                    logger.warning(
-                        f"⚠️  {existing_count} documentos existentes serão substituídos"
-                    )
-                else:
-                    logger.info(
-                        "Modo full em coleção não vazia. Use modo 'incremental' para atualizar."
-                    )
-                    logger.info(
-                        "Ou use --force para sobrescrever dados existentes."
-                    )
-                    logger.info("Pulando indexação para evitar duplicados.")
-                    stats["skipped"] = True
-                    return stats
-            else:
-                logger.info(f"Modo incremental: {len(df)} documentos serão atualizados")
+        start_row = checkpoint.rows_done if checkpoint is not None else 0
+        if start_row:
+            logger.info(
+                f"Retomando do checkpoint: {start_row} linhas já confirmadas, "
+                f"{existing_count} documentos na coleção"
+            )
+        elif fields is not None:
+            logger.info(
+                f"Atualização parcial ({action}) dos campos: {', '.join(fields)}"
+            )
+        elif should_skip(existing_count, mode, force, df):
+            stats["skipped"] = True
+            return stats
 
         # DataFrame vazio
-        if len(df) == 0:
+        if isinstance(df, pd.DataFrame) and len(df) == 0:
             logger.info("Nenhum documento para indexar. Saindo.")
             return stats
 
+        if manifest is not None:
+            manifest.bind(physical_name, collection_info.get("created_at"))
+            logger.info(
+                f"Indexação por delta: manifesto com {len(manifest)} documentos"
+            )
+
         # Prepara e indexa documentos em batches
-        documents: list[dict[str, Any]] = []
-        for idx, row in df.iterrows():
-            try:
-                doc = prepare_document(row)
-                documents.append(doc)
-                stats["total_processed"] += 1
-
-                # Indexa em batches
-                if len(documents) >= batch_size:
-                    logger.info(
-                        f"Indexando batch de {len(documents)} documentos... "
-                        f"(total processado: {stats['total_processed']})"
-                    )
-                    result = client.collections[collection_name].documents.import_(
-                        documents, {"action": "upsert"}
-                    )
+        if workers > 1:
+            logger.info(
+                f"Preparação em {workers} processos "
+                f"({'ordenada' if ordered else 'não ordenada'})"
+            )
+        if concurrency > 1:
+            logger.info(f"Importação concorrente: até {concurrency} batches em voo")
+        if batcher is not None:
+            logger.info(
+                f"Batches adaptativos: orçamento inicial de {batcher.budget} bytes "
+                f"(latência alvo: {batcher.target_latency}s)"
+            )
+        window = _ImportWindow(
+            client,
+            collection_name,
+            stats,
+            concurrency,
+            batcher,
+            manifest,
+            checkpoint,
+            metrics,
+            action,
+        )
+        try:
+            sent = 0
+            for lines, keys, end_row in _iter_batches(
+                _iter_serialized(
+                    df,
+                    stats,
+                    start_row,
+                    with_keys=manifest is not None,
+                    workers=workers,
+                    ordered=ordered,
+                    metrics=metrics,
+                    fields=fields,
+                ),
+                batch_size,
+                batcher,
+                manifest,
+                stats,
+            ):
+                sent += len(lines)
+                logger.info(
+                    f"Indexando batch de {len(lines)} documentos... "
+                    f"(total processado: {sent})"
+                )
+                window.submit(lines, keys, end_row)
+            window.drain()
+        finally:
+            window.close()
 
-                    # Verifica erros
-                    errors = [item for item in result if not item.get("success")]
-                    if errors:
-                        stats["errors"] += len(errors)
-                        logger.warning(f"Encontrados {len(errors)} erros no batch")
-                        for error in errors[:5]:
-                            logger.warning(f"Erro: {error}")
-                    else:
-                        stats["total_indexed"] += len(documents)
-
-                    documents = []
-
-            except Exception as e:
-                logger.warning(f"Erro ao preparar documento no índice {idx}: {e}")
-                stats["errors"] += 1
-                continue
+        if checkpoint is not None:
+            checkpoint.complete()
 
-        # Indexa documentos restantes
-        if documents:
-            logger.info(f"Indexando batch final de {len(documents)} documentos...")
-            result = client.collections[collection_name].documents.import_(
-                documents, {"action": "upsert"}
-            )
+        if manifest is not None:
+            logger.info(f"Documentos inalterados (não reenviados): {stats['unchanged']}")
 
-            errors = [item for item in result if not item.get("success")]
-            if errors:
-                stats["errors"] += len(errors)
-                logger.warning(f"Encontrados {len(errors)} erros no batch final")
-            else:
-                stats["total_indexed"] += len(documents)
+        if stats["total_processed"] == 0 and stats["errors"] == 0:
+            logger.info("Nenhum documento para indexar. Saindo.")
+            return stats
 
         # Estatísticas finais
-        collection_info = client.collections[collection_name].retrieve()
+        with timed(metrics, "retrieve"):
+            collection_info = client.collections[collection_name].retrieve()
         total_docs = collection_info.get("num_documents", 0)
 
         logger.info("Documentos indexados com sucesso no Typesense")
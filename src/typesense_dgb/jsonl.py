@@ -0,0 +1,196 @@
+"""
+Serialização JSONL, importação de documentos pré-serializados e leitura do
+export de uma coleção em streaming.
+
+Usa orjson quando disponível (pip install typesense-dgb[fast]) e cai para o
+json da stdlib com a mesma saída compacta em UTF-8, de modo que os bytes
+gerados são idênticos nos dois casos.
+"""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+from urllib.parse import quote
+
+import requests
+import typesense
+from typesense.api_call import ApiCall
+from typesense.exceptions import HTTPStatus0Error
+
+from typesense_dgb.client import get_session, split_timeout
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Linha retornada pelo Typesense para cada documento importado com sucesso
+_SUCCESS_LINE = '{"success":true}'
+
+
+def dumps_document(document: dict[str, Any]) -> bytes:
+    """
+    Serializa um documento em JSON compacto (UTF-8).
+
+    Args:
+        document: Documento preparado
+
+    Returns:
+        JSON em bytes, sem quebra de linha
+    """
+    if orjson is not None:
+        return orjson.dumps(document)
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def dumps_jsonl(documents: list[dict[str, Any]]) -> bytes:
+    """
+    Serializa documentos no formato JSONL aceito pelo endpoint de importação.
+
+    Args:
+        documents: Documentos preparados
+
+    Returns:
+        Corpo da requisição em bytes
+    """
+    return b"\n".join(dumps_document(doc) for doc in documents)
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Desserializa JSON com o mesmo encoder usado em dumps_document.
+
+    Args:
+        data: Texto JSON
+
+    Returns:
+        Objeto Python correspondente
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_import_response(body: str) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Interpreta a resposta JSONL do endpoint de importação.
+
+    As linhas de sucesso são apenas contadas; só as falhas são
+    desserializadas.
+
+    Args:
+        body: Corpo da resposta (uma linha JSON por documento)
+
+    Returns:
+        Tupla (número de sucessos, lista de falhas)
+    """
+    successes = 0
+    failures = []
+    for line in body.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line == _SUCCESS_LINE:
+            successes += 1
+            continue
+        result = loads(line)
+        if result.get("success"):
+            successes += 1
+        else:
+            failures.append(result)
+    return successes, failures
+
+
+def import_jsonl(
+    client: typesense.Client,
+    collection_name: str,
+    payload: bytes,
+    action: str = "upsert",
+) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Importa um payload JSONL já serializado.
+
+    O corpo é enviado como está, sem reserialização pelo cliente typesense,
+    que continua responsável pela escolha de nó, retries e failover.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Nome da coleção
+        payload: Documentos em JSONL (ver dumps_jsonl)
+        action: Ação de importação ('create', 'upsert', 'update' ou 'emplace')
+
+    Returns:
+        Tupla (número de sucessos, lista de falhas)
+    """
+    body = client.collections[collection_name].documents.import_(
+        payload, {"action": action}
+    )
+    return parse_import_response(body)
+
+
+def iter_export(
+    client: typesense.Client,
+    collection_name: str,
+    params: dict[str, Any] | None = None,
+) -> Iterator[bytes]:
+    """
+    Lê o export JSONL de uma coleção em streaming, uma linha por documento.
+
+    documents.export() do cliente typesense carrega a resposta inteira em
+    memória; aqui o corpo é consumido à medida que chega, pela sessão
+    compartilhada. Os nós do cliente são tentados em ordem até um aceitar a
+    requisição; uma falha no meio da leitura é propagada, já que o export
+    não pode ser retomado de onde parou.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Nome da coleção ou alias
+        params: Parâmetros do export (ex: filter_by, include_fields)
+
+    Yields:
+        Cada documento exportado, em JSON (bytes)
+
+    Raises:
+        typesense.exceptions.TypesenseClientError: Se o servidor recusar o
+            export ou nenhum nó responder
+    """
+    config = client.config
+    path = f"/collections/{quote(collection_name, safe='')}/documents/export"
+    headers = {ApiCall.API_KEY_HEADER_NAME: config.api_key}
+    timeout = split_timeout(config.connection_timeout_seconds)
+    session = get_session()
+
+    last_error: Exception | None = None
+    for node in config.nodes:
+        try:
+            response = session.get(
+                node.url() + path,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                stream=True,
+            )
+        except requests.RequestException as e:
+            last_error = e
+            continue
+        if response.status_code >= 500:
+            response.close()
+            last_error = ApiCall.get_exception(response.status_code)(
+                response.status_code, "API error."
+            )
+            continue
+        with response:
+            if response.status_code != 200:
+                raise ApiCall.get_exception(response.status_code)(
+                    response.status_code, response.text
+                )
+            for line in response.iter_lines():
+                if line:
+                    yield line
+        return
+
+    raise HTTPStatus0Error(
+        0, f"Export de '{collection_name}' falhou em todos os nós: {last_error}"
+    ) from last_error
@@ -0,0 +1,118 @@
+"""
+Manifesto local de hashes para indexação incremental por conteúdo.
+
+Guarda, para cada documento já importado, um hash do JSON enviado ao
+Typesense. Numa nova carga apenas documentos novos ou alterados são
+reenviados. O manifesto fica em um arquivo SQLite (stdlib) e é associado à
+coleção pelo timestamp de criação dela: se a coleção for recriada, o
+manifesto é descartado e tudo é reenviado.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Limite de parâmetros por consulta (SQLITE_MAX_VARIABLE_NUMBER conservador)
+_LOOKUP_CHUNK = 500
+
+
+def hash_document(line: bytes) -> bytes:
+    """
+    Calcula o hash estável de um documento serializado.
+
+    Args:
+        line: Documento serializado (ver jsonl.dumps_document)
+
+    Returns:
+        Digest BLAKE2b de 16 bytes
+    """
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+
+class DocumentManifest:
+    """
+    Mapa id → hash persistido em SQLite.
+
+    Args:
+        path: Caminho do arquivo SQLite (criado se não existir)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents "
+            "(id TEXT PRIMARY KEY, hash BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.conn.commit()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def bind(self, collection_name: str, created_at: int | str | None) -> None:
+        """
+        Associa o manifesto a uma coleção, descartando-o se ela mudou.
+
+        Args:
+            collection_name: Nome da coleção
+            created_at: Campo created_at retornado pelo Typesense
+        """
+        identity = f"{collection_name}:{created_at}"
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'collection'"
+        ).fetchone()
+        if row is not None and row[0] != identity:
+            logger.warning(
+                f"Manifesto pertence a outra coleção ({row[0]}), descartando {len(self)} entradas"
+            )
+            self.conn.execute("DELETE FROM documents")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('collection', ?)",
+            (identity,),
+        )
+        self.conn.commit()
+
+    def changed(self, keys: list[tuple[str, bytes]]) -> list[bool]:
+        """
+        Indica quais documentos são novos ou mudaram desde a última carga.
+
+        Args:
+            keys: Pares (id, hash) na ordem dos documentos
+
+        Returns:
+            Lista de booleanos alinhada com keys
+        """
+        known: dict[str, bytes] = {}
+        ids = [doc_id for doc_id, _ in keys]
+        for start in range(0, len(ids), _LOOKUP_CHUNK):
+            chunk = ids[start : start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(
+                self.conn.execute(
+                    f"SELECT id, hash FROM documents WHERE id IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return [known.get(doc_id) != digest for doc_id, digest in keys]
+
+    def update(self, keys: Iterable[tuple[str, bytes]]) -> None:
+        """
+        Registra documentos confirmados pelo Typesense.
+
+        Args:
+            keys: Pares (id, hash) importados com sucesso
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO documents (id, hash) VALUES (?, ?)", keys
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo."""
+        self.conn.close()
@@ -0,0 +1,310 @@
+"""
+Instrumentação das cargas: tempo por estágio, contadores e relatório final.
+
+Um RunMetrics é passado (opcionalmente) às funções de dataset e indexação,
+que acumulam nele o tempo gasto em cada estágio (download, conversão para
+pandas, derivação de datas, preparação, importação HTTP...). Ao final da
+carga o relatório pode ser gravado em JSON e no formato textfile do
+Prometheus (node_exporter), para comparar execuções diárias.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - indisponível no Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (segundos) do histograma de latência por batch
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Prefixo das métricas no textfile do Prometheus
+PROMETHEUS_PREFIX = "typesense_dgb_load"
+
+# Pilha de estágios ativos por thread (consultada pelo profiler de amostragem)
+_active_stages: dict[int, list[str]] = {}
+
+# Campos de stats (index_documents) copiados para os contadores do relatório
+STATS_COUNTERS = {
+    "total_processed": "documents_processed",
+    "total_indexed": "documents_indexed",
+    "errors": "errors",
+    "unchanged": "documents_unchanged",
+}
+
+
+def active_stage(thread_id: int) -> str | None:
+    """
+    Retorna o estágio mais interno em execução em uma thread.
+
+    Args:
+        thread_id: Identificador da thread (threading.get_ident)
+
+    Returns:
+        Nome do estágio, ou None fora de qualquer RunMetrics.stage
+    """
+    stack = _active_stages.get(thread_id)
+    return stack[-1] if stack else None
+
+
+def peak_rss_bytes() -> int | None:
+    """
+    Retorna o pico de memória residente do processo.
+
+    Returns:
+        Pico de RSS em bytes, ou None se a plataforma não informar
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KiB, macOS em bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunMetrics:
+    """
+    Tempos por estágio, contadores e histograma de latência de uma carga.
+
+    Pode ser atualizado de várias threads (importação concorrente). O tempo
+    de um estágio é a soma das durações medidas, então estágios executados
+    em paralelo podem somar mais que a duração total da carga.
+
+    Args:
+        labels: Rótulos descritivos da execução (modo, coleção...)
+    """
+
+    def __init__(self, labels: dict[str, Any] | None = None) -> None:
+        self.labels = dict(labels or {})
+        self.started_at = datetime.now(timezone.utc)
+        self.status = "running"
+        self.stages: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self._started = time.perf_counter()
+        self._finished: float | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Mede a duração de um bloco e a soma ao estágio indicado.
+
+        Args:
+            name: Nome do estágio (ex: 'download', 'import')
+        """
+        stack = _active_stages.setdefault(threading.get_ident(), [])
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+            stack.pop()
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Soma uma duração já medida ao estágio indicado."""
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add(self, name: str, value: int = 1) -> None:
+        """Incrementa um contador."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_batch(self, latency: float, num_documents: int, num_bytes: int) -> None:
+        """
+        Registra uma importação concluída.
+
+        Args:
+            latency: Duração da importação em segundos
+            num_documents: Documentos enviados
+            num_bytes: Bytes do payload JSONL
+        """
+        bucket = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if latency <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self._lock:
+            self.latency_buckets[bucket] += 1
+            self.latency_sum += latency
+            self.latency_count += 1
+            self.counters["batches"] = self.counters.get("batches", 0) + 1
+            self.counters["documents_sent"] = (
+                self.counters.get("documents_sent", 0) + num_documents
+            )
+            self.counters["bytes_sent"] = self.counters.get("bytes_sent", 0) + num_bytes
+
+    def record_stats(self, stats: dict[str, Any]) -> None:
+        """
+        Copia os totais retornados por index_documents para os contadores.
+
+        Args:
+            stats: Estatísticas da indexação
+        """
+        with self._lock:
+            for key, counter in STATS_COUNTERS.items():
+                if key in stats:
+                    self.counters[counter] = int(stats[key])
+
+    def finish(self, status: str = "success") -> None:
+        """Encerra a medição da duração total."""
+        self.status = status
+        self._finished = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        """Duração da carga em segundos (até agora, se não encerrada)."""
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def report(self) -> dict[str, Any]:
+        """
+        Monta o relatório da execução.
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        duration = self.duration
+        with self._lock:
+            counters = dict(self.counters)
+            stages = {name: round(seconds, 4) for name, seconds in self.stages.items()}
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(
+                [*LATENCY_BUCKETS, "+Inf"], self.latency_buckets
+            ):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+
+        return {
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(duration, 4),
+            "labels": self.labels,
+            "stages_seconds": stages,
+            "counters": counters,
+            "documents_per_second": round(
+                counters.get("documents_indexed", 0) / duration, 2
+            )
+            if duration > 0
+            else 0.0,
+            "batch_latency": {
+                "count": self.latency_count,
+                "sum_seconds": round(self.latency_sum, 4),
+                "buckets": histogram,
+            },
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+
+    def log_summary(self) -> None:
+        """Loga o tempo por estágio e a vazão da carga."""
+        report = self.report()
+        logger.info(
+            f"Duração: {report['duration_seconds']:.1f}s | "
+            f"{report['documents_per_second']:.0f} documentos/s | "
+            f"{report['counters'].get('bytes_sent', 0) / 1024 / 1024:.1f} MiB enviados"
+        )
+        for name, seconds in sorted(
+            report["stages_seconds"].items(), key=lambda item: -item[1]
+        ):
+            logger.info(f"  {name}: {seconds:.2f}s")
+
+    def write_json(self, path: str) -> None:
+        """
+        Grava o relatório em JSON.
+
+        Args:
+            path: Caminho do arquivo
+        """
+        _write_atomic(path, json.dumps(self.report(), indent=2) + "\n")
+        logger.info(f"Relatório da carga gravado em {path}")
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Grava as métricas no formato textfile do Prometheus.
+
+        A escrita é atômica (arquivo temporário + rename), como exige o
+        textfile collector do node_exporter.
+
+        Args:
+            path: Caminho do arquivo (.prom)
+        """
+        report = self.report()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_success Se a última carga terminou com sucesso.",
+            f"# TYPE {p}_success gauge",
+            f"{p}_success {int(report['status'] == 'success')}",
+            f"# HELP {p}_last_run_timestamp_seconds Início da última carga.",
+            f"# TYPE {p}_last_run_timestamp_seconds gauge",
+            f"{p}_last_run_timestamp_seconds {self.started_at.timestamp():.0f}",
+            f"# HELP {p}_duration_seconds Duração da última carga.",
+            f"# TYPE {p}_duration_seconds gauge",
+            f"{p}_duration_seconds {report['duration_seconds']}",
+            f"# HELP {p}_stage_seconds Tempo acumulado por estágio.",
+            f"# TYPE {p}_stage_seconds gauge",
+        ]
+        for name, seconds in report["stages_seconds"].items():
+            lines.append(f'{p}_stage_seconds{{stage="{name}"}} {seconds}')
+        lines += [
+            f"# HELP {p}_count Contadores da última carga.",
+            f"# TYPE {p}_count gauge",
+        ]
+        for name, value in report["counters"].items():
+            lines.append(f'{p}_count{{counter="{name}"}} {value}')
+        lines += [
+            f"# HELP {p}_documents_per_second Vazão de documentos indexados.",
+            f"# TYPE {p}_documents_per_second gauge",
+            f"{p}_documents_per_second {report['documents_per_second']}",
+            f"# HELP {p}_batch_latency_seconds Latência das importações.",
+            f"# TYPE {p}_batch_latency_seconds histogram",
+        ]
+        for bound, count in report["batch_latency"]["buckets"].items():
+            lines.append(f'{p}_batch_latency_seconds_bucket{{le="{bound}"}} {count}')
+        lines += [
+            f"{p}_batch_latency_seconds_sum {report['batch_latency']['sum_seconds']}",
+            f"{p}_batch_latency_seconds_count {report['batch_latency']['count']}",
+        ]
+        if report["peak_rss_bytes"] is not None:
+            lines += [
+                f"# HELP {p}_peak_rss_bytes Pico de memória residente.",
+                f"# TYPE {p}_peak_rss_bytes gauge",
+                f"{p}_peak_rss_bytes {report['peak_rss_bytes']}",
+            ]
+        _write_atomic(path, "\n".join(lines) + "\n")
+        logger.info(f"Métricas Prometheus gravadas em {path}")
+
+
+def timed(metrics: RunMetrics | None, name: str) -> AbstractContextManager:
+    """
+    Mede um estágio se houver métricas; caso contrário não faz nada.
+
+    Args:
+        metrics: Métricas da carga, ou None
+        name: Nome do estágio
+
+    Returns:
+        Context manager a usar em um bloco with
+    """
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Grava um arquivo de texto via arquivo temporário + rename."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
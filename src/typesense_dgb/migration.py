@@ -0,0 +1,219 @@
+"""
+Migração de schema no lugar, sem recriar a coleção.
+
+Compara COLLECTION_SCHEMA com o schema da coleção no servidor e aplica as
+diferenças pela API de alteração de schema do Typesense (PATCH
+/collections/<nome>): campos novos são adicionados, campos removidos do
+schema são descartados e campos com definição alterada são descartados e
+recriados na mesma chamada. Em seguida apenas os campos afetados são
+preenchidos, com importações parciais (action 'update'), sem reenviar o
+conteúdo das matérias. Campos que só mudam de papel (facet, index, sort...)
+mantêm o tipo e são reindexados a partir dos valores armazenados, então não
+entram no preenchimento.
+"""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+import typesense
+
+from typesense_dgb.collection import COLLECTION_NAME, COLLECTION_SCHEMA
+from typesense_dgb.indexer import index_documents
+
+logger = logging.getLogger(__name__)
+
+# Atributos de campo comparados entre o schema local e o do servidor
+FIELD_ATTRIBUTES = ("type", "facet", "optional", "index", "sort", "infix", "locale")
+
+# Tipos numéricos, ordenáveis por padrão no Typesense
+_NUMERIC_TYPES = {"int32", "int64", "float", "bool", "int32[]", "int64[]", "float[]"}
+
+
+def _attribute(field: dict[str, Any], name: str) -> Any:
+    """Valor de um atributo do campo, aplicando o default do Typesense."""
+    if name in field:
+        return field[name]
+    defaults = {
+        "facet": False,
+        "optional": False,
+        "index": True,
+        "sort": field.get("type") in _NUMERIC_TYPES,
+        "infix": False,
+        "locale": "",
+    }
+    return defaults.get(name)
+
+
+def diff_schema(live: dict[str, Any], target: dict[str, Any]) -> dict[str, Any]:
+    """
+    Compara o schema de uma coleção existente com o schema desejado.
+
+    Args:
+        live: Schema retornado por collections[nome].retrieve()
+        target: Schema desejado (ex: COLLECTION_SCHEMA)
+
+    Returns:
+        Dicionário com 'added' (definições de campos novos), 'dropped'
+        (nomes de campos a remover), 'changed' (definições novas de campos
+        alterados), 'retyped' (nomes dos campos alterados que mudaram de
+        tipo) e 'unsupported' (diferenças que exigem reindexação)
+    """
+    live_fields = {f["name"]: f for f in live["fields"] if f["name"] != ".*"}
+    target_fields = {f["name"]: f for f in target["fields"]}
+
+    added = [f for name, f in target_fields.items() if name not in live_fields]
+    dropped = [name for name in live_fields if name not in target_fields]
+    changed = [
+        f
+        for name, f in target_fields.items()
+        if name in live_fields
+        and any(
+            _attribute(f, attr) != _attribute(live_fields[name], attr)
+            for attr in FIELD_ATTRIBUTES
+        )
+    ]
+    retyped = [
+        f["name"]
+        for f in changed
+        if _attribute(f, "type") != _attribute(live_fields[f["name"]], "type")
+    ]
+
+    unsupported = []
+    live_sorting = live.get("default_sorting_field") or ""
+    target_sorting = target.get("default_sorting_field") or ""
+    if live_sorting != target_sorting:
+        unsupported.append(
+            f"default_sorting_field '{live_sorting}' → '{target_sorting}'"
+        )
+    if target_sorting in dropped or any(f["name"] == target_sorting for f in changed):
+        unsupported.append(f"campo de ordenação padrão '{target_sorting}' alterado")
+
+    return {
+        "added": added,
+        "dropped": dropped,
+        "changed": changed,
+        "retyped": retyped,
+        "unsupported": unsupported,
+    }
+
+
+def schema_changes(diff: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Converte um diff no corpo 'fields' da API de alteração de schema.
+
+    Args:
+        diff: Resultado de diff_schema
+
+    Returns:
+        Lista de operações de campo (drop e/ou definição)
+    """
+    changes: list[dict[str, Any]] = [
+        {"name": name, "drop": True} for name in diff["dropped"]
+    ]
+    for field in diff["changed"]:
+        changes += [{"name": field["name"], "drop": True}, field]
+    changes += diff["added"]
+    return changes
+
+
+def backfill_fields(diff: dict[str, Any]) -> list[str]:
+    """
+    Campos que precisam ser preenchidos após a migração.
+
+    Campos recriados com o mesmo tipo (mudança só de papel: facet, index,
+    sort...) não entram: o Typesense guarda o documento inteiro e os
+    reindexa a partir dos valores armazenados.
+
+    Args:
+        diff: Resultado de diff_schema
+
+    Returns:
+        Nomes dos campos adicionados ou recriados com outro tipo
+    """
+    return [f["name"] for f in diff["added"]] + diff["retyped"]
+
+
+def migrate_schema(
+    client: typesense.Client,
+    collection_name: str = COLLECTION_NAME,
+    schema: dict[str, Any] | None = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """
+    Aplica na coleção as diferenças em relação ao schema desejado.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Nome da coleção ou alias
+        schema: Schema desejado (default: COLLECTION_SCHEMA)
+        dry_run: Se True, apenas calcula e loga as diferenças
+
+    Returns:
+        Diff aplicado (ver diff_schema)
+
+    Raises:
+        ValueError: Se houver diferenças que a API de alteração não suporta
+    """
+    live = client.collections[collection_name].retrieve()
+    diff = diff_schema(live, schema or COLLECTION_SCHEMA)
+
+    if diff["unsupported"]:
+        raise ValueError(
+            "Mudanças exigem reindexação completa (scripts/reindex.py): "
+            + "; ".join(diff["unsupported"])
+        )
+
+    changes = schema_changes(diff)
+    if not changes:
+        logger.info(f"Schema de '{collection_name}' já está atualizado")
+        return diff
+
+    logger.info(
+        f"Diferenças no schema de '{collection_name}': "
+        f"{len(diff['added'])} adicionados, {len(diff['dropped'])} removidos, "
+        f"{len(diff['changed'])} alterados"
+    )
+    for change in changes:
+        logger.info(f"  {change}")
+
+    if dry_run:
+        return diff
+
+    client.collections[collection_name].update({"fields": changes})
+    logger.info("Schema atualizado")
+    return diff
+
+
+def backfill(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    fields: list[str],
+    collection_name: str = COLLECTION_NAME,
+    **index_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Preenche campos nos documentos existentes com importações parciais.
+
+    Args:
+        client: Cliente Typesense
+        df: DataFrame processado, ou iterável de chunks
+        fields: Campos a preencher (ver backfill_fields)
+        collection_name: Nome da coleção ou alias
+        **index_kwargs: Argumentos repassados a index_documents
+            (batch_size, concurrency, workers, metrics...)
+
+    Returns:
+        Estatísticas de index_documents
+    """
+    logger.info(f"Backfill dos campos: {', '.join(fields)}")
+    return index_documents(
+        client,
+        df,
+        collection_name=collection_name,
+        mode="full",
+        fields=fields,
+        action="update",
+        **index_kwargs,
+    )
@@ -0,0 +1,345 @@
+"""
+Layout particionado por ano de publicação.
+
+No layout opcional particionado, cada documento vai para a coleção do seu
+`published_year` (`news_2023`, `news_2024`, ...), todas com o mesmo schema.
+Buscas com filtro de data consultam, via multi_search, apenas as partições
+que intersectam o intervalo pedido, e os resultados são intercalados por
+`published_at`. Recarregar um ano reconstrói só a sua partição e a retenção
+passa a ser a remoção de coleções inteiras.
+"""
+
+import logging
+import re
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.collection import (
+    COLLECTION_NAME,
+    COLLECTION_SCHEMA,
+    create_collection,
+)
+from typesense_dgb.dataset import PUBLISHED_TZ
+from typesense_dgb.indexer import BATCH_LATENCY_WINDOW, index_documents
+
+logger = logging.getLogger(__name__)
+
+# Fuso dos limites das partições: o mesmo usado no cálculo de published_year
+PARTITION_TZ = PUBLISHED_TZ
+
+# Máximo de resultados por página aceito pelo Typesense
+MAX_PER_PAGE = 250
+
+_STAT_COUNTERS = (
+    "total_processed",
+    "total_indexed",
+    "errors",
+    "unchanged",
+    "batches",
+    "documents_sent",
+    "bytes_sent",
+)
+
+
+def partition_name(year: int, base: str = COLLECTION_NAME) -> str:
+    """
+    Nome da partição de um ano.
+
+    Args:
+        year: Ano de publicação
+        base: Nome base da coleção (default: 'news')
+
+    Returns:
+        Nome no formato '<base>_<AAAA>'
+    """
+    return f"{base}_{year:04d}"
+
+
+def list_partitions(client: typesense.Client, base: str = COLLECTION_NAME) -> dict[int, str]:
+    """
+    Lista as partições existentes.
+
+    Args:
+        client: Cliente Typesense
+        base: Nome base da coleção
+
+    Returns:
+        Dicionário ano → nome da coleção, em ordem crescente de ano
+    """
+    pattern = re.compile(rf"^{re.escape(base)}_(\d{{4}})$")
+    years = {}
+    for collection in client.collections.retrieve():
+        match = pattern.match(collection["name"])
+        if match:
+            years[int(match.group(1))] = collection["name"]
+    return dict(sorted(years.items()))
+
+
+def year_bounds(year: int) -> tuple[int, int]:
+    """
+    Intervalo de published_at coberto por uma partição.
+
+    Args:
+        year: Ano da partição
+
+    Returns:
+        Tupla (início inclusivo, fim exclusivo) em segundos Unix
+    """
+    start = datetime(year, 1, 1, tzinfo=PARTITION_TZ)
+    end = datetime(year + 1, 1, 1, tzinfo=PARTITION_TZ)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def partitions_for_range(
+    partitions: dict[int, str], start: int | None = None, end: int | None = None
+) -> list[str]:
+    """
+    Seleciona as partições que intersectam um intervalo de published_at.
+
+    Args:
+        partitions: Resultado de list_partitions
+        start: Início inclusivo em segundos Unix (default: sem limite)
+        end: Fim exclusivo em segundos Unix (default: sem limite)
+
+    Returns:
+        Nomes das partições, da mais recente para a mais antiga
+    """
+    selected = []
+    for year, name in sorted(partitions.items(), reverse=True):
+        lower, upper = year_bounds(year)
+        if (start is None or start < upper) and (end is None or end > lower):
+            selected.append(name)
+    return selected
+
+
+def _split_by_year(
+    frame: pd.DataFrame, years: set[int] | None
+) -> tuple[dict[int, pd.DataFrame], int]:
+    """Agrupa um chunk por published_year, descartando linhas sem ano."""
+    year = frame["published_year"]
+    dated = year.notna()
+    groups = {
+        int(y): group
+        for y, group in frame[dated].groupby(year[dated].astype(int), sort=True)
+        if years is None or int(y) in years
+    }
+    return groups, int((~dated).sum())
+
+
+def index_partitioned(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    base: str = COLLECTION_NAME,
+    schema: dict[str, Any] | None = None,
+    mode: str = "full",
+    force: bool = False,
+    years: list[int] | None = None,
+    rebuild: bool = False,
+    **index_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Indexa os documentos nas partições do seu ano de publicação.
+
+    A checagem de coleção não vazia do modo full vale por partição, na
+    primeira vez que ela recebe documentos; partições puladas continuam
+    puladas nos chunks seguintes.
+
+    Args:
+        client: Cliente Typesense
+        df: DataFrame processado, ou iterável de chunks
+        base: Nome base das partições (default: 'news')
+        schema: Schema das partições (default: COLLECTION_SCHEMA)
+        mode: 'full' ou 'incremental'
+        force: Se True, permite modo full em partições não vazias
+        years: Se informado, indexa apenas estes anos
+        rebuild: Se True, remove e recria as partições de `years` antes de indexar
+        **index_kwargs: Argumentos repassados a index_documents
+            (batch_size, concurrency, workers, metrics, fields, action...)
+
+    Returns:
+        Estatísticas somadas de index_documents, com 'partitions' (documentos
+        processados por ano) e 'undated' (linhas sem published_year)
+
+    Raises:
+        ValueError: Se rebuild for pedido sem years, ou com checkpoint/manifesto
+    """
+    if rebuild and not years:
+        raise ValueError("rebuild exige a lista de anos a reconstruir")
+    if index_kwargs.get("checkpoint") is not None or index_kwargs.get("manifest") is not None:
+        raise ValueError("Checkpoint e manifesto não são suportados no layout particionado")
+
+    wanted = set(years) if years else None
+    if rebuild:
+        for year in sorted(wanted):
+            name = partition_name(year, base)
+            try:
+                client.collections[name].delete()
+                logger.info(f"Partição '{name}' removida para reconstrução")
+            except ObjectNotFound:
+                pass
+
+    stats: dict[str, Any] = {key: 0 for key in _STAT_COUNTERS}
+    stats.update(max_batch_bytes=0, batch_latencies=deque(maxlen=BATCH_LATENCY_WINDOW))
+    stats.update(skipped=False, partitions={}, undated=0)
+    seen: dict[int, bool] = {}
+
+    chunks = [df] if isinstance(df, pd.DataFrame) else df
+    for chunk in chunks:
+        groups, undated = _split_by_year(chunk, wanted)
+        stats["undated"] += undated
+        for year, group in groups.items():
+            if seen.get(year) is False:
+                continue
+            name = partition_name(year, base)
+            first = year not in seen
+            if first:
+                create_collection(client, name, schema or COLLECTION_SCHEMA)
+            result = index_documents(
+                client,
+                group,
+                collection_name=name,
+                mode=mode,
+                force=force or not first,
+                **index_kwargs,
+            )
+            seen[year] = not result["skipped"]
+            for key in _STAT_COUNTERS:
+                stats[key] += result[key]
+            stats["max_batch_bytes"] = max(stats["max_batch_bytes"], result["max_batch_bytes"])
+            stats["batch_latencies"].extend(result["batch_latencies"])
+            stats["partitions"][year] = stats["partitions"].get(year, 0) + result[
+                "total_processed"
+            ]
+
+    if stats["undated"]:
+        logger.warning(f"{stats['undated']} registros sem published_year não foram indexados")
+    stats["skipped"] = bool(seen) and not any(seen.values())
+    for year, count in sorted(stats["partitions"].items()):
+        logger.info(f"Partição '{partition_name(year, base)}': {count} documentos")
+    return stats
+
+
+def drop_partitions_before(
+    client: typesense.Client, year: int, base: str = COLLECTION_NAME
+) -> list[str]:
+    """
+    Remove as partições anteriores a um ano (retenção por coleção inteira).
+
+    Args:
+        client: Cliente Typesense
+        year: Primeiro ano mantido
+        base: Nome base das partições
+
+    Returns:
+        Nomes das partições removidas
+    """
+    removed = []
+    for partition_year, name in list_partitions(client, base).items():
+        if partition_year < year:
+            client.collections[name].delete()
+            logger.info(f"Partição '{name}' removida")
+            removed.append(name)
+    return removed
+
+
+def _merge_facets(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Soma as contagens de facet de cada partição."""
+    merged: dict[str, dict[str, int]] = {}
+    for result in results:
+        for facet in result.get("facet_counts", []):
+            counts = merged.setdefault(facet["field_name"], {})
+            for item in facet["counts"]:
+                counts[item["value"]] = counts.get(item["value"], 0) + item["count"]
+    return [
+        {
+            "field_name": field,
+            "counts": [
+                {"value": value, "count": count}
+                for value, count in sorted(counts.items(), key=lambda item: -item[1])
+            ],
+        }
+        for field, counts in merged.items()
+    ]
+
+
+def search_partitioned(
+    client: typesense.Client,
+    params: dict[str, Any],
+    start: int | None = None,
+    end: int | None = None,
+    base: str = COLLECTION_NAME,
+) -> dict[str, Any]:
+    """
+    Busca nas partições do intervalo de datas e intercala por published_at.
+
+    O filtro de data é combinado com o filter_by de params, posto entre
+    parênteses para que um || do chamador não escape do intervalo. Cada
+    partição devolve os page * per_page primeiros resultados por
+    published_at decrescente (um sort_by de params é ignorado, já que a
+    intercalação só é correta com a mesma ordem em todas as partições) e a
+    página pedida é recortada dessa intercalação.
+
+    Args:
+        client: Cliente Typesense
+        params: Parâmetros de busca (q, query_by, filter_by, facet_by,
+            page, per_page...)
+        start: Início inclusivo de published_at em segundos Unix
+        end: Fim exclusivo de published_at em segundos Unix
+        base: Nome base das partições
+
+    Returns:
+        Resposta no formato do Typesense ('found', 'hits', 'facet_counts',
+        'page'), acrescida de 'partitions' (coleções consultadas)
+
+    Raises:
+        ValueError: Se page * per_page exceder MAX_PER_PAGE
+    """
+    page = int(params.get("page", 1))
+    per_page = int(params.get("per_page", 10))
+    if page * per_page > MAX_PER_PAGE:
+        raise ValueError(f"page * per_page não pode exceder {MAX_PER_PAGE}")
+
+    names = partitions_for_range(list_partitions(client, base), start, end)
+    response: dict[str, Any] = {
+        "found": 0,
+        "hits": [],
+        "facet_counts": [],
+        "page": page,
+        "partitions": names,
+    }
+    if not names:
+        return response
+
+    # Parênteses preservam a precedência de um filtro com || ao juntar com &&
+    filters = [f"({params['filter_by']})"] if params.get("filter_by") else []
+    if start is not None:
+        filters.append(f"published_at:>={start}")
+    if end is not None:
+        filters.append(f"published_at:<{end}")
+
+    search = dict(
+        params, page=1, per_page=page * per_page, sort_by="published_at:desc"
+    )
+    if filters:
+        search["filter_by"] = " && ".join(filters)
+    searches = [dict(search, collection=name) for name in names]
+    results = client.multi_search.perform({"searches": searches}, {})["results"]
+
+    for name, result in zip(names, results):
+        if "error" in result:
+            raise RuntimeError(f"Busca na partição '{name}' falhou: {result['error']}")
+
+    hits = [hit for result in results for hit in result.get("hits", [])]
+    hits.sort(key=lambda hit: hit["document"].get("published_at", 0), reverse=True)
+    response.update(
+        found=sum(result.get("found", 0) for result in results),
+        hits=hits[(page - 1) * per_page : page * per_page],
+        facet_counts=_merge_facets(results),
+    )
+    return response
@@ -0,0 +1,226 @@
+"""
+Profiler de amostragem para as cargas.
+
+Uma thread auxiliar captura, a intervalos regulares, a pilha de chamadas das
+threads do processo (sys._current_frames) e a anota com o estágio
+ativo em cada thread (ver RunMetrics.stage). As amostras medem tempo de
+parede: uma thread esperando a resposta HTTP aparece parada em socket, não
+some do perfil como em um profiler de CPU. Threads auxiliares fora de
+qualquer estágio (workers ociosos, monitores de progresso) são ignoradas;
+a thread principal é sempre amostrada.
+
+Ao final são gravados dois arquivos:
+
+    <prefixo>.txt     relatório: amostras por estágio, funções com maior
+                      tempo próprio e árvore de chamadas por estágio
+    <prefixo>.folded  pilhas no formato "folded" (uma por linha, com
+                      contagem), aceito por flamegraph.pl e speedscope
+
+Processos do pool de preparação (--workers) não são amostrados.
+"""
+
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Any
+
+from typesense_dgb.metrics import active_stage
+
+logger = logging.getLogger(__name__)
+
+# Intervalo padrão entre amostras, em segundos
+DEFAULT_INTERVAL = 0.005
+
+# Estágio atribuído a amostras fora de qualquer RunMetrics.stage
+UNSTAGED = "other"
+
+# Fração mínima do total para um nó aparecer na árvore de chamadas
+TREE_THRESHOLD = 0.01
+
+# Número de funções listadas em cada ranking de tempo próprio
+TOP_FUNCTIONS = 25
+
+
+def _frame_label(frame: Any) -> str:
+    """Descreve um frame como 'função (arquivo:linha)'."""
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Amostra em segundo plano as pilhas das threads do processo.
+
+    Args:
+        interval: Intervalo entre amostras em segundos (default: 0.005)
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Inicia a thread de amostragem."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a amostragem e aguarda a thread terminar."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Registra uma amostra da pilha da thread principal e das threads em algum estágio."""
+        own = threading.get_ident()
+        main = threading.main_thread().ident
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            stage = active_stage(thread_id)
+            if thread_id == own or (stage is None and thread_id != main):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            thread_name = names.get(thread_id, str(thread_id))
+            self.samples[(stage or UNSTAGED, thread_name, *stack)] += 1
+
+    @property
+    def total(self) -> int:
+        """Número total de amostras (somando todas as threads)."""
+        return sum(self.samples.values())
+
+    def stage_counts(self) -> Counter[str]:
+        """Amostras por estágio."""
+        counts: Counter[str] = Counter()
+        for key, count in self.samples.items():
+            counts[key[0]] += count
+        return counts
+
+    def self_time(self, stage: str | None = None) -> Counter[str]:
+        """
+        Amostras em que cada função estava no topo da pilha.
+
+        Args:
+            stage: Se informado, considera só as amostras desse estágio
+
+        Returns:
+            Contagem de amostras por função
+        """
+        counts: Counter[str] = Counter()
+        for key, count in self.samples.items():
+            if stage is None or key[0] == stage:
+                counts[key[-1]] += count
+        return counts
+
+    def write_folded(self, path: str) -> None:
+        """
+        Grava as pilhas no formato folded (estágio;thread;frames contagem).
+
+        Args:
+            path: Caminho do arquivo
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for key, count in sorted(self.samples.items()):
+                f.write(f"{';'.join(key)} {count}\n")
+
+    def _tree_lines(self) -> list[str]:
+        """Monta a árvore de chamadas (estágio → thread → frames)."""
+        tree: dict[str, Any] = {}
+        for key, count in self.samples.items():
+            node = tree
+            for label in key:
+                child = node.setdefault(label, {"count": 0, "self": 0, "children": {}})
+                child["count"] += count
+                node = child["children"]
+            child["self"] += count
+
+        total = self.total
+        lines: list[str] = []
+
+        def walk(children: dict[str, Any], depth: int) -> None:
+            for label, node in sorted(children.items(), key=lambda item: -item[1]["count"]):
+                if node["count"] / total < TREE_THRESHOLD:
+                    continue
+                lines.append(
+                    f"{node['count'] / total:6.1%} {node['self'] / total:6.1%}  "
+                    f"{'  ' * depth}{label}"
+                )
+                walk(node["children"], depth + 1)
+
+        walk(tree, 0)
+        return lines
+
+    def report(self) -> str:
+        """
+        Monta o relatório em texto.
+
+        Returns:
+            Relatório com estágios, tempo próprio e árvore de chamadas
+        """
+        total = self.total
+        if total == 0:
+            return "Nenhuma amostra coletada.\n"
+
+        lines = [
+            f"Amostras: {total} (intervalo de {self.interval * 1000:.1f} ms, somando as threads)",
+            "",
+            "== Amostras por estágio ==",
+        ]
+        stages = self.stage_counts()
+        for stage, count in stages.most_common():
+            lines.append(f"{count / total:6.1%} {count:8d}  {stage}")
+
+        lines += ["", "== Funções com maior tempo próprio =="]
+        for label, count in self.self_time().most_common(TOP_FUNCTIONS):
+            lines.append(f"{count / total:6.1%} {count:8d}  {label}")
+
+        for stage, _ in stages.most_common():
+            lines += ["", f"== Tempo próprio no estágio '{stage}' =="]
+            for label, count in self.self_time(stage).most_common(10):
+                lines.append(f"{count / total:6.1%} {count:8d}  {label}")
+
+        lines += [
+            "",
+            f"== Árvore de chamadas (total, próprio; nós com ≥ {TREE_THRESHOLD:.0%}) ==",
+            *self._tree_lines(),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix: str) -> None:
+        """
+        Grava o relatório (<prefix>.txt) e as pilhas (<prefix>.folded).
+
+        Args:
+            prefix: Caminho dos arquivos, sem extensão
+        """
+        with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(self.report())
+        self.write_folded(f"{prefix}.folded")
+        logger.info(
+            f"Perfil gravado em {prefix}.txt e {prefix}.folded ({self.total} amostras)"
+        )
+        for label, count in self.self_time().most_common(5):
+            logger.info(f"  {count / self.total:6.1%}  {label}")
@@ -0,0 +1,167 @@
+"""
+Prontidão do Typesense: espera com backoff exponencial e prazo total.
+
+Sondar /health em intervalos fixos arredonda a partida para múltiplos do
+intervalo, e "saudável" não garante que a coleção já foi carregada do disco
+após um restart. Aqui a sondagem começa com intervalos curtos que dobram até
+um teto, respeita um prazo total e, opcionalmente, só declara o servidor
+pronto quando a coleção alvo responde a buscas com o número esperado de
+documentos. O tempo até ficar pronto é medido e logado.
+"""
+
+import logging
+import random
+import time
+from typing import Any
+
+import requests
+from typesense.api_call import ApiCall
+
+from typesense_dgb.client import HEALTH_TIMEOUT, check_nodes, node_url, probe_session
+
+logger = logging.getLogger(__name__)
+
+# Prazo total da espera, em segundos
+DEFAULT_DEADLINE = 60.0
+
+# Primeiro intervalo entre sondagens e teto do backoff, em segundos
+DEFAULT_INITIAL_INTERVAL = 0.05
+DEFAULT_MAX_INTERVAL = 2.0
+
+# Fração aleatória somada a cada intervalo, para clientes não sondarem em sincronia
+BACKOFF_JITTER = 0.2
+
+
+def backoff_intervals(
+    initial: float = DEFAULT_INITIAL_INTERVAL, maximum: float = DEFAULT_MAX_INTERVAL
+):
+    """
+    Intervalos de espera que dobram a cada tentativa até o teto.
+
+    Args:
+        initial: Primeiro intervalo em segundos
+        maximum: Intervalo máximo em segundos
+
+    Yields:
+        Intervalo da próxima espera, com jitter
+    """
+    interval = initial
+    while True:
+        yield interval * (1 + random.uniform(0, BACKOFF_JITTER))
+        interval = min(interval * 2, maximum)
+
+
+def collection_status(
+    node: dict[str, str], api_key: str, collection_name: str
+) -> tuple[int | None, str | None]:
+    """
+    Verifica se uma coleção responde a buscas em um nó.
+
+    Args:
+        node: Nó do cluster
+        api_key: Chave de API
+        collection_name: Nome da coleção ou alias
+
+    Returns:
+        Tupla (documentos na coleção, erro); documentos é None se a coleção
+        ainda não puder ser consultada
+    """
+    session = probe_session()
+    headers = {ApiCall.API_KEY_HEADER_NAME: api_key}
+    base = f"{node_url(node)}/collections/{collection_name}"
+    try:
+        response = session.get(
+            f"{base}/documents/search",
+            params={"q": "*", "per_page": 0},
+            headers=headers,
+            timeout=HEALTH_TIMEOUT,
+        )
+        if response.status_code != 200:
+            return None, f"busca em '{collection_name}' retornou {response.status_code}"
+        return response.json()["found"], None
+    except (requests.RequestException, ValueError, KeyError) as e:
+        return None, str(e)
+
+
+def wait_until_ready(
+    nodes: list[dict[str, str]],
+    api_key: str,
+    deadline: float = DEFAULT_DEADLINE,
+    initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    collection_name: str | None = None,
+    expected_documents: int | None = None,
+) -> dict[str, Any]:
+    """
+    Aguarda o Typesense ficar pronto, com backoff exponencial até um prazo.
+
+    O servidor está pronto quando algum nó responde /health e, se
+    collection_name for informado, a coleção responde a buscas nesse nó com
+    pelo menos expected_documents documentos.
+
+    Args:
+        nodes: Nós do cluster
+        api_key: Chave de API (usada nas buscas da coleção)
+        deadline: Prazo total em segundos (default: 60)
+        initial_interval: Primeiro intervalo entre sondagens (default: 0.05)
+        max_interval: Teto do intervalo entre sondagens (default: 2)
+        collection_name: Coleção que precisa estar consultável
+        expected_documents: Mínimo de documentos esperado na coleção
+
+    Returns:
+        Dicionário com 'ready', 'time_to_ready' (segundos, None se não ficou
+        pronto), 'attempts', 'healthy' (nós saudáveis), 'nodes' (todos os
+        nós, saudáveis primeiro), 'documents' e 'error'
+    """
+    report: dict[str, Any] = {
+        "ready": False,
+        "time_to_ready": None,
+        "attempts": 0,
+        "healthy": [],
+        "nodes": list(nodes),
+        "documents": None,
+        "error": None,
+    }
+    start = time.monotonic()
+    intervals = backoff_intervals(initial_interval, max_interval)
+
+    while True:
+        report["attempts"] += 1
+        statuses = check_nodes(nodes, api_key, roles=False)
+        healthy = [s["node"] for s in statuses if s["healthy"]]
+        report["healthy"] = healthy
+        report["nodes"] = healthy + [s["node"] for s in statuses if not s["healthy"]]
+
+        if not healthy:
+            report["error"] = "; ".join(
+                f"{node_url(s['node'])}: {s['error']}" for s in statuses
+            )
+        elif collection_name is None:
+            report["error"] = None
+        else:
+            documents, report["error"] = collection_status(healthy[0], api_key, collection_name)
+            report["documents"] = documents
+            if documents is not None and documents < (expected_documents or 0):
+                report["error"] = (
+                    f"'{collection_name}' com {documents} de {expected_documents} documentos"
+                )
+
+        elapsed = time.monotonic() - start
+        if healthy and report["error"] is None:
+            report["ready"] = True
+            report["time_to_ready"] = elapsed
+            logger.info(
+                f"Typesense pronto em {elapsed:.2f}s ({report['attempts']} tentativas, "
+                f"{len(healthy)}/{len(nodes)} nós saudáveis)"
+            )
+            return report
+
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            logger.error(
+                f"Typesense não ficou pronto em {deadline:.0f}s "
+                f"({report['attempts']} tentativas): {report['error']}"
+            )
+            return report
+        logger.info(f"Typesense não está pronto (tentativa {report['attempts']}): {report['error']}")
+        time.sleep(min(next(intervals), remaining))
@@ -0,0 +1,330 @@
+"""
+Reindexação blue/green sem indisponibilidade.
+
+Em vez de apagar a coleção e recarregá-la (buscas vazias ou parciais durante
+toda a carga), cada reindexação cria uma nova geração física
+`<alias>_<AAAAMMDDHHMMSS>`, indexa nela, valida contagem e consultas de
+fumaça e só então reaponta o alias (ex: `news`) de forma atômica. Gerações
+antigas além das `keep` mais recentes são removidas.
+
+Uma coleção física com o nome do alias (instalações anteriores ao uso de
+aliases) é copiada para uma geração antes de ser removida, entrando na
+mesma política de `keep` e permitindo reapontar o alias para ela.
+"""
+
+import logging
+import re
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+import typesense
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.collection import (
+    COLLECTION_NAME,
+    COLLECTION_SCHEMA,
+    create_collection,
+    resolve_alias,
+    upsert_alias,
+)
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.jsonl import import_jsonl, iter_export
+
+logger = logging.getLogger(__name__)
+
+# Formato do sufixo de cada geração
+GENERATION_FORMAT = "%Y%m%d%H%M%S"
+
+# Gerações mantidas após a troca do alias (incluindo a nova)
+DEFAULT_KEEP = 2
+
+# Fração mínima de documentos da geração nova em relação à atual
+DEFAULT_MIN_RATIO = 0.95
+
+# Fração máxima de documentos rejeitados na importação
+DEFAULT_MAX_ERROR_RATE = 0.001
+
+# Documentos por importação ao copiar uma coleção física legada
+LEGACY_COPY_BATCH = 1000
+
+# Campos de collections[nome].retrieve() que não fazem parte do schema
+_COLLECTION_INFO_KEYS = ("name", "num_documents", "created_at", "num_memory_shards")
+
+# Consultas que precisam retornar resultados na geração nova
+SMOKE_QUERIES: list[dict[str, Any]] = [
+    {"q": "saúde", "query_by": "title,content", "limit": 1},
+    {"q": "*", "query_by": "title", "facet_by": "agency", "limit": 0},
+]
+
+
+def generation_name(alias: str = COLLECTION_NAME, now: datetime | None = None) -> str:
+    """
+    Gera o nome físico de uma nova geração.
+
+    Args:
+        alias: Nome do alias (default: 'news')
+        now: Instante de referência (default: agora, em UTC)
+
+    Returns:
+        Nome no formato '<alias>_<AAAAMMDDHHMMSS>'
+    """
+    now = now or datetime.now(timezone.utc)
+    return f"{alias}_{now.strftime(GENERATION_FORMAT)}"
+
+
+def list_generations(client: typesense.Client, alias: str = COLLECTION_NAME) -> list[str]:
+    """
+    Lista as gerações físicas de um alias, da mais antiga para a mais nova.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+
+    Returns:
+        Nomes das coleções '<alias>_<AAAAMMDDHHMMSS>' existentes
+    """
+    pattern = re.compile(rf"^{re.escape(alias)}_\d{{14}}$")
+    names = [c["name"] for c in client.collections.retrieve()]
+    return sorted(name for name in names if pattern.match(name))
+
+
+def validate_generation(
+    client: typesense.Client,
+    collection_name: str,
+    stats: dict[str, Any],
+    live_count: int = 0,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    queries: list[dict[str, Any]] | None = None,
+) -> list[str]:
+    """
+    Verifica se uma geração recém-indexada pode receber o tráfego.
+
+    Args:
+        client: Cliente Typesense
+        collection_name: Geração a validar
+        stats: Estatísticas retornadas por index_documents
+        live_count: Documentos na geração atualmente servida
+        min_ratio: Fração mínima de live_count exigida na geração nova
+        max_error_rate: Fração máxima de documentos rejeitados
+        queries: Consultas de fumaça (default: SMOKE_QUERIES)
+
+    Returns:
+        Lista de problemas encontrados (vazia se a geração é válida)
+    """
+    problems = []
+    num_documents = client.collections[collection_name].retrieve().get(
+        "num_documents", 0
+    )
+    logger.info(
+        f"Validando '{collection_name}': {num_documents} documentos "
+        f"(geração atual: {live_count})"
+    )
+
+    if num_documents == 0:
+        problems.append("coleção vazia")
+    elif num_documents < live_count * min_ratio:
+        problems.append(
+            f"{num_documents} documentos, abaixo de {min_ratio:.0%} dos "
+            f"{live_count} da geração atual"
+        )
+
+    processed = stats.get("total_processed", 0)
+    if processed and stats.get("errors", 0) / processed > max_error_rate:
+        problems.append(
+            f"{stats['errors']} documentos rejeitados de {processed} "
+            f"(limite: {max_error_rate:.2%})"
+        )
+
+    for params in SMOKE_QUERIES if queries is None else queries:
+        try:
+            found = client.collections[collection_name].documents.search(params)["found"]
+        except Exception as e:
+            problems.append(f"consulta {params['q']!r} falhou: {e}")
+            continue
+        if found == 0:
+            problems.append(f"consulta {params['q']!r} não retornou resultados")
+
+    return problems
+
+
+def collect_garbage(
+    client: typesense.Client,
+    alias: str = COLLECTION_NAME,
+    keep: int = DEFAULT_KEEP,
+) -> list[str]:
+    """
+    Remove gerações antigas, preservando as `keep` mais recentes.
+
+    A geração para a qual o alias aponta nunca é removida.
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome do alias
+        keep: Número de gerações a manter (default: 2)
+
+    Returns:
+        Nomes das coleções removidas
+    """
+    live = resolve_alias(client, alias)
+    generations = list_generations(client, alias)
+    stale = generations[: max(0, len(generations) - max(1, keep))]
+
+    removed = []
+    for name in stale:
+        if name == live:
+            continue
+        try:
+            client.collections[name].delete()
+        except ObjectNotFound:
+            continue
+        logger.info(f"Geração antiga '{name}' removida")
+        removed.append(name)
+    return removed
+
+
+def _copy_batch(client: typesense.Client, name: str, batch: list[bytes]) -> int:
+    """Importa um lote de linhas exportadas e retorna quantas foram aceitas."""
+    count, errors = import_jsonl(client, name, b"\n".join(batch))
+    for error in errors[:5]:
+        logger.warning(f"Erro ao copiar documento: {error}")
+    return count
+
+
+def preserve_legacy(
+    client: typesense.Client, alias: str, info: dict[str, Any]
+) -> str:
+    """
+    Copia a coleção física com o nome do alias para uma geração.
+
+    O Typesense não renomeia coleções, e uma coleção física encobre o alias
+    de mesmo nome; a cópia, nomeada pela data de criação da coleção legada,
+    fica sujeita à mesma política de `keep` que as demais gerações. Repetir
+    a cópia após uma falha é seguro (importação com upsert).
+
+    Args:
+        client: Cliente Typesense
+        alias: Nome da coleção física legada (e do alias)
+        info: Resultado de collections[alias].retrieve()
+
+    Returns:
+        Nome da geração com a cópia
+
+    Raises:
+        RuntimeError: Se a cópia não tiver todos os documentos da legada
+    """
+    created_at = datetime.fromtimestamp(info.get("created_at", 0), timezone.utc)
+    name = generation_name(alias, created_at)
+    schema = {key: value for key, value in info.items() if key not in _COLLECTION_INFO_KEYS}
+    logger.info(f"Copiando coleção física '{alias}' para '{name}'")
+    create_collection(client, name, schema)
+
+    # O export é lido em streaming e importado em lotes de LEGACY_COPY_BATCH,
+    # sem manter a coleção inteira em memória
+    copied = 0
+    batch: list[bytes] = []
+    for line in iter_export(client, alias):
+        batch.append(line)
+        if len(batch) == LEGACY_COPY_BATCH:
+            copied += _copy_batch(client, name, batch)
+            batch = []
+    if batch:
+        copied += _copy_batch(client, name, batch)
+
+    expected = info.get("num_documents", 0)
+    if copied < expected:
+        raise RuntimeError(
+            f"Cópia de '{alias}' em '{name}' incompleta: {copied} de {expected} documentos"
+        )
+    logger.info(f"{copied} documentos copiados para '{name}'")
+    return name
+
+
+def reindex(
+    client: typesense.Client,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    alias: str = COLLECTION_NAME,
+    schema: dict[str, Any] | None = None,
+    keep: int = DEFAULT_KEEP,
+    min_ratio: float = DEFAULT_MIN_RATIO,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    **index_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Reindexa em uma nova geração e troca o alias se ela for válida.
+
+    Se `alias` ainda for uma coleção física (instalações anteriores ao uso
+    de aliases), ela é copiada para uma geração (preserve_legacy) e só então
+    removida, logo após a troca, pois uma coleção com o mesmo nome tem
+    precedência sobre o alias no Typesense.
+
+    Args:
+        client: Cliente Typesense
+        df: DataFrame com documentos a indexar, ou iterável de DataFrames
+        alias: Alias servido às buscas (default: 'news')
+        schema: Schema customizado (default: COLLECTION_SCHEMA)
+        keep: Gerações mantidas após a troca (default: 2)
+        min_ratio: Fração mínima de documentos em relação à geração atual
+        max_error_rate: Fração máxima de documentos rejeitados
+        **index_kwargs: Argumentos repassados a index_documents
+            (batch_size, concurrency, batcher, workers, metrics...)
+
+    Returns:
+        Estatísticas de index_documents acrescidas de 'collection',
+        'previous' (geração legada copiada, se havia coleção física) e 'removed'
+
+    Raises:
+        RuntimeError: Se a validação falhar (o alias não é alterado e a
+            geração nova é mantida para inspeção)
+    """
+    previous = resolve_alias(client, alias)
+    legacy = False
+    live_info: dict[str, Any] = {}
+    live_count = 0
+    try:
+        live_info = client.collections[alias].retrieve()
+        live_count = live_info.get("num_documents", 0)
+        legacy = previous is None
+    except ObjectNotFound:
+        pass
+
+    collection_name = generation_name(alias)
+    if collection_name in list_generations(client, alias):
+        raise RuntimeError(f"Geração '{collection_name}' já existe")
+    logger.info(
+        f"Reindexando '{alias}' em '{collection_name}' "
+        f"(geração atual: {previous or ('coleção física' if legacy else 'nenhuma')})"
+    )
+    create_collection(client, collection_name, schema or COLLECTION_SCHEMA)
+
+    stats = index_documents(
+        client, df, collection_name=collection_name, mode="full", force=True, **index_kwargs
+    )
+
+    problems = validate_generation(
+        client, collection_name, stats, live_count, min_ratio, max_error_rate
+    )
+    if problems:
+        for problem in problems:
+            logger.error(f"Validação falhou: {problem}")
+        raise RuntimeError(
+            f"Geração '{collection_name}' reprovada; alias '{alias}' mantido em "
+            f"'{previous or alias}'"
+        )
+
+    if legacy:
+        previous = preserve_legacy(client, alias, live_info)
+
+    upsert_alias(client, alias, collection_name)
+    if legacy:
+        logger.warning(
+            f"Removendo coleção física '{alias}' que encobria o alias (cópia em '{previous}')"
+        )
+        client.collections[alias].delete()
+
+    removed = collect_garbage(client, alias, keep)
+    stats.update(collection=collection_name, previous=previous, removed=removed)
+    logger.info(f"Reindexação concluída: '{alias}' → '{collection_name}'")
+    return stats
@@ -0,0 +1,231 @@
+"""
+Retenção: remoção em massa de matérias antigas ou retiradas.
+
+Remove documentos com delete-by-filter do Typesense, sem recriar a coleção:
+matérias publicadas antes de uma data de corte ou uma lista de ids. Para não
+disputar CPU e disco com as buscas, a remoção é dividida em fatias (janelas
+de `published_at` ou grupos de ids), com uma pausa entre as chamadas e
+progresso logado a cada fatia. O modo dry-run apenas conta os documentos que
+seriam removidos.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import typesense
+
+from typesense_dgb.collection import COLLECTION_NAME
+
+logger = logging.getLogger(__name__)
+
+# Documentos removidos por lote dentro de cada chamada de delete-by-filter
+DEFAULT_BATCH_SIZE = 500
+
+# Largura de cada janela de published_at removida por chamada
+DEFAULT_WINDOW_DAYS = 30
+
+# Ids por chamada na remoção por lista
+DEFAULT_IDS_PER_CALL = 100
+
+# Pausa entre chamadas, em segundos
+DEFAULT_THROTTLE = 0.5
+
+
+def retention_cutoff(days: int, now: datetime | None = None) -> int:
+    """
+    Data de corte da retenção em segundos Unix.
+
+    Args:
+        days: Dias de matérias mantidos
+        now: Instante de referência (default: agora)
+
+    Returns:
+        published_at mínimo mantido
+    """
+    now = now or datetime.now(timezone.utc)
+    return int((now - timedelta(days=days)).timestamp())
+
+
+def ids_filter(ids: list[str]) -> str:
+    """
+    Monta o filtro de uma lista de ids.
+
+    Args:
+        ids: Ids dos documentos
+
+    Returns:
+        Expressão filter_by no formato id:[`a`,`b`]
+    """
+    return "id:[" + ",".join(f"`{doc_id}`" for doc_id in ids) + "]"
+
+
+def count_matching(
+    client: typesense.Client, filter_by: str, collection_name: str = COLLECTION_NAME
+) -> int:
+    """
+    Conta os documentos que atendem a um filtro.
+
+    Args:
+        client: Cliente Typesense
+        filter_by: Expressão de filtro
+        collection_name: Nome da coleção ou alias
+
+    Returns:
+        Número de documentos encontrados
+    """
+    result = client.collections[collection_name].documents.search(
+        {"q": "*", "filter_by": filter_by, "per_page": 0}
+    )
+    return result["found"]
+
+
+def _oldest_published_at(client: typesense.Client, collection_name: str) -> int | None:
+    """published_at do documento datado mais antigo, ou None se não houver nenhum."""
+    result = client.collections[collection_name].documents.search(
+        {
+            "q": "*",
+            "filter_by": "published_at:>0",
+            "sort_by": "published_at:asc",
+            "per_page": 1,
+            "include_fields": "published_at",
+        }
+    )
+    hits = result.get("hits", [])
+    return hits[0]["document"]["published_at"] if hits else None
+
+
+def _cutoff_windows(start: int, cutoff: int, window_days: int) -> Iterator[str]:
+    """
+    Filtros de janelas consecutivas de published_at, do início até o corte.
+
+    A primeira janela não tem limite inferior, cobrindo também o que vem
+    antes de start (documentos sem data); há sempre ao menos uma janela.
+    """
+    step = window_days * 86400
+    upper = min(start + step, cutoff)
+    yield f"published_at:<{upper}"
+    while upper < cutoff:
+        lower, upper = upper, min(upper + step, cutoff)
+        yield f"published_at:>={lower} && published_at:<{upper}"
+
+
+def _delete_slices(
+    client: typesense.Client,
+    collection_name: str,
+    filters: Iterator[str],
+    expected: int,
+    batch_size: int,
+    throttle: float,
+) -> dict[str, Any]:
+    """Executa um delete-by-filter por fatia, com pausa e progresso."""
+    stats = {"expected": expected, "deleted": 0, "calls": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+    for filter_by in filters:
+        if stats["calls"]:
+            time.sleep(throttle)
+        result = client.collections[collection_name].documents.delete(
+            {"filter_by": filter_by, "batch_size": batch_size}
+        )
+        stats["calls"] += 1
+        stats["deleted"] += result.get("num_deleted", 0)
+        logger.info(
+            f"Removidos {stats['deleted']}/{expected} documentos "
+            f"({stats['calls']} chamadas, {time.perf_counter() - start:.1f}s)"
+        )
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def prune_before(
+    client: typesense.Client,
+    cutoff: int,
+    collection_name: str = COLLECTION_NAME,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    throttle: float = DEFAULT_THROTTLE,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """
+    Remove os documentos publicados antes de uma data de corte.
+
+    A remoção segue do documento datado mais antigo até o corte, uma janela
+    de window_days por chamada; documentos sem data (published_at 0) caem na
+    primeira janela, que não tem limite inferior.
+
+    Args:
+        client: Cliente Typesense
+        cutoff: published_at mínimo mantido, em segundos Unix
+        collection_name: Nome da coleção ou alias
+        batch_size: Documentos removidos por lote dentro de cada chamada
+        window_days: Largura de cada janela em dias
+        throttle: Pausa entre chamadas em segundos
+        dry_run: Se True, apenas conta os documentos
+
+    Returns:
+        Dicionário com 'expected' (documentos antes do corte), 'deleted',
+        'calls' e 'elapsed' (segundos)
+    """
+    filter_by = f"published_at:<{cutoff}"
+    expected = count_matching(client, filter_by, collection_name)
+    cutoff_date = datetime.fromtimestamp(cutoff, timezone.utc).date()
+    logger.info(f"{expected} documentos publicados antes de {cutoff_date} em '{collection_name}'")
+
+    if dry_run or expected == 0:
+        return {"expected": expected, "deleted": 0, "calls": 0, "elapsed": 0.0}
+
+    oldest = _oldest_published_at(client, collection_name)
+    start = cutoff if oldest is None else min(oldest, cutoff)
+    return _delete_slices(
+        client,
+        collection_name,
+        _cutoff_windows(start, cutoff, window_days),
+        expected,
+        batch_size,
+        throttle,
+    )
+
+
+def delete_ids(
+    client: typesense.Client,
+    ids: list[str],
+    collection_name: str = COLLECTION_NAME,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ids_per_call: int = DEFAULT_IDS_PER_CALL,
+    throttle: float = DEFAULT_THROTTLE,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """
+    Remove uma lista de documentos (ex: matérias retiradas do ar).
+
+    Args:
+        client: Cliente Typesense
+        ids: Ids dos documentos
+        collection_name: Nome da coleção ou alias
+        batch_size: Documentos removidos por lote dentro de cada chamada
+        ids_per_call: Ids por chamada de delete-by-filter
+        throttle: Pausa entre chamadas em segundos
+        dry_run: Se True, apenas conta os documentos existentes
+
+    Returns:
+        Dicionário com 'expected' (ids encontrados na coleção), 'deleted',
+        'calls' e 'elapsed' (segundos)
+    """
+    ids = list(dict.fromkeys(ids))
+    groups = [ids[i : i + ids_per_call] for i in range(0, len(ids), ids_per_call)]
+    expected = sum(count_matching(client, ids_filter(group), collection_name) for group in groups)
+    logger.info(f"{expected} de {len(ids)} ids encontrados em '{collection_name}'")
+
+    if dry_run or expected == 0:
+        return {"expected": expected, "deleted": 0, "calls": 0, "elapsed": 0.0}
+
+    return _delete_slices(
+        client,
+        collection_name,
+        (ids_filter(group) for group in groups),
+        expected,
+        batch_size,
+        throttle,
+    )
@@ -0,0 +1,364 @@
+"""
+Busca com requisições hedged e circuit breaker por nó.
+
+A latência p99 das buscas é dominada por nós lentos ocasionais (ex: durante
+um snapshot), não pelo custo mediano da consulta. O HedgedSearcher envia cada
+busca a um nó e, se a resposta não chegar dentro de um atraso derivado de um
+percentil das latências recentes, envia uma cópia a um segundo nó; vale a
+primeira resposta e a outra é cancelada. Um circuit breaker por nó tira de
+rotação os nós que acumulam timeouts e falhas, até um período de espera
+terminar e uma requisição de teste passar.
+
+Só buscas (search e multi_search) passam por aqui: são idempotentes, então
+duplicá-las não altera dados.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import requests
+import typesense
+from typesense.api_call import ApiCall
+from typesense.exceptions import HTTPStatus0Error, ServerError, ServiceUnavailable
+
+from typesense_dgb.client import build_session, split_timeout
+from typesense_dgb.collection import COLLECTION_NAME
+
+logger = logging.getLogger(__name__)
+
+# Percentil das latências recentes usado como atraso do hedge
+DEFAULT_HEDGE_PERCENTILE = 95
+
+# Limites do atraso do hedge, em segundos
+MIN_HEDGE_DELAY = 0.01
+MAX_HEDGE_DELAY = 1.0
+
+# Atraso usado até haver latências suficientes para o percentil
+DEFAULT_INITIAL_HEDGE_DELAY = 0.1
+
+# Latências mantidas e mínimo de amostras para calcular o percentil
+LATENCY_WINDOW = 500
+MIN_LATENCY_SAMPLES = 20
+
+# Falhas consecutivas que abrem o circuito de um nó
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Segundos com o circuito aberto antes de uma requisição de teste
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Falhas que justificam tentar outro nó (transporte e 5xx); as demais são do pedido
+RETRYABLE_ERRORS = (HTTPStatus0Error, ServerError, ServiceUnavailable)
+
+# Estados do circuit breaker
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyTracker:
+    """
+    Janela deslizante de latências e o atraso de hedge derivado dela.
+
+    Args:
+        percentile: Percentil das latências usado como atraso (default: 95)
+        window: Latências mantidas (default: 500)
+        initial_delay: Atraso até haver MIN_LATENCY_SAMPLES amostras
+        min_delay: Limite inferior do atraso em segundos
+        max_delay: Limite superior do atraso em segundos
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        window: int = LATENCY_WINDOW,
+        initial_delay: float = DEFAULT_INITIAL_HEDGE_DELAY,
+        min_delay: float = MIN_HEDGE_DELAY,
+        max_delay: float = MAX_HEDGE_DELAY,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile deve estar entre 0 e 100")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Registra a latência de uma busca concluída, em segundos."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float:
+        """
+        Atraso antes de enviar a cópia de uma busca.
+
+        Returns:
+            Percentil configurado das latências recentes, limitado a
+            [min_delay, max_delay]
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            value = self.initial_delay
+        else:
+            index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+            value = latencies[index]
+        return min(max(value, self.min_delay), self.max_delay)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de um nó: fechado, aberto ou meio-aberto.
+
+    Após failure_threshold falhas consecutivas o circuito abre e o nó sai de
+    rotação; passados reset_timeout segundos, uma única requisição de teste é
+    liberada (meio-aberto) e o resultado dela fecha ou reabre o circuito.
+
+    Args:
+        failure_threshold: Falhas consecutivas que abrem o circuito (default: 3)
+        reset_timeout: Segundos com o circuito aberto (default: 30)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Indica se o nó pode receber uma requisição agora.
+
+        Returns:
+            True com o circuito fechado, ou para a única requisição de teste
+            após o período de espera
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Fecha o circuito após uma resposta do nó."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Conta uma falha; abre o circuito no limite ou se o teste falhar."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"Circuito aberto após {self.failures} falhas consecutivas")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class _CancelledError(Exception):
+    """A outra cópia da busca respondeu primeiro."""
+
+
+class HedgedSearcher:
+    """
+    Buscas com hedge entre os nós de um cliente Typesense.
+
+    Args:
+        client: Cliente Typesense (fonte dos nós, chave e timeouts)
+        percentile: Percentil das latências usado como atraso do hedge
+        initial_delay: Atraso do hedge até haver latências suficientes
+        failure_threshold: Falhas consecutivas que abrem o circuito de um nó
+        reset_timeout: Segundos com o circuito de um nó aberto
+        max_workers: Buscas simultâneas, contando as cópias (default: 16)
+    """
+
+    def __init__(
+        self,
+        client: typesense.Client,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        initial_delay: float = DEFAULT_INITIAL_HEDGE_DELAY,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        max_workers: int = 16,
+    ) -> None:
+        config = client.config
+        self.nodes = [node.url() for node in config.nodes]
+        self.headers = {ApiCall.API_KEY_HEADER_NAME: config.api_key}
+        self.timeout = split_timeout(config.connection_timeout_seconds)
+        self.latency = LatencyTracker(percentile, initial_delay=initial_delay)
+        self.breakers = {
+            node: CircuitBreaker(failure_threshold, reset_timeout) for node in self.nodes
+        }
+        self.stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        # Sessão própria e sem retentativas: repetir em outro nó é papel do hedge
+        self._session = build_session(pool_size=max_workers)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="hedge")
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def search(
+        self, params: dict[str, Any], collection_name: str = COLLECTION_NAME
+    ) -> dict[str, Any]:
+        """
+        Busca em uma coleção (equivale a documents.search do cliente).
+
+        Args:
+            params: Parâmetros da busca
+            collection_name: Nome da coleção ou alias
+
+        Returns:
+            Resposta da busca
+        """
+        query = dict(params)
+        ApiCall.normalize_params(query)
+        return self._hedged(
+            "GET", f"/collections/{collection_name}/documents/search", params=query
+        )
+
+    def multi_search(
+        self, searches: list[dict[str, Any]], common_params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Várias buscas em uma requisição (equivale a multi_search.perform).
+
+        Args:
+            searches: Buscas, cada uma com 'collection' e seus parâmetros
+            common_params: Parâmetros comuns a todas as buscas
+
+        Returns:
+            Resposta com 'results' na ordem de searches
+        """
+        query = dict(common_params or {})
+        ApiCall.normalize_params(query)
+        return self._hedged("POST", "/multi_search", params=query, json={"searches": searches})
+
+    def close(self) -> None:
+        """Encerra as threads de busca e a sessão HTTP."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    def __enter__(self) -> "HedgedSearcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _pick(self, exclude: str | None = None) -> str | None:
+        """Próximo nó em round-robin com o circuito liberado."""
+        with self._lock:
+            for _ in range(len(self.nodes)):
+                node = self.nodes[self._next]
+                self._next = (self._next + 1) % len(self.nodes)
+                if node != exclude and self.breakers[node].allow():
+                    return node
+        return None
+
+    def _hedged(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
+        """Envia ao nó primário e, após o atraso do hedge ou uma falha, a um segundo nó."""
+        primary = self._pick()
+        if primary is None:
+            # Todos os circuitos abertos: tenta mesmo assim em vez de falhar sem tentar
+            logger.warning("Nenhum nó com circuito fechado; buscando no próximo nó")
+        with self._lock:
+            if primary is None:
+                primary = self.nodes[self._next % len(self.nodes)]
+            self.stats["requests"] += 1
+
+        cancel = threading.Event()
+        first = self._executor.submit(self._send, primary, method, endpoint, cancel, **kwargs)
+        owners: dict[Future, str] = {first: primary}
+        pending = set(owners)
+        backup_sent = False
+        error: Exception | None = None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=None if backup_sent else self.latency.delay(),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                error = future.exception()
+                if isinstance(error, RETRYABLE_ERRORS):
+                    continue
+                cancel.set()
+                for loser in pending:
+                    loser.cancel()
+                if error is not None:
+                    raise error
+                if owners[future] != primary and not first.done():
+                    # Só é vitória do hedge se o primário ainda estava pendente, não um failover
+                    with self._lock:
+                        self.stats["hedge_wins"] += 1
+                return future.result()
+
+            if not backup_sent:
+                # Primário lento (hedge) ou com falha (failover): tenta outro nó
+                backup_sent = True
+                backup = self._pick(exclude=primary)
+                if backup is not None:
+                    if not done:
+                        with self._lock:
+                            self.stats["hedged"] += 1
+                    future = self._executor.submit(
+                        self._send, backup, method, endpoint, cancel, **kwargs
+                    )
+                    owners[future] = backup
+                    pending.add(future)
+        raise error
+
+    def _send(
+        self, node: str, method: str, endpoint: str, cancel: threading.Event, **kwargs
+    ) -> dict[str, Any]:
+        """Envia a busca a um nó, alimentando o breaker e as latências."""
+        breaker = self.breakers[node]
+        start = time.perf_counter()
+        try:
+            response = self._session.request(
+                method,
+                node + endpoint,
+                headers=self.headers,
+                timeout=self.timeout,
+                stream=True,
+                **kwargs,
+            )
+        except requests.RequestException as e:
+            breaker.record_failure()
+            raise HTTPStatus0Error(0, f"Busca em {node} falhou: {e}") from e
+
+        # Latência até a resposta do nó, também das cópias que perderam,
+        # para o percentil refletir a cauda
+        status = response.status_code
+        if status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.latency.record(time.perf_counter() - start)
+        if cancel.is_set():
+            # A outra cópia já respondeu: descarta sem ler o corpo
+            response.close()
+            raise _CancelledError(node)
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if not 200 <= status < 300:
+            message = body.get("message", "API error.")
+            if status >= 500:
+                raise (ServiceUnavailable if status == 503 else ServerError)(status, message)
+            raise ApiCall.get_exception(status)(status, message)
+        return body
@@ -2,6 +2,7 @@
 Funções utilitárias.
 """
 
+import numpy as np
 import pandas as pd
 
 
@@ -32,3 +33,55 @@ def calculate_published_week(timestamp: int | float | None) -> int | None:
         return int(iso_year * 100 + iso_week)
     except Exception:
         return None
+
+
+def to_epoch_seconds(values: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna datetime para Unix timestamp (segundos) de forma vetorizada.
+
+    Equivale a ``values.apply(lambda x: int(x.timestamp()) if pd.notna(x) else 0)``,
+    mas opera sobre o array int64 subjacente em vez de criar um Timestamp por linha.
+
+    Args:
+        values: Series datetime64 (com ou sem timezone)
+
+    Returns:
+        Series int64 com segundos desde a época; 0 para valores inválidos (NaT)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        # Coluna object (ex: offsets mistos): mantém a conversão linha a linha
+        return values.apply(lambda x: int(x.timestamp()) if pd.notna(x) else 0)
+
+    if getattr(values.dt, "tz", None) is not None:
+        values = values.dt.tz_convert(None)
+
+    unit = np.datetime_data(values.dtype)[0]
+    ticks_per_second = pd.Timedelta(seconds=1) // pd.Timedelta(1, unit=unit)
+
+    raw = values.to_numpy().view("int64")
+    # Mesmo arredondamento de Timestamp.timestamp(): round(valor / denom, 6)
+    seconds = np.trunc(np.round(raw / ticks_per_second, 6))
+    result = np.where(values.isna().to_numpy(), 0, seconds).astype("int64")
+    return pd.Series(result, index=values.index)
+
+
+def calculate_published_weeks(timestamps: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de calculate_published_week para uma coluna inteira.
+
+    Args:
+        timestamps: Series com Unix timestamps em segundos
+
+    Returns:
+        Series Int64 no formato YYYYWW; <NA> onde calculate_published_week
+        retornaria None (timestamp nulo, zero ou negativo)
+    """
+    numeric = pd.to_numeric(timestamps, errors="coerce")
+    valid = numeric.notna() & (numeric > 0)
+
+    result = pd.Series(pd.NA, index=timestamps.index, dtype="Int64")
+    if valid.any():
+        dates = pd.to_datetime(numeric[valid], unit="s", errors="coerce")
+        iso = dates.dt.isocalendar()
+        result[valid] = (iso["year"] * 100 + iso["week"]).astype("Int64")
+    return result
@@ -0,0 +1,231 @@
+"""
+Fakes e fixtures compartilhados pelos testes.
+
+Clientes Typesense em memória, construtores de DataFrames e o isolamento da
+sessão HTTP compartilhada; os módulos de teste os recebem como fixtures.
+"""
+
+import json
+import socket
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+import typesense.api_call
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb import client as client_module
+from typesense_dgb.dataset import process_dataframe
+
+
+class FakeDocuments:
+    """Simula documents.import_, falhando documentos com título 'falha'."""
+
+    def __init__(self, store: dict, lock: threading.Lock, delay: float = 0.0):
+        self.store = store
+        self.lock = lock
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.timeout_above_bytes: int | None = None
+
+    def import_(self, documents, params=None):
+        assert isinstance(documents, bytes), "esperado payload JSONL pré-serializado"
+        if self.timeout_above_bytes and len(documents) > self.timeout_above_bytes:
+            raise requests.exceptions.ReadTimeout("timeout simulado")
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        results = []
+        with self.lock:
+            for line in documents.decode("utf-8").splitlines():
+                doc = json.loads(line)
+                if doc.get("title") == "falha":
+                    results.append('{"success":false,"error":"invalid"}')
+                else:
+                    self.store[doc["id"]] = doc
+                    results.append('{"success":true}')
+            self.active -= 1
+        return "\n".join(results)
+
+
+class FakeCollection:
+    def __init__(self, documents: FakeDocuments):
+        self.documents = documents
+
+    def retrieve(self):
+        return {"num_documents": 0, "fields": []}
+
+
+class FakeClient:
+    """Cliente mínimo com uma única coleção em memória."""
+
+    def __init__(self, delay: float = 0.0):
+        self.store: dict = {}
+        self.documents = FakeDocuments(self.store, threading.Lock(), delay)
+        self.collections = {"news": FakeCollection(self.documents)}
+
+
+class FakeServer:
+    """Coleções e aliases em memória, com a precedência do Typesense."""
+
+    def __init__(self):
+        self.collections: dict[str, dict] = {}
+        self.aliases: dict[str, str] = {}
+
+    def resolve(self, name: str) -> str:
+        if name in self.collections:
+            return name
+        if name in self.aliases:
+            return self.aliases[name]
+        raise ObjectNotFound(404, "Not Found")
+
+
+class FakeServerDocuments:
+    def __init__(self, server: FakeServer, name: str):
+        self.server = server
+        self.name = name
+
+    def import_(self, documents, params=None):
+        docs = self.server.collections[self.server.resolve(self.name)]["docs"]
+        results = []
+        for line in documents.decode("utf-8").splitlines():
+            doc = json.loads(line)
+            if doc.get("title") == "falha":
+                results.append('{"success":false,"error":"invalid"}')
+            else:
+                docs[doc["id"]] = doc
+                results.append('{"success":true}')
+        return "\n".join(results)
+
+    def search(self, params):
+        docs = self.server.collections[self.server.resolve(self.name)]["docs"]
+        return {"found": len(docs)}
+
+    def export(self):
+        docs = self.server.collections[self.server.resolve(self.name)]["docs"]
+        return "\n".join(json.dumps(doc) for doc in docs.values())
+
+
+class FakeServerCollection:
+    def __init__(self, server: FakeServer, name: str):
+        self.server = server
+        self.name = name
+        self.documents = FakeServerDocuments(server, name)
+
+    def retrieve(self):
+        physical = self.server.resolve(self.name)
+        info = self.server.collections[physical]
+        return {
+            "name": physical,
+            "num_documents": len(info["docs"]),
+            "created_at": info["created_at"],
+            "fields": info["schema"]["fields"],
+        }
+
+    def delete(self):
+        physical = self.server.resolve(self.name)
+        return self.server.collections.pop(physical)
+
+
+class FakeServerCollections:
+    def __init__(self, server: FakeServer):
+        self.server = server
+
+    def __getitem__(self, name):
+        return FakeServerCollection(self.server, name)
+
+    def create(self, schema):
+        self.server.collections[schema["name"]] = {
+            "schema": schema,
+            "docs": {},
+            "created_at": len(self.server.collections),
+        }
+
+    def retrieve(self):
+        return [{"name": name} for name in self.server.collections]
+
+
+class FakeAlias:
+    def __init__(self, server: FakeServer, name: str):
+        self.server = server
+        self.name = name
+
+    def retrieve(self):
+        if self.name not in self.server.aliases:
+            raise ObjectNotFound(404, "Not Found")
+        return {"name": self.name, "collection_name": self.server.aliases[self.name]}
+
+
+class FakeAliases:
+    def __init__(self, server: FakeServer):
+        self.server = server
+
+    def __getitem__(self, name):
+        return FakeAlias(self.server, name)
+
+    def upsert(self, name, mapping):
+        self.server.aliases[name] = mapping["collection_name"]
+
+
+class FakeServerClient:
+    def __init__(self):
+        self.server = FakeServer()
+        self.collections = FakeServerCollections(self.server)
+        self.aliases = FakeAliases(self.server)
+
+
+def _bulk_frame(n: int) -> pd.DataFrame:
+    """DataFrame processado com n linhas, uma delas rejeitada pelo fake."""
+    raw = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(n)],
+            "title": ["falha" if i == 7 else f"t{i}" for i in range(n)],
+            "published_at": ["2024-01-01T10:00:00-03:00"] * n,
+            "extracted_at": [None] * n,
+        }
+    )
+    return process_dataframe(raw)
+
+
+def _dead_node() -> dict:
+    """Nó em uma porta sem servidor (conexão recusada)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return {"host": "127.0.0.1", "port": str(port), "protocol": "http"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    """Isola a sessão compartilhada entre os testes."""
+    monkeypatch.setattr(client_module, "_session", None)
+    monkeypatch.setattr(client_module, "_session_pool_size", 0)
+    monkeypatch.setattr(typesense.api_call, "session", typesense.api_call.session)
+
+
+@pytest.fixture
+def fake_client():
+    """Fábrica de FakeClient (importação em memória): fake_client(delay=0.0)."""
+    return FakeClient
+
+
+@pytest.fixture
+def server_client() -> FakeServerClient:
+    """Cliente com coleções e aliases em memória."""
+    return FakeServerClient()
+
+
+@pytest.fixture
+def bulk_frame():
+    """Construtor de DataFrames processados: bulk_frame(n)."""
+    return _bulk_frame
+
+
+@pytest.fixture
+def dead_node() -> dict:
+    """Nó em uma porta sem servidor."""
+    return _dead_node()
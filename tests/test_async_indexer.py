@@ -0,0 +1,110 @@
+"""
+Testes do pipeline assíncrono de indexação, contra um servidor HTTP local.
+
+Run with: python -m pytest tests/test_async_indexer.py -v
+"""
+
+import asyncio
+import json
+
+import pandas as pd
+import typesense
+from aiohttp import web
+
+from typesense_dgb.async_indexer import index_documents_async
+from typesense_dgb.dataset import process_dataframe
+
+
+def _frame(n: int) -> pd.DataFrame:
+    raw = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(n)],
+            "title": ["falha" if i == 3 else f"t{i}" for i in range(n)],
+            "published_at": ["2024-01-01T10:00:00-03:00"] * n,
+            "extracted_at": [None] * n,
+        }
+    )
+    return process_dataframe(raw)
+
+
+def _fake_typesense(store: dict, existing: int = 0) -> web.Application:
+    """Aplicação aiohttp que imita os endpoints usados pelo indexador."""
+
+    async def retrieve(request):
+        return web.json_response(
+            {"name": "news", "num_documents": existing + len(store), "fields": []}
+        )
+
+    async def import_(request):
+        assert request.headers["X-TYPESENSE-API-KEY"] == "key"
+        assert request.query["action"] == "upsert"
+        lines = []
+        for line in (await request.text()).splitlines():
+            doc = json.loads(line)
+            if doc.get("title") == "falha":
+                lines.append(json.dumps({"success": False, "error": "invalid"}))
+            else:
+                store[doc["id"]] = doc
+                lines.append(json.dumps({"success": True}))
+        return web.Response(text="\n".join(lines))
+
+    app = web.Application()
+    app.router.add_get("/collections/news", retrieve)
+    app.router.add_post("/collections/news/documents/import", import_)
+    return app
+
+
+async def _run(df, existing: int = 0, extra_nodes: list | None = None, **kwargs):
+    store: dict = {}
+    runner = web.AppRunner(_fake_typesense(store, existing))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    client = typesense.Client(
+        {
+            "nodes": (extra_nodes or [])
+            + [{"host": "127.0.0.1", "port": port, "protocol": "http"}],
+            "api_key": "key",
+            "retry_interval_seconds": 0,
+        }
+    )
+    try:
+        stats = await index_documents_async(client, df, **kwargs)
+    finally:
+        await runner.cleanup()
+    return stats, store
+
+
+class TestIndexDocumentsAsync:
+    """Tests for index_documents_async."""
+
+    def test_indexes_all_chunks(self):
+        """Chunks são preparados, serializados e importados com contagem exata."""
+        frame = _frame(530)
+        chunks = [frame.iloc[i : i + 100] for i in range(0, 530, 100)]
+        stats, store = asyncio.run(
+            _run(chunks, batch_size=50, concurrency=3, queue_size=1)
+        )
+        assert stats["total_processed"] == 530
+        assert stats["total_indexed"] == 480
+        assert stats["errors"] == 1
+        assert len(store) == 529
+        assert stats["batches"] == 11
+        assert stats["documents_sent"] == 530
+        assert stats["bytes_sent"] >= stats["max_batch_bytes"] > 0
+        assert len(stats["batch_latencies"]) == 11
+
+    def test_fails_over_to_next_node(self, dead_node):
+        """Com o primeiro nó fora do ar, as requisições seguem para o próximo."""
+        stats, store = asyncio.run(
+            _run(_frame(20), extra_nodes=[dead_node], batch_size=5, concurrency=2)
+        )
+        assert stats["batches"] == 4
+        assert len(store) == 19
+
+    def test_skips_full_mode_on_non_empty_collection(self):
+        """Mesmo comportamento de index_documents sem --force."""
+        stats, store = asyncio.run(_run(_frame(10), existing=5))
+        assert stats["skipped"] is True
+        assert store == {}
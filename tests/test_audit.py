@@ -0,0 +1,65 @@
+"""
+Testes da auditoria de memória do schema.
+
+Run with: python -m pytest tests/test_audit.py -v
+"""
+
+import pandas as pd
+
+from typesense_dgb.audit import audit_schema, format_audit
+from typesense_dgb.dataset import process_dataframe
+
+
+def _sample_frame(n: int = 400) -> pd.DataFrame:
+    raw = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(n)],
+            "agency": [f"agencia{i % 5}" for i in range(n)],
+            "title": [f"Título da matéria {i}" for i in range(n)],
+            "url": [f"https://www.gov.br/noticia/{i}" for i in range(n)],
+            "content": ["texto " * 200] * n,
+            "category": [f"categoria única {i}" for i in range(n)],
+            "published_at": ["2024-01-01T10:00:00-03:00"] * n,
+            "extracted_at": ["2024-01-02T10:00:00-03:00"] * n,
+        }
+    )
+    return process_dataframe(raw)
+
+
+def _lean_field(audit: dict, name: str) -> dict:
+    return next(f for f in audit["lean_schema"]["fields"] if f["name"] == name)
+
+
+class TestAuditSchema:
+    """Tests for audit_schema."""
+
+    def test_flags_wasteful_settings(self):
+        """unique_id, facet quase único e campos não buscados saem do índice."""
+        audit = audit_schema(_sample_frame(), documents=100_000)
+
+        assert _lean_field(audit, "unique_id") == {
+            "name": "unique_id",
+            "type": "string",
+            "facet": False,
+            "sort": False,
+            "index": False,
+            "optional": True,
+        }
+        assert _lean_field(audit, "category")["index"] is False
+        assert _lean_field(audit, "url")["index"] is False
+        assert "index" not in _lean_field(audit, "title")
+        assert _lean_field(audit, "agency")["facet"] is True
+        assert audit["lean_schema"]["default_sorting_field"] == "published_at"
+        assert any("quase único" in finding for finding in audit["findings"])
+        assert audit["lean_ram_bytes"] < audit["ram_bytes"]
+
+    def test_content_dominates_and_scales(self):
+        """O texto buscado é o maior custo e cresce com o número de documentos."""
+        frame = _sample_frame()
+        small = audit_schema(frame, documents=400)
+        large = audit_schema(frame, documents=4000)
+
+        ram = {f["name"]: f["ram"]["total"] for f in small["fields"]}
+        assert max(ram, key=ram.get) == "content"
+        assert large["ram_bytes"] > 9 * small["ram_bytes"]
+        assert "unique_id" in format_audit(small)
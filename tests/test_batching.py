@@ -0,0 +1,60 @@
+"""
+Testes do dimensionamento adaptativo de batches.
+
+Run with: python -m pytest tests/test_batching.py -v
+"""
+
+import pytest
+
+from typesense_dgb.batching import AdaptiveBatcher
+
+
+class TestAdaptiveBatcher:
+    """Tests for AdaptiveBatcher."""
+
+    def test_additive_increase_on_fast_imports(self):
+        """Importações abaixo do alvo aumentam o orçamento de forma aditiva."""
+        batcher = AdaptiveBatcher(
+            batch_bytes=1000, min_bytes=100, max_bytes=10000, increase_bytes=500
+        )
+        batcher.record(0.1)
+        batcher.record(0.1)
+        assert batcher.budget == 2000
+
+    def test_multiplicative_decrease_on_slow_imports(self):
+        """Importações acima do alvo reduzem o orçamento pela metade."""
+        batcher = AdaptiveBatcher(
+            batch_bytes=8000, min_bytes=100, max_bytes=10000, target_latency=1.0
+        )
+        batcher.record(2.5)
+        assert batcher.budget == 4000
+        batcher.record_timeout()
+        assert batcher.budget == 2000
+
+    def test_budget_respects_bounds(self):
+        """O orçamento nunca sai do intervalo [min_bytes, max_bytes]."""
+        batcher = AdaptiveBatcher(batch_bytes=900, min_bytes=500, max_bytes=1000)
+        for _ in range(5):
+            batcher.record(0.0)
+        assert batcher.budget == 1000
+        for _ in range(10):
+            batcher.record_timeout()
+        assert batcher.budget == 500
+
+    def test_initial_budget_is_clamped(self):
+        """Orçamento inicial fora dos limites é ajustado."""
+        assert AdaptiveBatcher(batch_bytes=1, min_bytes=10, max_bytes=20).budget == 10
+
+    def test_is_full(self):
+        """Batch fecha pelo orçamento de bytes ou pelo limite de documentos."""
+        batcher = AdaptiveBatcher(
+            batch_bytes=1000, min_bytes=100, max_bytes=2000, max_documents=3
+        )
+        assert not batcher.is_full(999, 1)
+        assert batcher.is_full(1000, 1)
+        assert batcher.is_full(10, 3)
+
+    def test_invalid_bounds(self):
+        """Limites inconsistentes são rejeitados."""
+        with pytest.raises(ValueError):
+            AdaptiveBatcher(min_bytes=10, max_bytes=5)
@@ -0,0 +1,81 @@
+"""
+Testes do checkpoint de cargas completas.
+
+Run with: python -m pytest tests/test_checkpoint.py -v
+"""
+
+import pytest
+
+from typesense_dgb.checkpoint import Checkpoint
+from typesense_dgb.indexer import index_documents
+
+
+def _result(indexed: int) -> dict:
+    return {"batches": 1, "documents_sent": indexed, "total_indexed": indexed}
+
+
+class TestCheckpoint:
+    """Tests for Checkpoint."""
+
+    def test_advances_only_contiguous_prefix(self, tmp_path):
+        """Batches confirmados fora de ordem só avançam após os anteriores."""
+        checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+        checkpoint.acknowledge(1, 199, _result(100))
+        assert checkpoint.rows_done == 0
+
+        checkpoint.acknowledge(0, 99, _result(100))
+        assert checkpoint.rows_done == 200
+        assert checkpoint.state["stats"]["total_indexed"] == 200
+
+    def test_save_and_load(self, tmp_path):
+        """O estado gravado é recuperado por Checkpoint.load."""
+        path = str(tmp_path / "checkpoint.json")
+        assert Checkpoint.load(path) is None
+
+        checkpoint = Checkpoint(path, "org/dataset", "abc123", "news")
+        checkpoint.acknowledge(0, 49, _result(50))
+        checkpoint.complete()
+
+        loaded = Checkpoint.load(path)
+        assert loaded.revision == "abc123"
+        assert loaded.rows_done == 50
+        assert loaded.completed
+        assert not (tmp_path / "checkpoint.json.tmp").exists()
+
+
+class TestResume:
+    """Tests for index_documents with checkpoint."""
+
+    def test_resume_skips_confirmed_batches(self, tmp_path, fake_client, bulk_frame):
+        """Após uma falha, a retomada envia apenas as linhas não confirmadas."""
+        path = str(tmp_path / "checkpoint.json")
+        frame = bulk_frame(500)
+
+        client = fake_client()
+        import_ = client.documents.import_
+        calls = []
+
+        def flaky_import(documents, params=None):
+            calls.append(1)
+            if len(calls) == 4:
+                raise ConnectionError("queda simulada")
+            return import_(documents, params)
+
+        client.documents.import_ = flaky_import
+        with pytest.raises(ConnectionError):
+            index_documents(client, frame, batch_size=100, checkpoint=Checkpoint(path))
+
+        checkpoint = Checkpoint.load(path)
+        assert checkpoint.rows_done == 300
+        assert not checkpoint.completed
+
+        resumed = fake_client()
+        stats = index_documents(resumed, frame, batch_size=100, checkpoint=checkpoint)
+        assert stats["total_processed"] == 200
+        assert set(resumed.store) == {f"id{i}" for i in range(300, 500)}
+
+        final = Checkpoint.load(path)
+        assert final.completed
+        assert final.rows_done == 500
+        assert final.state["stats"]["documents_sent"] == 500
+        assert final.state["stats"]["errors"] == 1
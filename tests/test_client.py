@@ -0,0 +1,174 @@
+"""
+Testes da sessão HTTP compartilhada do cliente.
+
+Run with: python -m pytest tests/test_client.py -v
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import typesense.api_call
+
+from typesense_dgb import client as client_module
+from typesense_dgb.client import (
+    configure_session,
+    get_client,
+    get_session,
+    leader_client,
+    parse_nodes,
+    resolve_nodes,
+    split_timeout,
+    wait_for_typesense,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.peers.add(self.client_address)
+        self.server.hits += 1
+        status, payload = 200, {"name": "news", "num_documents": 0, "fields": []}
+        if self.path == "/health":
+            status, payload = self.server.health, {"ok": self.server.health == 200}
+        elif self.path == "/debug":
+            payload = {"state": self.server.state}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server(state: int = 4, health: int = 200) -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.peers = set()
+    httpd.hits = 0
+    httpd.state = state
+    httpd.health = health
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _node(httpd: ThreadingHTTPServer) -> dict:
+    return {"host": "127.0.0.1", "port": str(httpd.server_address[1]), "protocol": "http"}
+
+
+@pytest.fixture
+def server():
+    httpd = _start_server()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cluster():
+    """Três nós: o segundo é o líder do Raft."""
+    servers = [_start_server(state) for state in (4, 1, 4)]
+    yield servers
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+class TestSharedSession:
+    """Tests for the pooled session used by the typesense client."""
+
+    def test_client_reuses_one_connection(self, server):
+        """Requisições sequenciais reaproveitam a mesma conexão TCP."""
+        client = get_client(host="127.0.0.1", port=str(server.server_address[1]), api_key="k")
+        for _ in range(5):
+            client.collections["news"].retrieve()
+
+        assert typesense.api_call.session is get_session()
+        assert len(server.peers) == 1
+
+    def test_timeouts_and_retries(self):
+        client = get_client(api_key="k", timeout=60, connect_timeout=2)
+        assert split_timeout(client.config.connection_timeout_seconds) == (2.0, 60.0)
+        assert split_timeout(10) == (10.0, 10.0)
+
+        # Uma única camada de retentativas: a do cliente typesense
+        retry = get_session().get_adapter("http://localhost").max_retries
+        assert retry.total == 0
+        assert client.config.num_retries == client_module.DEFAULT_RETRIES
+        assert client.config.retry_interval_seconds == client_module.DEFAULT_RETRY_INTERVAL
+
+    def test_server_error_is_retried_once_per_attempt(self, server):
+        """Um 503 é repetido só pelo cliente, num_retries vezes."""
+        server.health = 503
+        client = get_client(host="127.0.0.1", port=str(server.server_address[1]), api_key="k")
+        client.config.retry_interval_seconds = 0
+        with pytest.raises(typesense.exceptions.ServiceUnavailable):
+            client.api_call.get("/health")
+
+        assert server.hits == client_module.DEFAULT_RETRIES + 1
+
+    def test_pool_grows_with_concurrency(self):
+        """Pedir um pool maior substitui a sessão; pedir um menor a mantém."""
+        session = get_session()
+        assert get_session(pool_size=4) is session
+
+        larger = get_session(pool_size=client_module.DEFAULT_POOL_SIZE + 8)
+        assert larger is not session
+        assert larger.get_adapter("http://x")._pool_maxsize == client_module.DEFAULT_POOL_SIZE + 8
+
+
+class TestCluster:
+    """Tests for multi-node configuration, failover and leader-pinned writes."""
+
+    def test_nodes_from_env(self, monkeypatch):
+        monkeypatch.setenv("TYPESENSE_NODES", "http://ts1:8108, ts2:8108,https://ts3")
+        nodes = resolve_nodes()
+
+        assert [(n["host"], n["port"], n["protocol"]) for n in nodes] == [
+            ("ts1", "8108", "http"),
+            ("ts2", "8108", "http"),
+            ("ts3", "443", "https"),
+        ]
+        # Host explícito continua apontando para um servidor único
+        assert resolve_nodes(host="other") == [
+            {"host": "other", "port": "8108", "protocol": "http"}
+        ]
+        with pytest.raises(ValueError):
+            parse_nodes("http://:8108")
+
+    def test_reads_fail_over_to_healthy_node(self, cluster, dead_node):
+        """Um nó fora do ar é pulado e os demais dividem as leituras."""
+        configure_session()
+        client = get_client(api_key="k", nodes=[dead_node] + [_node(s) for s in cluster])
+        assert client.config.num_retries >= 4
+
+        for _ in range(6):
+            client.collections["news"].retrieve()
+
+        assert all(httpd.peers for httpd in cluster)
+
+    def test_wait_orders_healthy_nodes_and_pins_leader(self, cluster, caplog, dead_node):
+        syncing = _start_server(health=503)
+        try:
+            nodes = [dead_node, _node(syncing)] + [_node(s) for s in cluster]
+            client = wait_for_typesense(api_key="k", nodes=nodes, max_retries=1)
+        finally:
+            syncing.shutdown()
+            syncing.server_close()
+
+        urls = [node.port for node in client.config.nodes]
+        assert urls[:3] == [str(s.server_address[1]) for s in cluster]
+        assert "indisponível" in caplog.text
+
+        writer = leader_client(client)
+        assert [node.port for node in writer.config.nodes] == [
+            str(cluster[1].server_address[1])
+        ]
+
+    def test_single_node_is_its_own_leader(self, server):
+        client = get_client(host="127.0.0.1", port=str(server.server_address[1]), api_key="k")
+        assert leader_client(client) is client
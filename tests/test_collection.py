@@ -0,0 +1,56 @@
+"""
+Testes dos perfis de schema da coleção.
+
+Run with: python -m pytest tests/test_collection.py -v
+"""
+
+import pytest
+
+from typesense_dgb.collection import (
+    COLLECTION_SCHEMA,
+    SCHEMA_PROFILES,
+    build_schema,
+)
+from typesense_dgb.migration import diff_schema
+
+
+def _fields(schema: dict) -> dict:
+    return {field["name"]: field for field in schema["fields"]}
+
+
+class TestBuildSchema:
+    """Tests for build_schema."""
+
+    def test_full_profile_is_collection_schema(self):
+        assert build_schema("full") == COLLECTION_SCHEMA
+
+    def test_lean_profile_roles(self):
+        """Campos armazenados saem do índice; campos de busca perdem facet e sort."""
+        fields = _fields(build_schema("lean"))
+
+        assert fields["url"] == {
+            "name": "url",
+            "type": "string",
+            "facet": False,
+            "optional": True,
+            "index": False,
+        }
+        assert fields["theme_1_level_1_code"]["index"] is False
+        assert fields["unique_id"]["facet"] is False
+        assert fields["unique_id"]["sort"] is False
+        assert fields["unique_id"].get("index", True) is True
+        assert fields["theme_1_level_1_label"] == _fields(COLLECTION_SCHEMA)[
+            "theme_1_level_1_label"
+        ]
+        # O schema base não é alterado
+        assert _fields(COLLECTION_SCHEMA)["url"].get("index", True) is True
+
+    def test_lean_profile_migrates_only_profile_fields(self):
+        """Trocar de perfil no lugar altera só os campos declarados no perfil."""
+        diff = diff_schema(COLLECTION_SCHEMA, build_schema("lean"))
+        assert {f["name"] for f in diff["changed"]} == set(SCHEMA_PROFILES["lean"])
+        assert diff["added"] == diff["dropped"] == diff["unsupported"] == []
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError, match="desconhecido"):
+            build_schema("tiny")
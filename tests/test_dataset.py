@@ -0,0 +1,232 @@
+"""
+Testes da leitura do dataset: projeção de colunas e leitura em chunks.
+
+Run with: python -m pytest tests/test_dataset.py -v
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import datasets
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+import pytest
+
+from typesense_dgb import dataset as dataset_module
+from typesense_dgb.dataset import (
+    SOURCE_COLUMNS,
+    _cutoff_expression,
+    download_and_process_dataset,
+    iter_dataset_chunks,
+    source_columns,
+)
+from typesense_dgb.indexer import prepare_documents
+
+
+def _write_recent_parquet(path) -> None:
+    """Grava um Parquet local com duas matérias recentes e uma antiga."""
+    now = datetime.now(timezone.utc)
+    table = pa.table(
+        {
+            "unique_id": ["a", "b", "c"],
+            "title": ["t1", "t2", "t3"],
+            "content": ["texto longo"] * 3,
+            "tags": [["saúde"], ["educação"], []],
+            "published_at": [
+                (now - timedelta(days=1)).isoformat(),
+                (now - timedelta(days=2)).isoformat(),
+                (now - timedelta(days=60)).isoformat(),
+            ],
+            "extracted_at": [now.isoformat()] * 3,
+        }
+    )
+    pq.write_table(table, path / "train-00000.parquet")
+
+
+@pytest.fixture
+def local_dataset(tmp_path, monkeypatch):
+    """
+    Diretório com um Parquet de 7 matérias, lido via load_dataset.
+
+    As linhas 1 e 5 não têm unique_id; o cache do datasets fica em tmp_path.
+    """
+    monkeypatch.setattr(datasets.config, "HF_DATASETS_CACHE", str(tmp_path / "cache"))
+    path = tmp_path / "data"
+    path.mkdir()
+    table = pa.table(
+        {
+            "unique_id": ["a", None, "c", "d", "e", None, "g"],
+            "title": [f"t{i}" for i in range(7)],
+            "published_at": [f"2024-01-0{i + 1}T10:00:00-03:00" for i in range(7)],
+            "extracted_at": [None] * 7,
+        }
+    )
+    pq.write_table(table, path / "train-00000.parquet")
+    return str(path)
+
+
+@pytest.fixture
+def recent_dataset(tmp_path, monkeypatch):
+    """
+    Parquet com row groups de 2 linhas, alternando matérias antigas e recentes.
+
+    Linhas 0, 1 e 4 são antigas (o primeiro row group inteiro fica de fora
+    do scan); as linhas 3 e 5, recentes, não têm unique_id.
+    """
+    monkeypatch.setattr(datasets.config, "HF_DATASETS_CACHE", str(tmp_path / "cache"))
+    path = tmp_path / "recent"
+    path.mkdir()
+    now = datetime.now(timezone.utc)
+    ages = [60, 50, 1, 2, 40, 3]
+    table = pa.table(
+        {
+            "unique_id": ["a", "b", "c", None, "e", None],
+            "title": [f"t{i}" for i in range(6)],
+            "published_at": [(now - timedelta(days=age)).isoformat() for age in ages],
+            "extracted_at": [None] * 6,
+        }
+    )
+    pq.write_table(table, path / "train-00000.parquet", row_group_size=2)
+    return str(path)
+
+
+class TestSourceColumns:
+    """Tests for source_columns."""
+
+    def test_defaults_to_all_source_columns(self):
+        assert source_columns() == SOURCE_COLUMNS
+
+    def test_derived_fields_only_need_dates(self):
+        """Campos derivados não exigem colunas além de id e datas."""
+        assert source_columns(["published_week", "tags"]) == [
+            "unique_id",
+            "published_at",
+            "extracted_at",
+            "tags",
+        ]
+
+
+class TestFieldProjection:
+    """Tests for reading only the columns of the requested fields."""
+
+    def test_incremental_read_skips_unused_columns(self, tmp_path):
+        """Com fields, title e content não são lidos do Parquet."""
+        _write_recent_parquet(tmp_path)
+        df = download_and_process_dataset(
+            mode="incremental", days=7, dataset_path=str(tmp_path), fields=["tags"]
+        )
+
+        assert sorted(df["unique_id"]) == ["a", "b"]
+        assert "tags" in df.columns
+        assert "title" not in df.columns
+        assert "content" not in df.columns
+
+
+class TestIterDatasetChunks:
+    """Tests for iter_dataset_chunks on a local Parquet dataset."""
+
+    def test_chunk_boundaries(self, local_dataset):
+        chunks = list(iter_dataset_chunks(dataset_path=local_dataset, chunk_size=3))
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert [title for chunk in chunks for title in chunk["title"]] == [
+            f"t{i}" for i in range(7)
+        ]
+
+    def test_global_index_and_fallback_ids(self, local_dataset):
+        """O índice continua entre chunks, e os ids doc_<n> usam a posição global."""
+        chunks = list(iter_dataset_chunks(dataset_path=local_dataset, chunk_size=2))
+
+        assert [list(chunk.index) for chunk in chunks] == [[0, 1], [2, 3], [4, 5], [6]]
+        ids = [doc["id"] for chunk in chunks for doc in prepare_documents(chunk)]
+        assert ids == ["a", "doc_1", "c", "d", "e", "doc_5", "g"]
+
+    def test_start_row_resumes_at_position(self, local_dataset):
+        chunks = list(
+            iter_dataset_chunks(dataset_path=local_dataset, chunk_size=2, start_row=4)
+        )
+        assert [list(chunk.index) for chunk in chunks] == [[4, 5], [6]]
+        assert prepare_documents(chunks[0])[1]["id"] == "doc_5"
+
+    def test_limit_caps_rows(self, local_dataset):
+        chunks = list(iter_dataset_chunks(dataset_path=local_dataset, chunk_size=2, limit=3))
+        assert [list(chunk.index) for chunk in chunks] == [[0, 1], [2]]
+
+    def test_start_row_requires_full_mode(self, local_dataset):
+        with pytest.raises(ValueError, match="start_row"):
+            next(
+                iter_dataset_chunks(
+                    mode="incremental", dataset_path=local_dataset, start_row=2
+                )
+            )
+
+
+class TestCutoffPushdown:
+    """Tests for the date predicate pushed down to the Parquet scan."""
+
+    CUTOFF = datetime(2024, 6, 10, 12, 0, tzinfo=timezone(timedelta(hours=-3)))
+
+    def _kept(self, values, field_type) -> list:
+        table = pa.table({"published_at": pa.array(values, type=field_type)})
+        expression = _cutoff_expression(field_type, self.CUTOFF)
+        return pads.dataset(table).to_table(filter=expression)["published_at"].to_pylist()
+
+    def test_naive_timestamp_compares_in_utc(self):
+        """Timestamps sem fuso são UTC: o corte das 12h em UTC-3 vira 15h."""
+        values = [datetime(2024, 6, 10, 14, 59), datetime(2024, 6, 10, 15, 0)]
+        assert self._kept(values, pa.timestamp("us")) == values[1:]
+
+    def test_timestamp_with_timezone(self):
+        values = [
+            datetime(2024, 6, 10, 14, 59, tzinfo=timezone.utc),
+            datetime(2024, 6, 10, 15, 0, tzinfo=timezone.utc),
+        ]
+        assert self._kept(values, pa.timestamp("us", tz="UTC")) == values[1:]
+
+    def test_date_and_string_keep_one_day_margin(self):
+        """Datas e strings ISO são comparadas pela data, com um dia de folga."""
+        dates = [date(2024, 6, 8), date(2024, 6, 9), date(2024, 6, 10)]
+        assert self._kept(dates, pa.date32()) == dates[1:]
+
+        strings = ["2024-06-08T23:00:00-03:00", "2024-06-09T00:00:00-03:00"]
+        assert self._kept(strings, pa.string()) == strings[1:]
+
+    def test_unsupported_type_has_no_predicate(self):
+        assert _cutoff_expression(pa.int64(), self.CUTOFF) is None
+
+
+class TestRecentScan:
+    """Tests for the incremental read with pushdown and its load_dataset fallback."""
+
+    def test_pushdown_keeps_original_row_positions(self, recent_dataset):
+        """O índice é a posição da linha no dataset, como sem pushdown."""
+        df = download_and_process_dataset(
+            mode="incremental", days=7, dataset_path=recent_dataset
+        )
+
+        assert list(df.index) == [2, 3, 5]
+        assert [doc["id"] for doc in prepare_documents(df)] == ["c", "doc_3", "doc_5"]
+
+    def test_streaming_pushdown_keeps_original_row_positions(self, recent_dataset):
+        chunks = list(
+            iter_dataset_chunks(
+                mode="incremental", days=7, dataset_path=recent_dataset, chunk_size=1
+            )
+        )
+        assert [list(chunk.index) for chunk in chunks] == [[2], [3], [5]]
+
+    def test_fallback_to_load_dataset_matches_pushdown(self, recent_dataset, monkeypatch):
+        """Se o scan falhar, load_dataset lê os mesmos registros com os mesmos ids."""
+        pushed = download_and_process_dataset(
+            mode="incremental", days=7, dataset_path=recent_dataset
+        )
+
+        def broken_scan(*args, **kwargs):
+            raise OSError("sem acesso aos arquivos Parquet")
+
+        monkeypatch.setattr(dataset_module, "_scan_recent", broken_scan)
+        fallback = download_and_process_dataset(
+            mode="incremental", days=7, dataset_path=recent_dataset
+        )
+
+        assert list(fallback.index) == list(pushed.index)
+        assert prepare_documents(fallback) == prepare_documents(pushed)
@@ -0,0 +1,54 @@
+"""
+Testes do custo de importação do pacote.
+
+Run with: python -m pytest tests/test_imports.py -v
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import typesense_dgb
+
+# Dependências da carga de dados que não podem ser importadas por quem só busca
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "datasets", "huggingface_hub", "aiohttp")
+
+# Orçamento para importar o cliente e os módulos de busca/administração, em segundos
+IMPORT_BUDGET = 1.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import typesense_dgb
+from typesense_dgb import COLLECTION_NAME, create_collection, get_client, wait_for_typesense
+import typesense_dgb.retention, typesense_dgb.search
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+class TestLazyImports:
+    """Tests for the lazy public API."""
+
+    def test_search_path_skips_heavy_dependencies(self):
+        probe = _probe()
+        loaded = [name for name in HEAVY_MODULES if name in probe["modules"]]
+
+        assert loaded == []
+        assert probe["elapsed"] < IMPORT_BUDGET
+
+    def test_public_names_resolve(self):
+        for name in typesense_dgb.__all__:
+            assert callable(getattr(typesense_dgb, name)) or name.isupper()
+        assert set(typesense_dgb.__all__) <= set(dir(typesense_dgb))
+        with pytest.raises(AttributeError):
+            typesense_dgb.missing_name
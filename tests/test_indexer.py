@@ -0,0 +1,252 @@
+"""
+Testes da preparação de documentos para o Typesense.
+
+Run with: python -m pytest tests/test_indexer.py -v
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from typesense_dgb.batching import AdaptiveBatcher
+from typesense_dgb.client import get_client
+from typesense_dgb.dataset import process_dataframe
+from typesense_dgb.indexer import (
+    BATCH_LATENCY_WINDOW,
+    FIELD_PLAN,
+    index_documents,
+    prepare_document,
+    prepare_documents,
+)
+from typesense_dgb.manifest import DocumentManifest
+
+
+class _SlowImportHandler(BaseHTTPRequestHandler):
+    """Typesense mínimo cujas importações acima de slow_above_bytes demoram 1s."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply(json.dumps({"name": "news", "num_documents": 0, "fields": []}).encode())
+
+    def do_POST(self):
+        payload = self.rfile.read(int(self.headers["Content-Length"]))
+        if len(payload) > self.server.slow_above_bytes:
+            self.server.slow_payloads.append(payload)
+            time.sleep(1)
+        self._reply(b"\n".join(b'{"success":true}' for _ in payload.splitlines()))
+
+    def _reply(self, body: bytes):
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowImportHandler)
+    httpd.slow_above_bytes = 3000
+    httpd.slow_payloads = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _sample_frame() -> pd.DataFrame:
+    """DataFrame processado cobrindo nulos, vazios, tags e timestamps inválidos."""
+    raw = pd.DataFrame(
+        {
+            "unique_id": ["a1", None, "a3", "a4"],
+            "agency": ["  mec  ", None, "   ", "saude"],
+            "title": ["Título", "Outro", None, ""],
+            "url": ["http://x/1", None, None, None],
+            "content": ["texto", "corpo", "x", None],
+            "theme_1_level_1_code": ["01", None, "02", None],
+            "published_at": [
+                "2024-01-01T10:00:00-03:00",
+                None,
+                "2025-10-23T12:00:00-03:00",
+                "2024-12-30T00:00:00-03:00",
+            ],
+            "extracted_at": [
+                "2024-01-02T10:00:00-03:00",
+                "2024-01-02T10:00:00-03:00",
+                None,
+                None,
+            ],
+            "tags": [
+                np.array(["saúde", "  vacina ", ""]),
+                None,
+                ["x" * 200, "ok"],
+                [],
+            ],
+        },
+        index=[10, 11, 12, 13],
+    )
+    return process_dataframe(raw)
+
+
+class TestPrepareDocuments:
+    """Tests for prepare_documents (vetorizado) contra prepare_document."""
+
+    def test_equivalent_to_row_by_row(self):
+        """O builder em batch gera exatamente os mesmos documentos."""
+        frame = _sample_frame()
+        expected = [prepare_document(row) for _, row in frame.iterrows()]
+        assert prepare_documents(frame) == expected
+
+    def test_missing_unique_id_uses_index_label(self):
+        """Linhas sem unique_id usam o rótulo do índice como fallback."""
+        docs = prepare_documents(_sample_frame())
+        assert docs[1]["id"] == "doc_11"
+        assert docs[1]["published_at"] == 0
+
+    def test_strings_are_stripped_and_empty_dropped(self):
+        """Strings são normalizadas e campos vazios omitidos."""
+        docs = prepare_documents(_sample_frame())
+        assert docs[0]["agency"] == "mec"
+        assert "agency" not in docs[2]
+        assert "title" not in docs[3]
+
+    def test_tags_are_cleaned(self):
+        """Tags vazias ou muito longas são descartadas."""
+        docs = prepare_documents(_sample_frame())
+        assert docs[0]["tags"] == ["saúde", "vacina"]
+        assert docs[2]["tags"] == ["ok"]
+        assert "tags" not in docs[3]
+
+    def test_values_are_json_native(self):
+        """Valores numéricos são int Python, serializáveis sem conversão."""
+        for doc in prepare_documents(_sample_frame()):
+            for value in doc.values():
+                assert not isinstance(value, np.generic)
+
+    def test_accepts_arrow_table(self):
+        """Aceita tabela Arrow com as mesmas colunas do DataFrame."""
+        frame = _sample_frame().reset_index(drop=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        assert prepare_documents(table) == prepare_documents(frame)
+
+    def test_plan_covers_schema_fields(self):
+        """O plano compilado inclui todos os campos opcionais do schema."""
+        names = {name for name, _, _ in FIELD_PLAN}
+        assert {"agency", "extracted_at", "published_week", "tags"} <= names
+        assert "unique_id" not in names
+
+
+class TestIndexDocuments:
+    """Tests for index_documents."""
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_stats_are_exact(self, concurrency, fake_client, bulk_frame):
+        """Contagens idênticas com importação síncrona ou concorrente."""
+        client = fake_client(delay=0.01)
+        stats = index_documents(
+            client, bulk_frame(950), batch_size=100, concurrency=concurrency
+        )
+        assert stats["total_processed"] == 950
+        # O batch com o documento rejeitado não conta como indexado
+        assert stats["total_indexed"] == 850
+        assert stats["errors"] == 1
+        assert len(client.store) == 949
+
+    def test_concurrency_is_bounded(self, fake_client, bulk_frame):
+        """Nunca há mais batches em voo que o limite configurado."""
+        client = fake_client(delay=0.02)
+        index_documents(client, bulk_frame(1000), batch_size=50, concurrency=3)
+        assert 1 < client.documents.max_active <= 3
+
+    def test_adaptive_batches_report_sizes_and_latencies(self, fake_client, bulk_frame):
+        """Com batcher, os batches respeitam o orçamento e aparecem em stats."""
+        client = fake_client()
+        batcher = AdaptiveBatcher(batch_bytes=2000, min_bytes=1000, max_bytes=4000)
+        stats = index_documents(client, bulk_frame(300), batcher=batcher)
+        assert stats["total_processed"] == 300
+        assert stats["documents_sent"] == 300
+        assert len(stats["batch_latencies"]) == stats["batches"]
+        assert stats["batch_latencies"].maxlen == BATCH_LATENCY_WINDOW
+        assert stats["max_batch_bytes"] < 4000 + 200
+        assert len(client.store) == 299
+
+    def test_timeout_splits_batch(self, fake_client, bulk_frame):
+        """Batch que estoura o timeout é reenviado em metades menores."""
+        client = fake_client()
+        client.documents.timeout_above_bytes = 3000
+        batcher = AdaptiveBatcher(batch_bytes=8000, min_bytes=1000, max_bytes=8000)
+        stats = index_documents(client, bulk_frame(200), batcher=batcher)
+        assert len(client.store) == 199
+        assert stats["errors"] == 1
+        assert stats["max_batch_bytes"] <= 3000
+        assert batcher.budget < 8000
+
+    def test_timeout_splits_on_first_attempt(self, slow_server, bulk_frame):
+        """Com um cliente real, o batch lento é dividido sem ser repetido inteiro."""
+        client = get_client(
+            host="127.0.0.1", port=str(slow_server.server_address[1]), api_key="k", timeout=0.3
+        )
+        batcher = AdaptiveBatcher(batch_bytes=8000, min_bytes=1000, max_bytes=8000)
+        start = time.perf_counter()
+        stats = index_documents(client, bulk_frame(200), batcher=batcher)
+
+        assert stats["total_indexed"] == 200
+        assert stats["max_batch_bytes"] <= slow_server.slow_above_bytes
+        # Cada payload lento chegou uma única vez: nenhuma retentativa do cliente
+        assert slow_server.slow_payloads
+        assert len(set(slow_server.slow_payloads)) == len(slow_server.slow_payloads)
+        assert time.perf_counter() - start < 0.3 * (len(slow_server.slow_payloads) + 1) + 1
+        assert client.config.num_retries > 0
+
+    def test_manifest_skips_unchanged_documents(self, tmp_path, fake_client, bulk_frame):
+        """Segunda carga envia apenas os documentos alterados."""
+        manifest = DocumentManifest(str(tmp_path / "manifest.db"))
+        frame = bulk_frame(300)
+        index_documents(fake_client(), frame, batch_size=100, manifest=manifest)
+        # O batch com o documento rejeitado não entra no manifesto
+        assert len(manifest) == 200
+
+        changed = frame.copy()
+        changed.loc[changed["unique_id"] == "id250", "title"] = "novo título"
+        client = fake_client()
+        stats = index_documents(client, changed, batch_size=100, manifest=manifest)
+        assert stats["unchanged"] == 199
+        assert set(client.store) == {f"id{i}" for i in range(100)} - {"id7"} | {"id250"}
+
+    def test_accepts_chunk_iterable(self, fake_client, bulk_frame):
+        """Chunks de um iterável são indexados como um único fluxo."""
+        frame = bulk_frame(250)
+        chunks = (frame.iloc[i : i + 60] for i in range(0, 250, 60))
+        client = fake_client()
+        stats = index_documents(client, chunks, batch_size=100)
+        assert stats["total_processed"] == 250
+        assert len(client.store) == 249
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_process_pool_matches_single_process(self, ordered, fake_client, bulk_frame):
+        """Preparação em processos gera os mesmos documentos e contagens."""
+        frame = bulk_frame(900)
+        expected = fake_client()
+        index_documents(expected, frame, batch_size=100)
+
+        client = fake_client()
+        chunks = (frame.iloc[i : i + 200] for i in range(0, 900, 200))
+        stats = index_documents(
+            client, chunks, batch_size=100, workers=2, ordered=ordered
+        )
+        assert stats["total_processed"] == 900
+        assert stats["errors"] == 1
+        assert client.store == expected.store
@@ -0,0 +1,116 @@
+"""
+Testes da serialização JSONL e da leitura da resposta de importação.
+
+Run with: python -m pytest tests/test_jsonl.py -v
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb import jsonl
+from typesense_dgb.client import get_client
+
+DOCUMENTS = [
+    {"id": "a1", "title": "Educação é prioridade", "published_at": 1704110400},
+    {"id": "a2", "tags": ["saúde", 'aspas "duplas"', "barra \\ "], "content": " \x01"},
+]
+
+
+class TestDumpsJsonl:
+    """Tests for dumps_jsonl."""
+
+    def test_round_trip(self):
+        """Cada linha é um documento JSON válido."""
+        payload = jsonl.dumps_jsonl(DOCUMENTS)
+        lines = payload.decode("utf-8").split("\n")
+        assert [json.loads(line) for line in lines] == DOCUMENTS
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        """O fallback sem orjson gera exatamente os mesmos bytes."""
+        if jsonl.orjson is None:
+            pytest.skip("orjson não instalado")
+        fast = jsonl.dumps_jsonl(DOCUMENTS)
+        monkeypatch.setattr(jsonl, "orjson", None)
+        assert jsonl.dumps_jsonl(DOCUMENTS) == fast
+
+
+class TestParseImportResponse:
+    """Tests for parse_import_response."""
+
+    def test_counts_successes_and_keeps_failures(self):
+        """Só as falhas são materializadas."""
+        body = "\n".join(
+            [
+                '{"success":true}',
+                '{"success":false,"error":"Bad JSON.","document":"{}"}',
+                '{"success":true}',
+                "",
+                '{"success": true}',
+            ]
+        )
+        successes, failures = jsonl.parse_import_response(body)
+        assert successes == 3
+        assert failures == [{"success": False, "error": "Bad JSON.", "document": "{}"}]
+
+    def test_empty_body(self):
+        """Resposta vazia não gera sucessos nem falhas."""
+        assert jsonl.parse_import_response("") == (0, [])
+
+
+class _ExportHandler(BaseHTTPRequestHandler):
+    """Export com o corpo enviado em blocos (chunked), como o do Typesense."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if "/collections/missing/" in self.path:
+            body = b'{"message": "Not Found"}'
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for doc in DOCUMENTS:
+            chunk = jsonl.dumps_document(doc) + b"\n"
+            self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def export_node():
+    """Nó local que responde ao export de qualquer coleção."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ExportHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield {"host": "127.0.0.1", "port": str(httpd.server_port), "protocol": "http"}
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestIterExport:
+    """Tests for iter_export."""
+
+    def test_streams_one_document_per_line(self, export_node):
+        client = get_client(api_key="k", nodes=[export_node])
+        lines = list(jsonl.iter_export(client, "news"))
+        assert [json.loads(line) for line in lines] == DOCUMENTS
+
+    def test_skips_unreachable_node(self, export_node, dead_node):
+        """Um nó fora do ar dá lugar ao próximo antes de a leitura começar."""
+        client = get_client(api_key="k", nodes=[dead_node, export_node])
+        assert len(list(jsonl.iter_export(client, "news"))) == len(DOCUMENTS)
+
+    def test_client_error_is_raised(self, export_node):
+        client = get_client(api_key="k", nodes=[export_node])
+        with pytest.raises(ObjectNotFound):
+            list(jsonl.iter_export(client, "missing"))
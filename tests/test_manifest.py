@@ -0,0 +1,53 @@
+"""
+Testes do manifesto de hashes para indexação por delta.
+
+Run with: python -m pytest tests/test_manifest.py -v
+"""
+
+from typesense_dgb.manifest import DocumentManifest, hash_document
+
+
+class TestDocumentManifest:
+    """Tests for DocumentManifest."""
+
+    def test_new_and_changed_documents(self, tmp_path):
+        """Documentos desconhecidos ou com hash diferente são marcados."""
+        manifest = DocumentManifest(str(tmp_path / "manifest.db"))
+        manifest.update([("a", hash_document(b"1")), ("b", hash_document(b"2"))])
+
+        keys = [
+            ("a", hash_document(b"1")),
+            ("b", hash_document(b"2-alterado")),
+            ("c", hash_document(b"3")),
+        ]
+        assert manifest.changed(keys) == [False, True, True]
+
+    def test_persists_between_instances(self, tmp_path):
+        """O manifesto sobrevive ao fechamento do arquivo."""
+        path = str(tmp_path / "manifest.db")
+        manifest = DocumentManifest(path)
+        manifest.update([("a", hash_document(b"1"))])
+        manifest.close()
+
+        reopened = DocumentManifest(path)
+        assert len(reopened) == 1
+        assert reopened.changed([("a", hash_document(b"1"))]) == [False]
+
+    def test_bind_resets_on_recreated_collection(self, tmp_path):
+        """Se a coleção foi recriada, o manifesto é descartado."""
+        manifest = DocumentManifest(str(tmp_path / "manifest.db"))
+        manifest.bind("news", 100)
+        manifest.update([("a", hash_document(b"1"))])
+
+        manifest.bind("news", 100)
+        assert len(manifest) == 1
+
+        manifest.bind("news", 200)
+        assert len(manifest) == 0
+
+    def test_many_lookups(self, tmp_path):
+        """Consultas com mais ids que o limite de parâmetros do SQLite."""
+        manifest = DocumentManifest(str(tmp_path / "manifest.db"))
+        keys = [(f"id{i}", hash_document(str(i).encode())) for i in range(1200)]
+        manifest.update(keys)
+        assert manifest.changed(keys) == [False] * 1200
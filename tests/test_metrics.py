@@ -0,0 +1,70 @@
+"""
+Testes da instrumentação das cargas.
+
+Run with: python -m pytest tests/test_metrics.py -v
+"""
+
+import json
+
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.metrics import RunMetrics
+
+
+class TestRunMetrics:
+    """Tests for RunMetrics."""
+
+    def test_stage_times_accumulate(self):
+        """Blocos com o mesmo estágio somam suas durações."""
+        metrics = RunMetrics()
+        metrics.add_time("import", 0.5)
+        metrics.add_time("import", 0.25)
+        with metrics.stage("prepare"):
+            pass
+        report = metrics.report()
+        assert report["stages_seconds"]["import"] == 0.75
+        assert "prepare" in report["stages_seconds"]
+
+    def test_latency_histogram_is_cumulative(self):
+        """Buckets seguem a convenção cumulativa do Prometheus."""
+        metrics = RunMetrics()
+        for latency in (0.01, 0.3, 0.3, 60.0):
+            metrics.observe_batch(latency, num_documents=10, num_bytes=100)
+        report = metrics.report()
+        buckets = report["batch_latency"]["buckets"]
+        assert buckets["0.05"] == 1
+        assert buckets["0.5"] == 3
+        assert buckets["30.0"] == 3
+        assert buckets["+Inf"] == 4
+        assert report["counters"]["bytes_sent"] == 400
+        assert report["counters"]["documents_sent"] == 40
+
+    def test_write_reports(self, tmp_path):
+        """Relatório JSON e textfile do Prometheus são gravados."""
+        metrics = RunMetrics(labels={"mode": "full"})
+        metrics.observe_batch(0.2, num_documents=5, num_bytes=50)
+        metrics.record_stats({"total_processed": 5, "total_indexed": 5, "errors": 0})
+        metrics.finish()
+
+        metrics.write_json(str(tmp_path / "run.json"))
+        report = json.loads((tmp_path / "run.json").read_text())
+        assert report["status"] == "success"
+        assert report["labels"] == {"mode": "full"}
+        assert report["counters"]["documents_indexed"] == 5
+
+        metrics.write_prometheus(str(tmp_path / "load.prom"))
+        text = (tmp_path / "load.prom").read_text()
+        assert "typesense_dgb_load_success 1" in text
+        assert 'typesense_dgb_load_batch_latency_seconds_bucket{le="+Inf"} 1' in text
+        assert "typesense_dgb_load_batch_latency_seconds_count 1" in text
+
+    def test_index_documents_records_stages(self, fake_client, bulk_frame):
+        """index_documents alimenta preparação, importação e latências."""
+        metrics = RunMetrics()
+        stats = index_documents(
+            fake_client(), bulk_frame(250), batch_size=100, metrics=metrics
+        )
+        report = metrics.report()
+        assert {"prepare", "import", "retrieve"} <= set(report["stages_seconds"])
+        assert report["counters"]["batches"] == 3
+        assert report["counters"]["documents_sent"] == stats["total_processed"]
+        assert report["batch_latency"]["count"] == 3
@@ -0,0 +1,154 @@
+"""
+Testes da migração de schema no lugar.
+
+Run with: python -m pytest tests/test_migration.py -v
+"""
+
+import copy
+
+import pytest
+
+from typesense_dgb.collection import COLLECTION_SCHEMA, build_schema
+from typesense_dgb.indexer import validate_fields
+from typesense_dgb.migration import (
+    backfill,
+    backfill_fields,
+    diff_schema,
+    migrate_schema,
+    schema_changes,
+)
+
+
+def _live_schema() -> dict:
+    """Schema como o servidor o devolve, com defaults explícitos e o campo '.*'."""
+    live = copy.deepcopy(COLLECTION_SCHEMA)
+    for field in live["fields"]:
+        field.setdefault("index", True)
+        field.setdefault("infix", False)
+        field.setdefault("locale", "")
+    live["fields"].append({"name": ".*", "type": "auto"})
+    return live
+
+
+class RecordingCollection:
+    """Coleção que guarda o schema e as alterações recebidas."""
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.updates: list[dict] = []
+
+    def retrieve(self):
+        return self.schema
+
+    def update(self, schema_change):
+        self.updates.append(schema_change)
+
+
+class TestDiffSchema:
+    """Tests for diff_schema and schema_changes."""
+
+    def test_identical_schema_has_no_changes(self):
+        """Defaults implícitos e o campo '.*' não geram diferenças."""
+        diff = diff_schema(_live_schema(), COLLECTION_SCHEMA)
+        assert schema_changes(diff) == []
+        assert diff["unsupported"] == []
+
+    def test_added_dropped_and_changed_fields(self):
+        """Campos novos, removidos e alterados viram operações da API de alteração."""
+        live = _live_schema()
+        live["fields"] = [f for f in live["fields"] if f["name"] != "tags"]
+        live["fields"].append({"name": "legacy", "type": "string"})
+        for field in live["fields"]:
+            if field["name"] == "category":
+                field["facet"] = False
+
+        diff = diff_schema(live, COLLECTION_SCHEMA)
+
+        assert [f["name"] for f in diff["added"]] == ["tags"]
+        assert diff["dropped"] == ["legacy"]
+        assert [f["name"] for f in diff["changed"]] == ["category"]
+        assert [c["name"] for c in schema_changes(diff)] == [
+            "legacy",
+            "category",
+            "category",
+            "tags",
+        ]
+        # category só mudou de papel: os valores armazenados são reindexados
+        assert backfill_fields(diff) == ["tags"]
+
+    def test_retyped_field_is_backfilled(self):
+        """Campo recriado com outro tipo precisa ser preenchido de novo."""
+        live = _live_schema()
+        for field in live["fields"]:
+            if field["name"] == "published_year":
+                field["type"] = "string"
+
+        diff = diff_schema(live, COLLECTION_SCHEMA)
+
+        assert diff["retyped"] == ["published_year"]
+        assert backfill_fields(diff) == ["published_year"]
+
+    def test_default_sorting_field_requires_reindex(self, fake_client):
+        """Mudança no campo de ordenação padrão não é migrada no lugar."""
+        live = _live_schema()
+        live["default_sorting_field"] = "extracted_at"
+        client = fake_client()
+        client.collections["news"] = RecordingCollection(live)
+
+        with pytest.raises(ValueError, match="reindexação"):
+            migrate_schema(client)
+        assert client.collections["news"].updates == []
+
+
+class TestMigrateSchema:
+    """Tests for migrate_schema and backfill."""
+
+    def test_dry_run_does_not_alter(self, fake_client):
+        """--dry-run calcula as diferenças sem chamar a API de alteração."""
+        live = _live_schema()
+        live["fields"] = [f for f in live["fields"] if f["name"] != "tags"]
+        client = fake_client()
+        client.collections["news"] = RecordingCollection(live)
+
+        diff = migrate_schema(client, dry_run=True)
+        assert backfill_fields(diff) == ["tags"]
+        assert client.collections["news"].updates == []
+
+        migrate_schema(client)
+        assert client.collections["news"].updates == [
+            {"fields": [f for f in COLLECTION_SCHEMA["fields"] if f["name"] == "tags"]}
+        ]
+
+    def test_full_to_lean_needs_no_backfill(self, fake_client):
+        """O perfil enxuto só muda papéis; unique_id não entra no backfill."""
+        client = fake_client()
+        client.collections["news"] = RecordingCollection(_live_schema())
+
+        diff = migrate_schema(client, schema=build_schema("lean"))
+
+        assert "unique_id" in {f["name"] for f in diff["changed"]}
+        assert backfill_fields(diff) == []
+        validate_fields(backfill_fields(diff))
+        assert len(client.collections["news"].updates) == 1
+
+    def test_unique_id_is_rejected_before_backfill(self):
+        """unique_id não pode ser preenchido com documentos parciais."""
+        with pytest.raises(ValueError, match="Campos fora do schema: unique_id"):
+            validate_fields(["unique_id", "tags"])
+
+    def test_backfill_sends_only_id_and_fields(self, fake_client, bulk_frame):
+        """O backfill importa documentos parciais com action=update."""
+        client = fake_client()
+        params_seen = []
+        original = client.documents.import_
+
+        def import_(documents, params=None):
+            params_seen.append(params)
+            return original(documents, params)
+
+        client.documents.import_ = import_
+        stats = backfill(client, bulk_frame(20), ["published_year"], batch_size=10)
+
+        assert stats["total_processed"] == 20
+        assert {p["action"] for p in params_seen} == {"update"}
+        assert set(client.store["id0"]) == {"id", "published_year"}
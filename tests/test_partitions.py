@@ -0,0 +1,183 @@
+"""
+Testes do layout particionado por ano.
+
+Run with: python -m pytest tests/test_partitions.py -v
+"""
+
+import pandas as pd
+import pytest
+
+from typesense_dgb.dataset import process_dataframe
+from typesense_dgb.partitions import (
+    drop_partitions_before,
+    index_partitioned,
+    list_partitions,
+    partitions_for_range,
+    search_partitioned,
+    year_bounds,
+)
+
+
+class FakeMultiSearch:
+    """multi_search que ordena por published_at e respeita filter_by de data."""
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = []
+
+    def perform(self, search_queries, common_params):
+        self.requests.append(search_queries)
+        results = []
+        for search in search_queries["searches"]:
+            docs = self.client.server.collections[search["collection"]]["docs"].values()
+            start = end = None
+            for clause in search.get("filter_by", "").split(" && "):
+                if clause.startswith("published_at:>="):
+                    start = int(clause.split(">=")[1])
+                elif clause.startswith("published_at:<"):
+                    end = int(clause.split("<")[1])
+            matched = sorted(
+                (
+                    d
+                    for d in docs
+                    if (start is None or d["published_at"] >= start)
+                    and (end is None or d["published_at"] < end)
+                ),
+                key=lambda d: -d["published_at"],
+            )
+            results.append(
+                {
+                    "found": len(matched),
+                    "hits": [{"document": d} for d in matched[: search["per_page"]]],
+                    "facet_counts": [
+                        {"field_name": "agency", "counts": [{"value": "mec", "count": len(matched)}]}
+                    ],
+                }
+            )
+        return {"results": results}
+
+
+@pytest.fixture
+def client(server_client):
+    """Cliente em memória com multi_search."""
+    server_client.multi_search = FakeMultiSearch(server_client)
+    return server_client
+
+
+def _frame(dates: list[str]) -> pd.DataFrame:
+    raw = pd.DataFrame(
+        {
+            "unique_id": [f"id{i}" for i in range(len(dates))],
+            "title": [f"t{i}" for i in range(len(dates))],
+            "published_at": dates,
+            "extracted_at": [None] * len(dates),
+        }
+    )
+    return process_dataframe(raw)
+
+
+DATES = [
+    "2023-06-01T10:00:00-03:00",
+    "2024-01-01T00:30:00-03:00",
+    "2024-12-31T23:00:00-03:00",
+    "2025-03-01T10:00:00-03:00",
+    None,
+]
+
+
+class TestIndexPartitioned:
+    """Tests for index_partitioned and drop_partitions_before."""
+
+    def test_routes_by_year(self, client):
+        """Cada documento vai para a partição do seu ano (horário de Brasília)."""
+        stats = index_partitioned(client, [_frame(DATES[:3]), _frame(DATES[3:])])
+
+        assert list_partitions(client) == {
+            2023: "news_2023",
+            2024: "news_2024",
+            2025: "news_2025",
+        }
+        assert stats["partitions"] == {2023: 1, 2024: 2, 2025: 1}
+        assert stats["undated"] == 1
+        assert stats["total_processed"] == 4
+
+    def test_year_follows_partition_timezone(self, client):
+        """Uma data em UTC logo após a virada do ano ainda é do ano anterior em UTC-3."""
+        index_partitioned(client, _frame(["2024-01-01T02:00:00Z", "2024-01-01T03:00:00Z"]))
+
+        assert client.server.collections["news_2023"]["docs"].keys() == {"id0"}
+        assert client.server.collections["news_2024"]["docs"].keys() == {"id1"}
+
+    def test_rebuild_single_year(self, client):
+        """Reconstruir um ano não toca as outras partições."""
+        index_partitioned(client, _frame(DATES))
+        client.server.collections["news_2023"]["docs"]["extra"] = {"id": "extra"}
+        client.server.collections["news_2024"]["docs"]["extra"] = {"id": "extra"}
+
+        stats = index_partitioned(client, _frame(DATES), years=[2024], rebuild=True)
+
+        assert stats["partitions"] == {2024: 2}
+        assert "extra" not in client.server.collections["news_2024"]["docs"]
+        assert "extra" in client.server.collections["news_2023"]["docs"]
+
+    def test_retention_drops_whole_partitions(self, client):
+        index_partitioned(client, _frame(DATES))
+        assert drop_partitions_before(client, 2024) == ["news_2023"]
+        assert list(list_partitions(client)) == [2024, 2025]
+
+
+class TestSearchPartitioned:
+    """Tests for search_partitioned."""
+
+    def test_fans_out_only_to_intersecting_partitions(self, client):
+        """Filtro de data restringe as partições e o merge ordena por published_at."""
+        index_partitioned(client, _frame(DATES))
+        start, _ = year_bounds(2024)
+
+        result = search_partitioned(
+            client, {"q": "*", "query_by": "title", "per_page": 2}, start=start
+        )
+
+        assert result["partitions"] == ["news_2025", "news_2024"]
+        assert result["found"] == 3
+        assert [h["document"]["id"] for h in result["hits"]] == ["id3", "id2"]
+        assert result["facet_counts"][0]["counts"] == [{"value": "mec", "count": 3}]
+        search = client.multi_search.requests[0]["searches"][0]
+        assert search["filter_by"] == f"published_at:>={start}"
+
+    def test_partitions_sort_by_merge_key(self, client):
+        """Cada partição ordena por published_at, a mesma chave da intercalação."""
+        index_partitioned(client, _frame(DATES))
+
+        search_partitioned(client, {"q": "*", "sort_by": "_text_match:desc"})
+
+        searches = client.multi_search.requests[0]["searches"]
+        assert {s["sort_by"] for s in searches} == {"published_at:desc"}
+
+    def test_caller_filter_with_or_keeps_date_range(self, client):
+        """Um filter_by com || é agrupado antes de receber o filtro de data."""
+        index_partitioned(client, _frame(DATES))
+        start, end = year_bounds(2024)
+
+        search_partitioned(
+            client,
+            {"q": "*", "filter_by": "agency:=mec || agency:=mds"},
+            start=start,
+            end=end,
+        )
+
+        search = client.multi_search.requests[0]["searches"][0]
+        assert search["filter_by"] == (
+            f"(agency:=mec || agency:=mds) && published_at:>={start} && published_at:<{end}"
+        )
+
+    def test_second_page_and_range_selection(self, client):
+        index_partitioned(client, _frame(DATES))
+
+        result = search_partitioned(client, {"q": "*", "per_page": 1, "page": 3})
+        assert [h["document"]["id"] for h in result["hits"]] == ["id1"]
+        assert partitions_for_range(list_partitions(client), end=year_bounds(2024)[0]) == [
+            "news_2023"
+        ]
+        with pytest.raises(ValueError):
+            search_partitioned(client, {"q": "*", "per_page": 200, "page": 2})
@@ -0,0 +1,59 @@
+"""
+Testes do profiler de amostragem.
+
+Run with: python -m pytest tests/test_profiling.py -v
+"""
+
+import time
+
+from typesense_dgb.indexer import index_documents
+from typesense_dgb.metrics import RunMetrics
+from typesense_dgb.profiling import UNSTAGED, SamplingProfiler
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    def test_samples_are_annotated_with_stage(self):
+        """Amostras dentro de RunMetrics.stage levam o nome do estágio."""
+        metrics = RunMetrics()
+        with SamplingProfiler(interval=0.001) as profiler:
+            with metrics.stage("derive"):
+                _busy(0.05)
+            _busy(0.02)
+
+        stages = profiler.stage_counts()
+        assert stages["derive"] > 0
+        assert stages[UNSTAGED] > 0
+        assert any("_busy" in label for label in profiler.self_time("derive"))
+
+    def test_writes_report_and_folded_stacks(self, tmp_path, fake_client, bulk_frame):
+        """Indexação perfilada gera relatório por estágio e pilhas folded."""
+        metrics = RunMetrics()
+        with SamplingProfiler(interval=0.001) as profiler:
+            index_documents(
+                fake_client(delay=0.02),
+                bulk_frame(300),
+                batch_size=100,
+                concurrency=2,
+                metrics=metrics,
+            )
+
+        prefix = str(tmp_path / "profile")
+        profiler.write(prefix)
+
+        report = (tmp_path / "profile.txt").read_text()
+        assert "== Amostras por estágio ==" in report
+        assert "== Árvore de chamadas" in report
+
+        lines = (tmp_path / "profile.folded").read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any(line.startswith("import;typesense-import") for line in lines)
@@ -0,0 +1,109 @@
+"""
+Testes da espera por prontidão do Typesense.
+
+Run with: python -m pytest tests/test_readiness.py -v
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from typesense_dgb.client import wait_for_typesense
+from typesense_dgb.readiness import backoff_intervals, wait_until_ready
+
+
+class _RestartingHandler(BaseHTTPRequestHandler):
+    """Servidor que fica saudável em ready_at e carrega a coleção até loaded_at."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        now = time.monotonic()
+        server = self.server
+        if self.path == "/health":
+            ok = now >= server.ready_at
+            status, payload = (200 if ok else 503), {"ok": ok}
+        elif self.path.startswith("/collections/news/documents/search"):
+            found = server.documents if now >= server.loaded_at else server.documents // 2
+            status, payload = 200, {"found": found, "hits": []}
+        else:
+            status, payload = 404, {"message": "Not Found"}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def restarting():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RestartingHandler)
+    now = time.monotonic()
+    httpd.ready_at, httpd.loaded_at, httpd.documents = now + 0.2, now + 0.5, 1000
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _node(httpd) -> dict:
+    return {"host": "127.0.0.1", "port": str(httpd.server_address[1]), "protocol": "http"}
+
+
+class TestWaitUntilReady:
+    """Tests for wait_until_ready."""
+
+    def test_ready_shortly_after_health(self, restarting):
+        """Com backoff curto, a espera termina logo após o /health responder."""
+        report = wait_until_ready([_node(restarting)], "k")
+
+        assert report["ready"]
+        assert 0.2 <= report["time_to_ready"] < 0.7
+        assert report["attempts"] > 2
+
+    def test_waits_for_collection_documents(self, restarting):
+        report = wait_until_ready(
+            [_node(restarting)], "k", collection_name="news", expected_documents=1000
+        )
+
+        assert report["ready"]
+        assert report["documents"] == 1000
+        assert report["time_to_ready"] >= 0.5
+
+    def test_gives_up_at_deadline(self, dead_node):
+        start = time.monotonic()
+        report = wait_until_ready([dead_node], "k", deadline=0.3)
+
+        assert not report["ready"]
+        assert report["time_to_ready"] is None
+        assert time.monotonic() - start < 1.0
+        assert report["error"]
+
+    def test_backoff_doubles_up_to_maximum(self):
+        intervals = backoff_intervals(0.1, 0.5)
+        values = [next(intervals) for _ in range(5)]
+        for value, base in zip(values, [0.1, 0.2, 0.4, 0.5, 0.5]):
+            assert base <= value <= base * 1.2
+
+
+class TestWaitForTypesense:
+    """Tests for wait_for_typesense delegating to the readiness wait."""
+
+    def test_returns_client_once_collection_is_queryable(self, restarting):
+        client = wait_for_typesense(
+            api_key="k", nodes=[_node(restarting)], collection_name="news"
+        )
+        assert client is not None
+
+    def test_returns_none_after_deadline(self, restarting):
+        restarting.ready_at = float("inf")
+        assert wait_for_typesense(
+            api_key="k", nodes=[_node(restarting)], max_retries=2, retry_interval=0.1
+        ) is None
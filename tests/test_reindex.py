@@ -0,0 +1,119 @@
+"""
+Testes da reindexação blue/green com aliases.
+
+Run with: python -m pytest tests/test_reindex.py -v
+"""
+
+import pytest
+
+from typesense_dgb.collection import create_collection, resolve_alias
+from typesense_dgb.reindex import (
+    collect_garbage,
+    generation_name,
+    list_generations,
+    reindex,
+)
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    """Gera nomes de geração sequenciais e determinísticos."""
+    counter = iter(range(100))
+    real = generation_name
+
+    def fake(alias="news", now=None):
+        return real(alias, now) if now else f"{alias}_2025010100{next(counter):04d}"
+
+    monkeypatch.setattr("typesense_dgb.reindex.generation_name", fake)
+
+
+@pytest.fixture(autouse=True)
+def fake_export(monkeypatch):
+    """Export em streaming servido pelo servidor em memória, em lotes pequenos."""
+
+    def iter_export(client, collection_name, params=None):
+        for line in client.collections[collection_name].documents.export().splitlines():
+            yield line.encode("utf-8")
+
+    monkeypatch.setattr("typesense_dgb.reindex.iter_export", iter_export)
+    monkeypatch.setattr("typesense_dgb.reindex.LEGACY_COPY_BATCH", 16)
+
+
+class TestReindex:
+    """Tests for reindex."""
+
+    def test_swaps_alias_and_collects_old_generations(self, generations, bulk_frame, server_client):
+        """Cada reindexação troca o alias e mantém só as últimas gerações."""
+        client = server_client
+        for _ in range(3):
+            stats = reindex(
+                client, bulk_frame(300), batch_size=100, keep=2, max_error_rate=0.01
+            )
+
+        assert resolve_alias(client, "news") == stats["collection"]
+        assert list_generations(client, "news") == [
+            "news_20250101000001",
+            "news_20250101000002",
+        ]
+        assert stats["removed"] == ["news_20250101000000"]
+        assert client.collections["news"].retrieve()["num_documents"] == 299
+
+    def test_failed_validation_keeps_alias(self, generations, bulk_frame, server_client):
+        """Geração com documentos a menos não recebe o tráfego."""
+        client = server_client
+        reindex(client, bulk_frame(300), batch_size=100, max_error_rate=0.05)
+
+        with pytest.raises(RuntimeError, match="reprovada"):
+            reindex(client, bulk_frame(100), batch_size=100, max_error_rate=0.05)
+
+        assert resolve_alias(client, "news") == "news_20250101000000"
+        assert "news_20250101000001" in list_generations(client, "news")
+
+    def test_replaces_legacy_physical_collection(self, generations, bulk_frame, server_client):
+        """Coleção física com o nome do alias é copiada para uma geração e removida."""
+        client = server_client
+        create_collection(client)
+        legacy_docs = {f"old{i}": {"id": f"old{i}", "title": "antiga"} for i in range(40)}
+        client.server.collections["news"]["docs"] = dict(legacy_docs)
+        stats = reindex(client, bulk_frame(50), batch_size=100, max_error_rate=0.05)
+
+        assert "news" not in client.server.collections
+        assert client.collections["news"].retrieve()["name"] == "news_20250101000000"
+        # A cópia da legada entra na política de keep e permite o rollback
+        assert stats["previous"] == "news_19700101000000"
+        assert list_generations(client, "news") == [
+            "news_19700101000000",
+            "news_20250101000000",
+        ]
+        assert client.server.collections["news_19700101000000"]["docs"] == legacy_docs
+
+        reindex(client, bulk_frame(50), batch_size=100, max_error_rate=0.05, keep=2)
+        assert "news_19700101000000" not in client.server.collections
+
+    def test_incomplete_legacy_copy_keeps_legacy_collection(self, generations, bulk_frame, server_client):
+        """Se a cópia da legada falhar, nada é trocado nem removido."""
+        client = server_client
+        create_collection(client)
+        client.server.collections["news"]["docs"] = {"old": {"id": "old", "title": "falha"}}
+
+        with pytest.raises(RuntimeError, match="incompleta"):
+            reindex(client, bulk_frame(50), batch_size=100, max_error_rate=0.05)
+
+        assert "news" in client.server.collections
+        assert resolve_alias(client, "news") is None
+
+    def test_create_collection_through_alias(self, server_client):
+        """create_collection não cria coleção física sobre um alias."""
+        client = server_client
+        create_collection(client, "news_20250101000000", alias="news")
+        create_collection(client, "news")
+        assert list(client.server.collections) == ["news_20250101000000"]
+
+    def test_gc_never_removes_live_generation(self, server_client):
+        """A geração servida pelo alias sobrevive mesmo sendo a mais antiga."""
+        client = server_client
+        for suffix in ("20240101000000", "20240201000000", "20240301000000"):
+            create_collection(client, f"news_{suffix}")
+        client.aliases.upsert("news", {"collection_name": "news_20240101000000"})
+
+        assert collect_garbage(client, "news", keep=1) == ["news_20240201000000"]
@@ -0,0 +1,128 @@
+"""
+Testes da retenção por delete-by-filter.
+
+Run with: python -m pytest tests/test_retention.py -v
+"""
+
+import re
+
+from typesense_dgb.retention import delete_ids, ids_filter, prune_before
+
+DAY = 86400
+
+
+def _matches(doc: dict, filter_by: str) -> bool:
+    """Avalia os filtros usados pela retenção (published_at e listas de id)."""
+    for clause in filter_by.split(" && "):
+        if clause.startswith("id:["):
+            if doc["id"] not in re.findall(r"`([^`]*)`", clause):
+                return False
+        elif clause.startswith("published_at:>="):
+            if doc["published_at"] < int(clause.split(">=")[1]):
+                return False
+        elif clause.startswith("published_at:>"):
+            if doc["published_at"] <= int(clause.split(">")[1]):
+                return False
+        elif clause.startswith("published_at:<"):
+            if doc["published_at"] >= int(clause.split("<")[1]):
+                return False
+    return True
+
+
+class FakeDocuments:
+    def __init__(self, docs: list[dict]):
+        self.docs = {doc["id"]: doc for doc in docs}
+        self.deletes: list[dict] = []
+
+    def search(self, params):
+        matched = [d for d in self.docs.values() if _matches(d, params.get("filter_by", ""))]
+        if params.get("sort_by") == "published_at:asc":
+            matched.sort(key=lambda d: d["published_at"])
+        return {
+            "found": len(matched),
+            "hits": [{"document": d} for d in matched[: params.get("per_page", 10)]],
+        }
+
+    def delete(self, params):
+        self.deletes.append(params)
+        doomed = [i for i, d in self.docs.items() if _matches(d, params["filter_by"])]
+        for doc_id in doomed:
+            del self.docs[doc_id]
+        return {"num_deleted": len(doomed)}
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict]):
+        self.documents = FakeDocuments(docs)
+
+
+class FakeClient:
+    def __init__(self, docs: list[dict]):
+        self.collections = {"news": FakeCollection(docs)}
+
+    @property
+    def documents(self) -> FakeDocuments:
+        return self.collections["news"].documents
+
+
+def _docs(days: list[int]) -> list[dict]:
+    return [{"id": f"d{i}", "published_at": day * DAY} for i, day in enumerate(days)]
+
+
+class TestPruneBefore:
+    """Tests for prune_before."""
+
+    def test_deletes_in_windows_until_cutoff(self):
+        """Remove tudo antes do corte, uma janela por chamada."""
+        client = FakeClient(_docs([0, 10, 40, 75, 100, 130]))
+        stats = prune_before(client, cutoff=100 * DAY, window_days=30, throttle=0)
+
+        assert stats["expected"] == stats["deleted"] == 4
+        assert stats["calls"] == 3
+        assert sorted(client.documents.docs) == ["d4", "d5"]
+        # Janelas a partir do documento datado mais antigo; o sem data cai na primeira
+        assert client.documents.deletes[0]["filter_by"] == f"published_at:<{40 * DAY}"
+        assert client.documents.deletes[-1]["filter_by"] == (
+            f"published_at:>={70 * DAY} && published_at:<{100 * DAY}"
+        )
+
+    def test_undated_documents_do_not_stretch_windows(self):
+        """Um documento com published_at 0 não faz as janelas começarem em 1970."""
+        client = FakeClient(_docs([0, 20000, 20010, 20100]))
+        stats = prune_before(client, cutoff=20050 * DAY, window_days=30, throttle=0)
+
+        assert stats["deleted"] == 3
+        assert stats["calls"] == 2
+        assert sorted(client.documents.docs) == ["d3"]
+
+        only_undated = FakeClient(_docs([0, 200]))
+        stats = prune_before(only_undated, cutoff=100 * DAY, throttle=0)
+        assert stats["deleted"] == stats["calls"] == 1
+        assert only_undated.documents.deletes[0]["filter_by"] == f"published_at:<{100 * DAY}"
+
+    def test_dry_run_only_counts(self):
+        client = FakeClient(_docs([0, 10, 200]))
+        stats = prune_before(client, cutoff=100 * DAY, dry_run=True)
+
+        assert stats["expected"] == 2
+        assert stats["deleted"] == 0
+        assert client.documents.deletes == []
+        assert len(client.documents.docs) == 3
+
+
+class TestDeleteIds:
+    """Tests for delete_ids."""
+
+    def test_deletes_ids_in_groups(self):
+        """Ids ausentes e repetidos não inflam as contagens."""
+        client = FakeClient(_docs([1, 2, 3, 4, 5]))
+        stats = delete_ids(
+            client, ["d0", "d1", "d1", "d3", "missing"], ids_per_call=2, throttle=0
+        )
+
+        assert stats["expected"] == stats["deleted"] == 3
+        assert stats["calls"] == 2
+        assert sorted(client.documents.docs) == ["d2", "d4"]
+
+    def test_ids_filter_quotes_values(self):
+        assert ids_filter(["a-1", "b,2"]) == "id:[`a-1`,`b,2`]"
@@ -0,0 +1,181 @@
+"""
+Testes das buscas hedged e do circuit breaker.
+
+Run with: python -m pytest tests/test_search.py -v
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+from typesense.exceptions import ObjectNotFound
+
+from typesense_dgb.client import get_client, get_session, node_url
+from typesense_dgb.search import (
+    CLOSED,
+    HALF_OPEN,
+    MIN_LATENCY_SAMPLES,
+    OPEN,
+    CircuitBreaker,
+    HedgedSearcher,
+    LatencyTracker,
+)
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, payload: dict, status: int = 200):
+        self.server.hits += 1
+        time.sleep(self.server.delay)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _params(self) -> dict:
+        """Parâmetros da query string, devolvidos na resposta para conferência."""
+        return dict(parse_qsl(urlsplit(self.path).query))
+
+    def do_GET(self):
+        if "/collections/missing/" in self.path:
+            self._respond({"message": "Not Found"}, 404)
+        else:
+            self._respond({"found": 1, "node": self.server.label, "params": self._params()})
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        searches = json.loads(self.rfile.read(length))["searches"]
+        self._respond(
+            {
+                "results": [
+                    {"found": 1, "node": self.server.label, "q": search["q"]}
+                    for search in searches
+                ],
+                "params": self._params(),
+            }
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def nodes():
+    """Dois nós: 'slow' demora 0,5 s por resposta, 'fast' responde na hora."""
+    servers = []
+    for label, delay in (("slow", 0.5), ("fast", 0.0)):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SearchHandler)
+        httpd.label, httpd.delay, httpd.hits = label, delay, 0
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+    yield servers
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _node(httpd) -> dict:
+    return {"host": "127.0.0.1", "port": str(httpd.server_address[1]), "protocol": "http"}
+
+
+class TestLatencyTracker:
+    """Tests for the percentile-based hedge delay."""
+
+    def test_delay_follows_percentile(self):
+        tracker = LatencyTracker(percentile=90, initial_delay=0.2, max_delay=5.0)
+        assert tracker.delay() == 0.2
+
+        for i in range(1, 101):
+            tracker.record(i / 100)
+        assert tracker.delay() == pytest.approx(0.91)
+
+    def test_delay_is_clamped(self):
+        tracker = LatencyTracker(min_delay=0.05, max_delay=0.5)
+        for _ in range(MIN_LATENCY_SAMPLES):
+            tracker.record(0.001)
+        assert tracker.delay() == 0.05
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_then_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # uma única requisição de teste
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestHedgedSearcher:
+    """Tests for hedged search, failover and error handling."""
+
+    def test_slow_primary_is_hedged(self, nodes):
+        """A cópia enviada ao nó rápido responde antes do nó lento."""
+        client = get_client(api_key="k", nodes=[_node(s) for s in nodes])
+        with HedgedSearcher(client, initial_delay=0.05) as searcher:
+            start = time.perf_counter()
+            params = {"q": "saúde", "query_by": "title", "prefix": False}
+            result = searcher.search(params)
+            elapsed = time.perf_counter() - start
+
+            multi = searcher.multi_search(
+                [{"collection": "news", "q": "a"}, {"collection": "news", "q": "b"}],
+                {"query_by": "title"},
+            )
+
+        assert result["node"] == "fast"
+        assert elapsed < 0.4
+        assert result["params"] == {"q": "saúde", "query_by": "title", "prefix": "false"}
+        assert params["prefix"] is False  # o dicionário do chamador não é alterado
+        assert [r["node"] for r in multi["results"]] == ["fast", "fast"]
+        assert [r["q"] for r in multi["results"]] == ["a", "b"]
+        assert multi["params"] == {"query_by": "title"}
+        assert searcher.stats == {"requests": 2, "hedged": 2, "hedge_wins": 2}
+
+    def test_breaker_takes_dead_node_out_of_rotation(self, nodes, dead_node):
+        client = get_client(api_key="k", nodes=[dead_node, _node(nodes[1])])
+        with HedgedSearcher(client, initial_delay=0.05, failure_threshold=2) as searcher:
+            for _ in range(6):
+                assert searcher.search({"q": "*"})["node"] == "fast"
+
+        assert searcher.breakers[node_url(dead_node)].state == OPEN
+        assert nodes[1].hits == 6
+        # Failover após a falha do primário não conta como vitória do hedge
+        assert searcher.stats["hedge_wins"] == 0
+
+    def test_uses_own_session_without_retries(self, nodes):
+        client = get_client(api_key="k", nodes=[_node(n) for n in nodes])
+        with HedgedSearcher(client, max_workers=4) as searcher:
+            assert searcher._session is not get_session()
+            adapter = searcher._session.get_adapter("http://127.0.0.1")
+            assert adapter.max_retries.total == 0
+            assert adapter._pool_maxsize == 4
+
+    def test_client_errors_are_not_retried(self, nodes):
+        client = get_client(api_key="k", nodes=[_node(nodes[1]), _node(nodes[0])])
+        with HedgedSearcher(client) as searcher:
+            with pytest.raises(ObjectNotFound):
+                searcher.search({"q": "*"}, collection_name="missing")
+
+        assert nodes[0].hits == 0
+        assert searcher.breakers[node_url(_node(nodes[1]))].state == CLOSED
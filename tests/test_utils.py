@@ -0,0 +1,106 @@
+"""
+Testes das funções utilitárias de datas.
+
+Run with: python -m pytest tests/test_utils.py -v
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from typesense_dgb.utils import (
+    calculate_published_week,
+    calculate_published_weeks,
+    to_epoch_seconds,
+)
+
+
+def _reference_epoch(values: pd.Series) -> pd.Series:
+    """Conversão linha a linha usada originalmente em dataset.py."""
+    return values.apply(lambda x: int(x.timestamp()) if pd.notna(x) else 0)
+
+
+class TestToEpochSeconds:
+    """Tests for to_epoch_seconds."""
+
+    def test_matches_apply_for_tz_aware(self):
+        """Datetimes com timezone devem gerar o mesmo timestamp UTC."""
+        values = pd.to_datetime(
+            pd.Series(
+                [
+                    "2024-01-01T10:00:00-03:00",
+                    "2025-10-23T23:59:59.999-03:00",
+                    None,
+                    "1969-12-31T23:59:58.5+00:00",
+                ]
+            ),
+            errors="coerce",
+            utc=True,
+        )
+        result = to_epoch_seconds(values)
+        assert result.tolist() == _reference_epoch(values).tolist()
+
+    def test_matches_apply_for_naive(self):
+        """Datetimes sem timezone são tratados como UTC, como Timestamp.timestamp()."""
+        values = pd.Series([datetime(2024, 12, 30, 12, 30), pd.NaT, datetime(2020, 2, 29)])
+        result = to_epoch_seconds(values)
+        assert result.tolist() == _reference_epoch(values).tolist()
+        assert result.iloc[1] == 0
+
+    def test_matches_apply_for_random_subsecond_values(self):
+        """Valores com frações de segundo em resolução ns e us."""
+        rng = np.random.default_rng(42)
+        raw = rng.integers(0, 2_000_000_000 * 10**9, size=500)
+        values = pd.Series(pd.to_datetime(raw, unit="ns", utc=True))
+        assert to_epoch_seconds(values).tolist() == _reference_epoch(values).tolist()
+
+        values_us = values.astype("datetime64[us, UTC]")
+        assert (
+            to_epoch_seconds(values_us).tolist() == _reference_epoch(values_us).tolist()
+        )
+
+    def test_preserves_index(self):
+        """O índice original é mantido para atribuição no DataFrame."""
+        values = pd.Series(pd.to_datetime(["2024-01-01", "2024-06-01"]), index=[10, 20])
+        assert to_epoch_seconds(values).index.tolist() == [10, 20]
+
+
+class TestCalculatePublishedWeeks:
+    """Tests for calculate_published_weeks."""
+
+    def test_matches_scalar_version(self):
+        """Resultados idênticos a calculate_published_week, inclusive None."""
+        timestamps = pd.Series(
+            [
+                int(datetime(2024, 1, 1).timestamp()),
+                int(datetime(2025, 10, 23).timestamp()),
+                int(datetime(2024, 12, 30).timestamp()),
+                int(datetime(2021, 1, 3).timestamp()),
+                0,
+                -1,
+                None,
+                float("nan"),
+            ]
+        )
+        result = calculate_published_weeks(timestamps)
+        for ts, week in zip(timestamps, result):
+            expected = calculate_published_week(ts)
+            if expected is None:
+                assert pd.isna(week)
+            else:
+                assert week == expected
+
+    def test_random_timestamps(self):
+        """Equivalência em uma amostra ampla de timestamps."""
+        rng = np.random.default_rng(7)
+        timestamps = pd.Series(rng.integers(1, 2_000_000_000, size=1000))
+        result = calculate_published_weeks(timestamps)
+        expected = [calculate_published_week(ts) for ts in timestamps]
+        assert result.tolist() == expected
+
+    def test_all_invalid(self):
+        """Coluna sem timestamps válidos retorna apenas <NA>."""
+        result = calculate_published_weeks(pd.Series([0, 0, None]))
+        assert result.isna().all()
+        assert str(result.dtype) == "Int64"